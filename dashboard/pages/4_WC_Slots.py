@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import pandas as pd
 import requests
@@ -14,6 +15,12 @@ def load_data():
 
 @st.cache_data
 def load_races():
+    # Prefer the local catalog once scripts/geocode_catalog.py has added coordinates
+    local_path = "data/urls/all_ironman_races.csv"
+    if os.path.exists(local_path):
+        races = pd.read_csv(local_path, encoding="utf-8-sig")
+        if {"Latitude", "Longitude"}.issubset(races.columns):
+            return races
     race_path = "https://drive.google.com/uc?export=download&id=1XbgeVdOjk_ocPFm9Md0fCyIy4nQ7C92C"
     races = pd.read_csv(race_path)
     return races
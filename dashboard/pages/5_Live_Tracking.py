@@ -0,0 +1,71 @@
+import os
+import sys
+import streamlit as st
+import pandas as pd
+
+# The live state is read with the pipeline's own loader (scripts/live_tracker.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "scripts"))
+from live_tracker import POLL_INTERVAL_SECONDS, load_live_state, tracked_races
+
+SPLIT_COLUMNS = ["Swim Time", "Transition 1", "Bike Time", "Transition 2", "Run Time", "Finish Time"]
+
+# Load the tracked state (at most once per poll of the tracker)
+@st.cache_data(ttl=POLL_INTERVAL_SECONDS)
+def load_state(race_name, race_date):
+    return load_live_state(race_name, race_date)
+
+# Helper function to format seconds into hh:mm:ss or mm:ss
+def format_seconds(value):
+    if pd.isnull(value):
+        return None
+    hours, remainder = divmod(int(value), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours > 0:
+        return f"{hours:02}:{minutes:02}:{seconds:02}"  # hh:mm:ss
+    else:
+        return f"{minutes:02}:{seconds:02}"  # mm:ss
+
+st.title("📡 Live Tracking")
+
+races = tracked_races()
+if not races:
+    st.info("No race is tracked yet. Start one with: python scripts/live_tracker.py --race-url URL --race-name NAME")
+    st.stop()
+
+# Filters Section
+st.sidebar.header("Filters")
+race_labels = [f"{race_name} | {race_date}" for race_name, race_date in races]
+selected_label = st.sidebar.selectbox("Select a Race", race_labels, index=len(race_labels) - 1)
+race_name, race_date = races[race_labels.index(selected_label)]
+if st.sidebar.button("Refresh"):
+    load_state.clear()
+
+data = load_state(race_name, race_date)
+if data.empty:
+    st.info("No results received yet.")
+    st.stop()
+
+divisions = sorted(data["Division"].dropna().unique())
+selected_division = st.sidebar.selectbox("Select a Division", ["All"] + divisions, index=0)
+if selected_division != "All":
+    data = data[data["Division"] == selected_division]
+
+# Summary
+st.header("Race Progress")
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("Athletes", len(data))
+with col2:
+    st.metric("Finishers", int(data["Finish Time"].notna().sum()))
+with col3:
+    st.metric("DNF", int((data["Designation"] == "DNF").sum()))
+
+# Current standings
+st.header("Standings")
+standings = data.sort_values(["Overall Rank", "Finish Time"], na_position="last")
+for column in SPLIT_COLUMNS:
+    standings[column] = standings[column].map(format_seconds)
+st.dataframe(
+    standings[["Overall Rank", "Athlete", "Division", "Designation", *SPLIT_COLUMNS]],
+    hide_index=True,
+)
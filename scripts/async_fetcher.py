@@ -0,0 +1,176 @@
+"""
+async_fetcher.py
+
+────────────────────────────────────────────────────────────────────────────
+🚀 asyncio HTTP Engine with Per-host Rate Limiting
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Shared async HTTP client for every plain-HTTP fetch in the pipeline
+(results feeds, race catalog pages):
+
+- one aiohttp session / connection pool for the whole run
+- at most `concurrency` requests in flight
+- a token bucket per host: `rate_per_host` requests per second on average,
+  bursts of up to `burst`
+- retries on connection errors, timeouts, 429 and 5xx, with full-jitter
+  exponential backoff (and `Retry-After` when the server sends one)
+
+`AsyncFetcher.get(url)` returns the body as bytes, the same shape as the
+synchronous transports in `results_feed.py`, so parsers are shared.
+
+🧪 Testing:
+-----------
+Point the fetcher at a local fake server (e.g. `aiohttp.web` on
+127.0.0.1) — nothing in here is tied to ironman.com.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# -----------------------
+# Configurable Settings
+# -----------------------
+
+CONCURRENCY = 8             # Requests in flight across all hosts
+RATE_PER_HOST = 2.0         # Average requests per second per host
+BURST = 4                   # Requests a host may receive back-to-back
+MAX_RETRIES = 4             # Retries after the first attempt
+BACKOFF_BASE = 0.5          # Seconds; doubled on every retry
+BACKOFF_CAP = 30.0          # Longest single backoff in seconds
+REQUEST_TIMEOUT = 30        # Seconds per request
+USER_AGENT = "Mozilla/5.0 (ironman-races-analysis)"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+# -----------------------
+# Rate Limiting
+# -----------------------
+
+class TokenBucket:
+    """
+    Classic token bucket: refills `rate` tokens per second up to `capacity`.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Waits until a token is available and takes it.
+        """
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HTTPStatusError(Exception):
+    """
+    Raised for a non-2xx response that is not retried (or ran out of retries).
+    """
+
+    def __init__(self, url, status):
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+
+# -----------------------
+# Fetcher
+# -----------------------
+
+class AsyncFetcher:
+    """
+    Async HTTP GET with a shared connection pool, bounded concurrency,
+    per-host token buckets and jittered retries. Use as
+    `async with AsyncFetcher() as fetcher: body = await fetcher.get(url)`.
+    """
+
+    def __init__(self, concurrency=CONCURRENCY, rate_per_host=RATE_PER_HOST, burst=BURST,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_cap=BACKOFF_CAP,
+                 timeout=REQUEST_TIMEOUT, user_agent=USER_AGENT):
+        self.concurrency = concurrency
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.buckets = {}
+        self.semaphore = None
+        self.session = None
+        self.requests = 0
+        self.retries = 0
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": self.user_agent},
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return self.buckets[host]
+
+    def _backoff(self, attempt, retry_after=None):
+        """
+        Full-jitter exponential backoff, never shorter than Retry-After.
+        """
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def get(self, url):
+        """
+        Fetches `url` and returns the response body as bytes.
+        """
+        bucket = self._bucket(url)
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            await bucket.acquire()
+            try:
+                async with self.semaphore:
+                    self.requests += 1
+                    async with self.session.get(url) as response:
+                        if 200 <= response.status < 300:
+                            return await response.read()
+                        if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                            raise HTTPStatusError(url, response.status)
+                        header = response.headers.get("Retry-After", "")
+                        retry_after = float(header) if header.replace(".", "", 1).isdigit() else None
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+            self.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    def report(self):
+        return f"🌐 HTTP requests: {self.requests} | retries: {self.retries} | hosts: {len(self.buckets)}"
@@ -0,0 +1,136 @@
+"""
+browser_profile.py
+
+────────────────────────────────────────────────────────────────────────────
+🪶 Lightweight Chrome Profile for the IRONMAN Scrapers
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Starts the Chrome used by both scrapers (`ironman_results_scraper.py`,
+`ironman_race_urls_scraper.py`). The default profile is built for
+scraping, not for looking at pages:
+
+- headless, GPU compositing off, small fixed viewport
+- images, fonts, media and analytics / ad scripts are blocked before
+  they are requested (Network.setBlockedURLs)
+- the results iframe is kept in the page's renderer, so the blocking and
+  the byte counter below also cover it
+
+Set LIGHTWEIGHT_PROFILE = False for the old full, maximized, windowed
+browser (useful when debugging selectors by eye).
+
+📊 Bytes Transferred:
+---------------------
+Chrome's performance log reports the encoded size of every finished
+request. `transferred_bytes(driver)` returns the bytes since its last call
+(the scrapers record it per telemetry phase), and `transfer_report()`
+prints the total, so runs with and without the profile can be compared.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import json
+
+from selenium import webdriver
+
+# -----------------------
+# Configurable Settings
+# -----------------------
+
+LIGHTWEIGHT_PROFILE = True      # Headless + blocked assets (False = full windowed Chrome)
+WINDOW_SIZE = (1280, 1024)      # Fixed viewport; tall enough for the results grid
+MEASURE_TRANSFER = True         # Count bytes transferred (performance log)
+
+BLOCKED_URL_PATTERNS = [
+    # Images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Media
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8", "*.mov",
+    # Analytics, ads, tag managers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*hotjar.com*", "*segment.io*",
+    "*newrelic.com*", "*nr-data.net*", "*optimizely.com*", "*onetrust.com*",
+    "*cookielaw.org*", "*tiktok.com*", "*bing.com*", "*clarity.ms*",
+]
+
+TRANSFER_STATS = {"bytes": 0, "requests": 0}
+
+
+# -----------------------
+# Driver
+# -----------------------
+
+def chrome_options(lightweight=LIGHTWEIGHT_PROFILE, measure_transfer=MEASURE_TRANSFER):
+    """
+    Chrome options for the scraping profile.
+    """
+    options = webdriver.ChromeOptions()
+    if measure_transfer:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if not lightweight:
+        return options
+
+    width, height = WINDOW_SIZE
+    for argument in [
+        "--headless=new",
+        "--disable-gpu",
+        f"--window-size={width},{height}",
+        "--blink-settings=imagesEnabled=false",
+        "--mute-audio",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-features=site-per-process",   # Keep the results iframe in-process
+        "--disable-site-isolation-trials",
+    ]:
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+    })
+    return options
+
+
+def start_chrome(lightweight=LIGHTWEIGHT_PROFILE, measure_transfer=MEASURE_TRANSFER):
+    """
+    Starts Chrome with the scraping profile (or the full windowed browser).
+    """
+    driver = webdriver.Chrome(options=chrome_options(lightweight, measure_transfer))
+    if lightweight:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    else:
+        driver.maximize_window()
+    return driver
+
+
+# -----------------------
+# Bytes Transferred
+# -----------------------
+
+def transferred_bytes(driver):
+    """
+    Bytes received since the previous call (0 when measuring is off).
+    Drains the performance log, so call it regularly.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return 0
+
+    total = requests = 0
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message.get("method") == "Network.loadingFinished":
+            total += int(message["params"].get("encodedDataLength", 0))
+            requests += 1
+    TRANSFER_STATS["bytes"] += total
+    TRANSFER_STATS["requests"] += requests
+    return total
+
+
+def transfer_report():
+    mb = TRANSFER_STATS["bytes"] / 1_000_000
+    return f"📦 Transferred: {mb:.1f} MB in {TRANSFER_STATS['requests']} requests"
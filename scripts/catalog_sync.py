@@ -0,0 +1,145 @@
+"""
+catalog_sync.py
+
+────────────────────────────────────────────────────────────────────────────
+🔄 Race Catalog Delta Sync
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Compares a freshly scraped race catalog with the stored
+`all_ironman_races.csv`, matching races by URL, and records what changed
+instead of silently overwriting the file:
+
+- added           → URL not in the stored catalog
+- removed         → stored URL no longer listed
+- renamed         → same URL, different Race Name
+- course_changed  → Swim / Bike / Run changed
+- details_changed → Race Type / Location changed
+
+Every change is appended to a change log (one row per change and field),
+then the fresh catalog replaces the stored one. Every sync also logs one
+"synced" marker row (New = number of changes), so a sync that found
+nothing is still the latest sync.
+
+📤 What It Produces:
+--------------------
+- `data/urls/all_ironman_races.csv`  — the current catalog
+- `data/urls/catalog_changes.csv`    — columns:
+    Synced At, Change, URL, Race Name, Field, Old, New
+
+Downstream stages can ask for the races touched by the latest sync with
+`changed_urls()`, e.g. `ironman_results_scraper.py --changed-only`.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+CATALOG_CSV = "data/urls/all_ironman_races.csv"
+CHANGELOG_CSV = "data/urls/catalog_changes.csv"
+
+CHANGELOG_COLUMNS = ["Synced At", "Change", "URL", "Race Name", "Field", "Old", "New"]
+COURSE_FIELDS = ["Swim", "Bike", "Run"]
+DETAIL_FIELDS = ["Race Type", "Location"]
+
+# Changes after which a race's results are worth scraping again
+RESCRAPE_CHANGES = {"added", "renamed"}
+
+SYNC_MARKER = "synced"      # Change of the row logged once per sync
+
+
+# -----------------------
+# Diff
+# -----------------------
+
+def _read_catalog(path):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["Race Name", "URL", *DETAIL_FIELDS, *COURSE_FIELDS])
+    return pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+
+def diff_catalogs(old, new):
+    """
+    Returns the changes between two catalog DataFrames as a list of dicts
+    (Change, URL, Race Name, Field, Old, New), matched by URL.
+    """
+    old = old.drop_duplicates("URL").set_index("URL")
+    new = new.drop_duplicates("URL").set_index("URL")
+    changes = []
+
+    for url in new.index.difference(old.index, sort=False):
+        changes.append({"Change": "added", "URL": url, "Race Name": new.at[url, "Race Name"]})
+    for url in old.index.difference(new.index, sort=False):
+        changes.append({"Change": "removed", "URL": url, "Race Name": old.at[url, "Race Name"]})
+
+    compared = [("Race Name", "renamed")]
+    compared += [(field, "details_changed") for field in DETAIL_FIELDS]
+    compared += [(field, "course_changed") for field in COURSE_FIELDS]
+    compared = [(field, change) for field, change in compared if field in old.columns and field in new.columns]
+
+    for url in new.index.intersection(old.index, sort=False):
+        before, after = old.loc[url], new.loc[url]
+        for field, change in compared:
+            old_value, new_value = before[field], after[field]
+            if old_value != new_value:
+                changes.append({
+                    "Change": change, "URL": url, "Race Name": after["Race Name"],
+                    "Field": field, "Old": old_value, "New": new_value,
+                })
+    return changes
+
+
+# -----------------------
+# Sync
+# -----------------------
+
+def sync_catalog(new_catalog, catalog_path=CATALOG_CSV, changelog_path=CHANGELOG_CSV):
+    """
+    Diffs `new_catalog` (DataFrame) against the stored catalog, appends the
+    changes to the change log, then writes `new_catalog` as the catalog.
+    Returns the list of changes.
+    """
+    new_catalog = new_catalog.fillna("").astype(str)
+    changes = diff_catalogs(_read_catalog(catalog_path), new_catalog)
+
+    synced_at = datetime.now(timezone.utc).isoformat()
+    marker = {"Change": SYNC_MARKER, "New": str(len(changes))}
+    log = pd.DataFrame([*changes, marker], columns=CHANGELOG_COLUMNS).assign(**{"Synced At": synced_at})
+    os.makedirs(os.path.dirname(changelog_path) or ".", exist_ok=True)
+    log.to_csv(
+        changelog_path, mode="a", index=False, encoding="utf-8-sig",
+        header=not os.path.exists(changelog_path),
+    )
+
+    os.makedirs(os.path.dirname(catalog_path) or ".", exist_ok=True)
+    new_catalog.to_csv(catalog_path, index=False, encoding="utf-8-sig")
+    print(change_summary(changes))
+    return changes
+
+
+def change_summary(changes):
+    """
+    One-line count of changes per kind.
+    """
+    if not changes:
+        return "🔄 Catalog unchanged"
+    counts = pd.Series([change["Change"] for change in changes]).value_counts()
+    return "🔄 Catalog changes: " + ", ".join(f"{kind} {count}" for kind, count in counts.items())
+
+
+def changed_urls(changelog_path=CHANGELOG_CSV, changes=RESCRAPE_CHANGES):
+    """
+    Returns the URLs with a change of the given kinds in the latest sync
+    (empty when the latest sync found no changes).
+    """
+    if not os.path.exists(changelog_path):
+        return set()
+    log = pd.read_csv(changelog_path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    if log.empty:
+        return set()
+    latest = log[log["Synced At"] == log["Synced At"].iloc[-1]]  # Appended in sync order
+    return set(latest.loc[latest["Change"].isin(changes), "URL"])
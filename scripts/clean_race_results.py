@@ -8,19 +8,22 @@ clean_race_results.py
 🔍 What It Does:
 ---------------
 This script loads combined IRONMAN and IRONMAN WC race data, cleans and standardizes it,
-and saves the result in both CSV and Parquet formats. It performs:
-
-- Date formatting and year extraction
-- Conversion of ranks and times to numeric/timedelta
+and saves the result in both CSV and Parquet formats. The combined
+dataset is read once ("both" view, with a wc flag) and cleaned once; the
+races / wc / races + wc outputs are split from it by the flag. It performs:
+
+- Year extraction
+- Conversion of split seconds to timedelta (ranks, splits and dates
+  arrive already typed by the results schema, see results_schema.py, so
+  no string is parsed again here)
 - Gender inference from division codes
 - Filtering out invalid or incomplete entries
 - Merging of race types from race metadata
 
 📥 Input:
 --------
-- Combined CSV files:
-  - `all_races_combined.csv`
-  - `all_races_and_wc_combined.csv`
+- Combined dataset (see combine_race_results.py):
+  - `data/results/combined/results/` (partitioned by the wc flag)
 - Metadata file:
   - `all_ironman_races.csv` (used to assign Race Type)
 
@@ -36,89 +39,110 @@ and saves the result in both CSV and Parquet formats. It performs:
 
 import pandas as pd
 import os
+from combine_race_results import VIEWS, CombineStore
+from results_schema import SPLIT_COLUMNS
 
 # -------------------------------
-# File Paths
+# Outputs (label → view of the combined dataset)
 # -------------------------------
 
-input_files = {
-    "data": "data/results/combined/all_races_combined.csv",
-    "data_and_wc": "data/results/combined/all_races_and_wc_combined.csv",
-    "wc": "data/results/combined/all_races_wc_combined.csv"
+outputs = {
+    "data": "races",
+    "data_and_wc": "both",
+    "wc": "wc",
 }
 
+
+def output_rows(df, label):
+    """
+    Boolean mask of the rows that belong to one output (by the wc flag).
+    """
+    return df["WC"].isin([group == "wc" for group in VIEWS[outputs[label]]])
+
+
 races_data = pd.read_csv("data/urls/all_ironman_races.csv")
 
 # -------------------------------
 # Columns to Convert
 # -------------------------------
 
-numeric_cols = ["Year", "Div Rank", "Gender Rank", "Overall Rank"]
-time_cols = [
-    "Swim Time", "Transition 1", "Bike Time",
-    "Transition 2", "Run Time", "Finish Time"
-]
+time_cols = SPLIT_COLUMNS   # Nullable int seconds → timedelta
 
 # -------------------------------
-# Processing Loop
+# Load Once (races + wc, flagged)
 # -------------------------------
 
-for label, path in input_files.items():
-    print(f"\n🧼 Processing: {label}")
+print("\n🧼 Processing: races + wc")
 
-    df = pd.read_csv(path, low_memory=False)
+store = CombineStore()
+df = store.view("both", wc_flag=True)
+view_columns = {label: [c.strip() for c in store.view_columns(view)] for label, view in outputs.items()}
 
-    # Drop fully empty columns and unnamed index artifacts
-    df = df.dropna(axis=1, how='all')
-    df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-    df.columns = df.columns.str.strip()
+# Drop unnamed index artifacts
+df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+df.columns = df.columns.str.strip()
 
-    # Merge Race Type from metadata
-    df = df.merge(
-        races_data[["Race Name", "Race Type"]],
-        on="Race Name",
-        how="left"
-    )
+# Fully empty columns are dropped per output, as if each output were cleaned on its own
+empty_columns = {
+    label: [column for column in df.columns if column != "WC" and df.loc[output_rows(df, label), column].isna().all()]
+    for label in outputs
+}
 
-    # Convert race date and extract year
-    df['Race Date'] = pd.to_datetime(df['Race Date'], format='%Y - %B %d', errors='coerce')
-    df['Year'] = df['Race Date'].dt.year
+# -------------------------------
+# Clean Once
+# -------------------------------
 
-    # Convert numeric and time columns
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
-    for col in time_cols:
-        df[col] = pd.to_timedelta(df[col], errors="coerce")
+# Merge Race Type from metadata
+df = df.merge(
+    races_data[["Race Name", "Race Type"]],
+    on="Race Name",
+    how="left"
+)
 
-    # Clean Division values
-    df["Division"] = df["Division"].astype(str).fillna("")
-    df = df[df["Division"].str.startswith(("M", "F"))]
+# Extract year (Race Date is already a date)
+df['Year'] = df['Race Date'].dt.year
 
-    # Patch missing ranks (where Gender & Overall rank are both missing)
-    mask = df[['Gender Rank', 'Overall Rank']].isna().all(axis=1)
-    df.loc[mask, 'Overall Rank'] = df.loc[mask, 'Div Rank']
-    df.loc[mask, 'Div Rank'] = None
+# Convert split seconds to timedeltas (ranks are already nullable ints)
+for col in time_cols:
+    df[col] = pd.to_timedelta(df[col], unit="s")
 
-    # Add Gender column based on Division prefix
-    df["Gender"] = df["Division"].apply(
-        lambda x: "Male" if x.startswith("M") else ("Female" if x.startswith("F") else "Unknown")
-    )
+# Clean Division values
+df["Division"] = df["Division"].astype(str).fillna("")
+df = df[df["Division"].str.startswith(("M", "F"))]
+
+# Patch missing ranks (where Gender & Overall rank are both missing)
+mask = df[['Gender Rank', 'Overall Rank']].isna().all(axis=1)
+df.loc[mask, 'Overall Rank'] = df.loc[mask, 'Div Rank']
+df.loc[mask, 'Div Rank'] = None
+
+# Add Gender column based on Division prefix
+df["Gender"] = df["Division"].apply(
+    lambda x: "Male" if x.startswith("M") else ("Female" if x.startswith("F") else "Unknown")
+)
+
+# Remove entries with zero duration (invalid results)
+df = df[df["Bike Time"] > pd.Timedelta(0)]
+df = df[df["Run Time"] > pd.Timedelta(0)]
+df = df[df["Finish Time"] > pd.Timedelta(0)]
+
+# -------------------------------
+# Save Outputs
+# -------------------------------
 
-    # Remove entries with zero duration (invalid results)
-    df = df[df["Bike Time"] > pd.Timedelta(0)]
-    df = df[df["Run Time"] > pd.Timedelta(0)]
-    df = df[df["Finish Time"] > pd.Timedelta(0)]
+cleaned_dir = "data/results/cleaned"
+os.makedirs(cleaned_dir, exist_ok=True)
 
-    # -------------------------------
-    # Save Outputs
-    # -------------------------------
+for label in outputs:
+    df_out = df[output_rows(df, label)].drop(columns=["WC", *empty_columns[label]])
 
-    cleaned_dir = "data/results/cleaned"
-    os.makedirs(cleaned_dir, exist_ok=True)
+    # Same column order as cleaning this output on its own
+    first = [column for column in view_columns[label] if column in df_out]
+    df_out = df_out[first + [column for column in df_out.columns if column not in first]]
 
     parquet_path = f"{cleaned_dir}/cleaned_races_{label}.parquet"
     csv_path = f"{cleaned_dir}/cleaned_races_{label}.csv"
 
-    df.to_parquet(parquet_path, index=False)
-    df.to_csv(csv_path, index=False)
+    df_out.to_parquet(parquet_path, index=False)
+    df_out.to_csv(csv_path, index=False)
 
     print(f"✅ Cleaned and saved to: {csv_path}")
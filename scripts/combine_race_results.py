@@ -10,70 +10,544 @@ combine_race_results.py
 1. Combines all CSV files from two directories:
    - General races → `data/results/races/`
    - World Championships → `data/results/wc/`
-2. Saves each group as a single combined file.
-3. Merges both groups into a master combined dataset.
+2. Stores both groups as one partitioned Parquet dataset, with a `wc`
+   flag partition.
+3. "races", "wc" and "both" are views over that one copy
+   (`read_view()`), read by `clean_race_results.py`.
+
+Runs are incremental: only new or changed race files are parsed, and the
+combined files are only touched when an input changed.
 
 📁 Input Directories:
 ---------------------
 - `data/results/races/` → Individual general race result CSVs
 - `data/results/wc/`    → Individual wc race result CSVs
 
+Every file is read with the one declared results schema
+(results_schema.py): CSVs as plain text, no dtype inference, parsed once
+into fixed types (ranks and split seconds as nullable ints, Race Date as
+a date), with the columns a file lacks (DNS/DQ/DNF rows) filled as typed
+nulls. Typed per-race Parquet files from the scraper are taken as they
+are; a legacy CSV written next to one (WRITE_CSV_EXPORT) is skipped, so
+every race is read once. Every part of the combined dataset therefore has the same schema.
+
+⚡ Parallel Ingestion:
+---------------------
+Per-race files are parsed across a process pool (MAX_WORKERS processes,
+one `read_results` per file) and concatenated once, in directory order,
+so the result is the same as the serial read. Small directories
+(< PARALLEL_MIN_FILES files) are read serially.
+
+Workers hand back DataFrames, not Arrow tables. Turning each parsed file
+into a table (and the combined table back into pandas) cost more than the
+pickling it saves. `--benchmark` on 200 legacy CSVs (300k rows):
+
+    DataFrames    serial 21.0s | 4 workers 26.3s
+    Arrow tables  serial 25.1s | 4 workers 31.9s
+
+On 1,200 files (1.8M rows) the same held: DataFrames 151s / 177s, tables
+202s / 206s. Both runs were on a single core, so the pool itself could
+not pay off there.
+
+    python scripts/combine_race_results.py --benchmark
+
+times the serial and the parallel read of both directories, checks that
+they give identical frames and prints the speed-up.
+
+🗃️ Incremental Store:
+---------------------
+Every parsed race file is kept as its own Parquet part of the dataset,
+and `_manifest.json` records each input's size, mtime and SHA-256:
+
+    data/results/combined/results/
+    ├── _manifest.json
+    ├── wc=false/<race file>.parquet     # data/results/races
+    └── wc=true/<race file>.parquet      # data/results/wc
+
+- size and mtime unchanged      → file skipped, no read at all
+- size or mtime changed         → content hashed; re-parsed only if the
+                                  hash changed (a `touch` costs a hash)
+- file gone from the directory  → its part is deleted (after `--full`
+                                  or a format rebuild too: any part not
+                                  in the new manifest is removed)
+
+`--full` ignores the manifest and re-parses everything; so does a store
+whose parts were written in an older format (PART_FORMAT).
+
+🌊 Streaming Exports:
+---------------------
+Single-file outputs are written part by part, never by concatenating the
+whole view in memory: parts are conformed to one schema (union of their
+columns, conflicting types widened) and buffered only until they reach
+MEMORY_LIMIT_MB, then written out as one zstd-compressed row group (or
+appended to the CSV). Memory stays flat at about the ceiling plus one
+race file, however many races exist.
+
+    python scripts/combine_race_results.py --export-parquet all_results.parquet \
+        [--view both] [--memory-limit-mb 128]
+
 📤 Output Files:
 ----------------
-- `data/results/combined/all_races_combined.csv`
-- `data/results/combined/all_races_wc_combined.csv`
-- `data/results/combined/all_races_and_wc_combined.csv`
+- `data/results/combined/results/` → the partitioned dataset
+- `--export-parquet PATH`: one view as a single Parquet file (streamed)
+- With WRITE_CSV_EXPORTS, the per-group CSVs for older tools (streamed
+  from the parts, or appended to when only new races were added):
+  - `data/results/combined/all_races_combined.csv`
+  - `data/results/combined/all_races_wc_combined.csv`
+  The races + wc CSV is no longer written: use `read_view("both")`.
+  CSV exports keep the old text layout ("h:mm:ss", "N/A").
 
 ────────────────────────────────────────────────────────────────────────────
 """
 
+import argparse
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from results_schema import apply_results_schema, from_arrow, legacy_text, read_results, write_results_parquet
+
+# -------------------------------
+# Configurable Settings
+# -------------------------------
+
+MAX_WORKERS = os.cpu_count() or 1   # Processes parsing race files (1 = serial)
+PARALLEL_MIN_FILES = 16             # Below this, starting a pool costs more than it saves
+
+WRITE_CSV_EXPORTS = False           # Also write the per-group combined CSVs
+MEMORY_LIMIT_MB = 256               # Rows buffered by the streaming writers before a flush
+PARQUET_COMPRESSION = "zstd"
+
+races_dir = "data/results/races"
+wc_dir = "data/results/wc"
+store_dir = "data/results/combined/results"
+
+PART_FORMAT = 2     # Bump when the part layout changes: older stores are re-parsed
+
+# Store group → partition directory, and which groups each view covers
+PARTITIONS = {"races": "wc=false", "wc": "wc=true"}
+VIEWS = {"races": ["races"], "wc": ["wc"], "both": ["races", "wc"]}
 
 # -------------------------------
 # Helper: Combine CSVs in a Folder
 # -------------------------------
 
-def combine_csvs_from_directory(input_dir):
+def race_files(input_dir):
     """
-    Combines all .csv files in the given directory into a single DataFrame.
+    The race files of a directory, in directory order: one per race, the
+    .parquet when the scraper also wrote the legacy .csv next to it.
     """
-    combined_data = []
-    for file in os.listdir(input_dir):
-        if file.endswith(".csv"):
-            file_path = os.path.join(input_dir, file)
-            df = pd.read_csv(file_path, low_memory=False)
-            combined_data.append(df)
+    files = [file for file in os.listdir(input_dir) if file.endswith((".csv", ".parquet"))]
+    parquet_stems = {file[:-len(".parquet")] for file in files if file.endswith(".parquet")}
+    return [
+        os.path.join(input_dir, file)
+        for file in files
+        if not (file.endswith(".csv") and file[:-len(".csv")] in parquet_stems)
+    ]
+
+
+def read_race_file(file_path):
+    """
+    Reads one race file with the results schema (runs inside the worker
+    processes).
+    """
+    return read_results(file_path)
+
+
+def _map_files(function, items, workers):
+    """
+    `function` over `items`, across a process pool for large batches.
+    Results come back pickled (DataFrames for combine_csvs_from_directory,
+    row counts for the store, which writes its parts in the workers).
+    """
+    if workers > 1 and len(items) >= PARALLEL_MIN_FILES:
+        # Several files per task keeps the pickling overhead per file low
+        chunksize = max(1, len(items) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(function, items, chunksize=chunksize))
+    return [function(item) for item in items]
+
+
+def combine_csvs_from_directory(input_dir, workers=MAX_WORKERS):
+    """
+    Combines all .csv (and .parquet) files in the given directory into a single DataFrame.
+    """
+    combined_data = _map_files(read_race_file, race_files(input_dir), workers)
     return pd.concat(combined_data, ignore_index=True) if combined_data else pd.DataFrame()
 
 # -------------------------------
-# Step 1: Combine General Race Results
+# Incremental Store
 # -------------------------------
 
-races_dir = "data/results/races"
-combined_races = combine_csvs_from_directory(races_dir)
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parse_to_part(job):
+    """
+    Parses one race file and writes it as a Parquet part (runs inside the
+    worker processes, so no DataFrame travels back). Returns the row count.
+    """
+    file_path, part_path = job
+    df = read_race_file(file_path)
+    tmp_path = f"{part_path}.tmp"
+    write_results_parquet(df, tmp_path)
+    os.replace(tmp_path, part_path)
+    return len(df)
+
+
+def _read_parts(paths):
+    """
+    Parts → one typed DataFrame (one Arrow concat, no parsing).
+    """
+    if not paths:
+        return apply_results_schema(pd.DataFrame())
+    return from_arrow(pa.concat_tables([pq.read_table(path) for path in paths], promote_options="default"))
+
+
+class CombineStore:
+    """
+    One Parquet part per parsed race file, partitioned by group, plus a
+    manifest of the inputs (size, mtime, SHA-256) they were parsed from.
+    """
+
+    def __init__(self, path=store_dir):
+        self.path = path
+        self.manifest_path = os.path.join(path, "_manifest.json")  # "_" keeps Parquet readers off it
+        self.manifest = {}  # group → {file name → {size, mtime_ns, sha256, rows}}, in directory order
+        self.rebuilt = False  # True when the stored parts have to be re-parsed (format change)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("format") == PART_FORMAT:
+                self.manifest = stored["groups"]
+            else:
+                print("🔁 Combined store has an older part format, re-parsing every race file")
+                self.rebuilt = True
+
+    def part_path(self, group, file_name):
+        return os.path.join(self.path, PARTITIONS[group], f"{file_name}.parquet")
+
+    def reset(self):
+        """
+        Forgets the manifest, so the next sync re-parses every input.
+        """
+        self.manifest = {}
+        self.rebuilt = True
+
+    def sync(self, group, input_dir, workers=MAX_WORKERS):
+        """
+        Brings the parts of `group` in line with `input_dir`. Returns
+        {"added": [...], "changed": [...], "removed": [...]} file names.
+        """
+        os.makedirs(os.path.join(self.path, PARTITIONS[group]), exist_ok=True)
+        previous = self.manifest.get(group, {})
+        current = {}
+        changes = {"added": [], "changed": [], "removed": []}
+        jobs = []
+
+        for file_path in race_files(input_dir):
+            file_name = os.path.basename(file_path)
+            stat = os.stat(file_path)
+            entry = previous.get(file_name)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                current[file_name] = entry
+                continue
+            sha256 = file_sha256(file_path)
+            if entry and entry["sha256"] == sha256 and os.path.exists(self.part_path(group, file_name)):
+                current[file_name] = {**entry, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                continue
+            current[file_name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+            changes["changed" if entry else "added"].append(file_name)
+            jobs.append((file_path, self.part_path(group, file_name)))
+
+        for (file_path, _), rows in zip(jobs, _map_files(_parse_to_part, jobs, workers)):
+            current[os.path.basename(file_path)]["rows"] = rows
+
+        for file_name in previous:
+            if file_name not in current:
+                changes["removed"].append(file_name)
+
+        # Parts outside the new manifest: inputs removed since the last run
+        # (also after --full or a format rebuild, which start from an empty
+        # manifest) and leftovers of interrupted writes
+        partition_dir = os.path.join(self.path, PARTITIONS[group])
+        expected = {os.path.basename(self.part_path(group, file_name)) for file_name in current}
+        for part_file in os.listdir(partition_dir):
+            if part_file not in expected:
+                os.remove(os.path.join(partition_dir, part_file))
+
+        self.manifest[group] = current
+        self._save()
+        return changes
+
+    def _save(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": PART_FORMAT, "groups": self.manifest}, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def load(self, group, file_names=None):
+        """
+        The combined rows of `group` (or of just `file_names`), in input order.
+        """
+        file_names = list(self.manifest.get(group, {})) if file_names is None else file_names
+        return _read_parts([self.part_path(group, file_name) for file_name in file_names])
+
+    def view(self, name, wc_flag=False):
+        """
+        "races", "wc" or "both" as one DataFrame. With `wc_flag`, a boolean
+        "WC" column tells the groups apart.
+        """
+        frames = []
+        for group in VIEWS[name]:
+            df = self.load(group)
+            if wc_flag:
+                df["WC"] = group == "wc"
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True)
+
+    def view_parts(self, name):
+        """
+        Part paths of a view, in input order.
+        """
+        return [
+            self.part_path(group, file_name)
+            for group in VIEWS[name]
+            for file_name in self.manifest.get(group, {})
+        ]
+
+    def view_columns(self, name):
+        """
+        Column order of a view (as `view()` would build it), from the part
+        schemas only.
+        """
+        columns = {}
+        for group in VIEWS[name]:
+            for file_name in self.manifest.get(group, {}):
+                columns.update(dict.fromkeys(pq.read_schema(self.part_path(group, file_name)).names))
+        return list(columns)
+
+
+def read_view(name="both", wc_flag=False, path=store_dir):
+    """
+    Reads one view of the combined dataset: "races", "wc" or "both".
+    """
+    return CombineStore(path).view(name, wc_flag)
 
-races_output_path = "data/results/combined/all_races_combined.csv"
-combined_races.to_csv(races_output_path, index=False)
-print(f"✅ General race data combined and saved to '{races_output_path}'")
 
 # -------------------------------
-# Step 2: Combine wc Race Results
+# Streaming Writers (bounded memory)
 # -------------------------------
 
-wc_dir = "data/results/wc"
-combined_wc = combine_csvs_from_directory(wc_dir)
+def _widen(a, b):
+    if a == b or pa.types.is_null(b):
+        return a
+    if pa.types.is_null(a):
+        return b
+    numeric = (pa.types.is_integer, pa.types.is_floating)
+    if any(check(a) for check in numeric) and any(check(b) for check in numeric):
+        return pa.float64()
+    return pa.large_string()
+
+
+def unified_schema(paths):
+    """
+    One Arrow schema for parts whose columns and types differ: columns in
+    order of appearance, int + float → float, other conflicts → string.
+    Reads the part footers only.
+    """
+    types = {}
+    for path in paths:
+        for field in pq.read_schema(path):
+            types[field.name] = _widen(types[field.name], field.type) if field.name in types else field.type
+    return pa.schema([(name, pa.large_string() if pa.types.is_null(t) else t) for name, t in types.items()])
+
+
+def _conform(table, schema):
+    """
+    `table` with exactly the columns of `schema`: missing ones as typed
+    nulls, the others cast.
+    """
+    columns = [
+        table.column(field.name).cast(field.type) if field.name in table.column_names
+        else pa.nulls(table.num_rows, field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def stream_tables(paths, schema, memory_limit_mb=MEMORY_LIMIT_MB):
+    """
+    Yields the parts as conformed tables of about `memory_limit_mb` each.
+    Only the current buffer is held in memory.
+    """
+    limit = memory_limit_mb * 1024 * 1024
+    buffer, buffered = [], 0
+    for path in paths:
+        table = _conform(pq.read_table(path), schema)
+        buffer.append(table)
+        buffered += table.nbytes
+        if buffered >= limit:
+            yield pa.concat_tables(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield pa.concat_tables(buffer)
+
+
+def write_parquet_stream(paths, output_path, memory_limit_mb=MEMORY_LIMIT_MB):
+    """
+    Writes the parts as one Parquet file, one compressed row group per
+    buffer. Returns the number of rows written.
+    """
+    schema = unified_schema(paths)
+    rows = 0
+    tmp_path = f"{output_path}.tmp"
+    with pq.ParquetWriter(tmp_path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for table in stream_tables(paths, schema, memory_limit_mb):
+            writer.write_table(table, row_group_size=max(table.num_rows, 1))
+            rows += table.num_rows
+            del table  # Let the buffer go before the next one fills
+    os.replace(tmp_path, output_path)
+    return rows
+
+
+def write_csv_stream(paths, output_path, memory_limit_mb=MEMORY_LIMIT_MB):
+    """
+    Writes the parts as one CSV, appending one buffer at a time. Returns
+    the number of rows written.
+    """
+    schema = unified_schema(paths)
+    rows = 0
+    tmp_path = f"{output_path}.tmp"
+    pd.DataFrame(columns=schema.names).to_csv(tmp_path, index=False)
+    for table in stream_tables(paths, schema, memory_limit_mb):
+        legacy_text(from_arrow(table)).to_csv(tmp_path, mode="a", header=False, index=False)
+        rows += table.num_rows
+        del table
+    os.replace(tmp_path, output_path)
+    return rows
 
-wc_output_path = "data/results/combined/all_races_wc_combined.csv"
-combined_wc.to_csv(wc_output_path, index=False)
-print(f"✅ WC race data combined and saved to '{wc_output_path}'")
+
+def export_csv(store, groups, output_path, changes, rebuild=False, memory_limit_mb=MEMORY_LIMIT_MB):
+    """
+    Writes the combined CSV of `groups` from the store: skipped when no
+    input changed, appended to when only new races (with known columns)
+    were added, rewritten otherwise (or always, with `rebuild`).
+    """
+    group_changes = [changes[group] for group in groups]
+    if rebuild or not os.path.exists(output_path):
+        group_changes = [{"changed": [None]}]  # Forces the full rewrite below
+    elif not any(any(c.values()) for c in group_changes):
+        print(f"⏭️ Unchanged: '{output_path}'")
+        return
+
+    if not any(c.get("changed") or c.get("removed") for c in group_changes):
+        header = list(pd.read_csv(output_path, nrows=0).columns)
+        added = legacy_text(pd.concat(
+            [store.load(group, changes[group]["added"]) for group in groups], ignore_index=True
+        ))
+        if set(added.columns) <= set(header):
+            added.reindex(columns=header).to_csv(output_path, mode="a", header=False, index=False)
+            print(f"➕ Appended {len(added)} rows to '{output_path}'")
+            return
+
+    paths = [store.part_path(group, file_name) for group in groups for file_name in store.manifest.get(group, {})]
+    rows = write_csv_stream(paths, output_path, memory_limit_mb)
+    print(f"✅ Rebuilt '{output_path}' ({rows} rows)")
 
 # -------------------------------
-# Step 3: Merge Both Groups Into Final Dataset
+# Benchmark: Serial vs. Parallel
 # -------------------------------
 
-final_combined = pd.concat([combined_races, combined_wc], ignore_index=True)
+def benchmark(input_dirs, workers=MAX_WORKERS):
+    """
+    Times the serial and the parallel read of each directory and checks
+    that both give the same DataFrame.
+    """
+    for input_dir in input_dirs:
+        if not os.path.isdir(input_dir):
+            continue
+        started = time.perf_counter()
+        serial = combine_csvs_from_directory(input_dir, workers=1)
+        serial_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        parallel = combine_csvs_from_directory(input_dir, workers=workers)
+        parallel_seconds = time.perf_counter() - started
+
+        pd.testing.assert_frame_equal(serial, parallel)
+        print(
+            f"⏱️ {input_dir}: {len(race_files(input_dir))} files, {len(serial)} rows | "
+            f"serial {serial_seconds:.1f}s | {workers} workers {parallel_seconds:.1f}s | "
+            f"speed-up ×{serial_seconds / max(parallel_seconds, 1e-9):.1f} (identical result)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Combine per-race results into combined CSVs.")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Processes parsing race files")
+    parser.add_argument(
+        "--benchmark", action="store_true",
+        help="Compare serial and parallel reading of the input directories, write nothing",
+    )
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and re-parse every race file")
+    parser.add_argument(
+        "--export-parquet", metavar="PATH", help="Also write one view as a single Parquet file (streamed)",
+    )
+    parser.add_argument("--view", choices=list(VIEWS), default="both", help="View for --export-parquet")
+    parser.add_argument(
+        "--memory-limit-mb", type=int, default=MEMORY_LIMIT_MB,
+        help="Rows buffered before the streaming writers flush a row group",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark([races_dir, wc_dir], args.workers)
+        raise SystemExit(0)
+
+    store = CombineStore()
+    if args.full:
+        store.reset()
+    rebuild = store.rebuilt
+
+    # -------------------------------
+    # Step 1: Combine General Race Results
+    # -------------------------------
+
+    changes = {"races": store.sync("races", races_dir, args.workers)}
+    print("🗃️ races: " + " | ".join(f"{kind} {len(files)}" for kind, files in changes["races"].items()))
+
+    if WRITE_CSV_EXPORTS:
+        races_output_path = "data/results/combined/all_races_combined.csv"
+        export_csv(store, ["races"], races_output_path, changes, rebuild, args.memory_limit_mb)
+
+    # -------------------------------
+    # Step 2: Combine wc Race Results
+    # -------------------------------
+
+    changes["wc"] = store.sync("wc", wc_dir, args.workers)
+    print("🗃️ wc: " + " | ".join(f"{kind} {len(files)}" for kind, files in changes["wc"].items()))
+
+    if WRITE_CSV_EXPORTS:
+        wc_output_path = "data/results/combined/all_races_wc_combined.csv"
+        export_csv(store, ["wc"], wc_output_path, changes, rebuild, args.memory_limit_mb)
+
+    # -------------------------------
+    # Step 3: Races + wc Is a View, Not a Copy
+    # -------------------------------
+
+    print(f"🎉 All race + wc data combined in '{store.path}' (views: {', '.join(VIEWS)})")
 
-final_output_path = "data/results/combined/all_races_and_WC_combined.csv"
-final_combined.to_csv(final_output_path, index=False)
-print(f"🎉 All race + wc data combined and saved to '{final_output_path}'")
+    if args.export_parquet:
+        rows = write_parquet_stream(store.view_parts(args.view), args.export_parquet, args.memory_limit_mb)
+        print(f"✅ Exported view '{args.view}' ({rows} rows) to '{args.export_parquet}'")
@@ -0,0 +1,196 @@
+"""
+geocode_catalog.py
+
+────────────────────────────────────────────────────────────────────────────
+📍 Race Location Geocoding with a Persistent Cache
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Adds Latitude / Longitude to the race catalog (`all_ironman_races.csv`),
+which `dashboard/pages/4_WC_Slots.py` uses for its distance search.
+
+- Every distinct Location is resolved once, ever: results (including
+  "not found") are stored in an on-disk cache keyed by the normalized
+  location text ("Cairns,  Australia " → "cairns, australia")
+- The geocoder is pluggable — any object with
+  `geocode(location) -> (lat, lon) | None`:
+    - NominatimGeocoder → OpenStreetMap via geopy, one request per second
+    - StaticGeocoder    → a fixed {location: (lat, lon)} mapping, for tests
+                          and offline runs
+- With no geocoder (`--offline`) only cached locations are filled in
+
+📁 Cache:
+---------
+`data/urls/geocode_cache.jsonl`, one line per location, last line wins:
+    {"key": "cairns, australia", "location": "Cairns, Australia",
+     "lat": -16.92, "lon": 145.77}
+
+Usage:
+    python scripts/geocode_catalog.py [--catalog PATH] [--offline]
+
+⚠️ Known Notes:
+----------------
+- Only a lookup that returns None is cached as "not found" (lat/lon
+  null); delete its line from the cache to retry it.
+- A lookup that raises (timeout, network or service error) is not
+  cached, so the next run tries it again.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import argparse
+import json
+import os
+import re
+
+import pandas as pd
+
+CATALOG_CSV = "data/urls/all_ironman_races.csv"
+CACHE_PATH = "data/urls/geocode_cache.jsonl"
+USER_AGENT = "ironman-races-analysis"
+MIN_DELAY_SECONDS = 1.0     # Nominatim usage policy: at most 1 request per second
+
+
+def normalize_location(location):
+    """
+    Cache key for a Location: lower case, single spaces, tidy commas.
+    """
+    text = " ".join(str(location).split()).casefold()
+    return re.sub(r"\s*,\s*", ", ", text).strip(" ,")
+
+
+# -----------------------
+# Geocoders
+# -----------------------
+
+class StaticGeocoder:
+    """
+    Resolves locations from a fixed mapping (keys are normalized).
+    """
+
+    def __init__(self, coordinates):
+        self.coordinates = {normalize_location(k): v for k, v in coordinates.items()}
+        self.lookups = 0
+
+    def geocode(self, location):
+        self.lookups += 1
+        return self.coordinates.get(normalize_location(location))
+
+
+class NominatimGeocoder:
+    """
+    OpenStreetMap Nominatim through geopy, rate limited to one request
+    per second.
+    """
+
+    def __init__(self, user_agent=USER_AGENT, min_delay_seconds=MIN_DELAY_SECONDS):
+        from geopy.extra.rate_limiter import RateLimiter
+        from geopy.geocoders import Nominatim
+
+        self._geocode = RateLimiter(
+            Nominatim(user_agent=user_agent).geocode, min_delay_seconds=min_delay_seconds
+        )
+        self.lookups = 0
+
+    def geocode(self, location):
+        self.lookups += 1
+        place = self._geocode(location)
+        if place is None:
+            return None
+        return place.latitude, place.longitude
+
+
+# -----------------------
+# Cache
+# -----------------------
+
+class GeocodeCache:
+    """
+    Append-only JSONL cache of geocoding results keyed by normalized location.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line from an interrupted run
+                    self.entries[entry["key"]] = entry
+
+    def __contains__(self, location):
+        return normalize_location(location) in self.entries
+
+    def get(self, location):
+        """
+        Returns (lat, lon), or None when unknown or cached as not found.
+        """
+        entry = self.entries.get(normalize_location(location))
+        if entry is None or entry["lat"] is None:
+            return None
+        return entry["lat"], entry["lon"]
+
+    def put(self, location, coordinates):
+        lat, lon = coordinates if coordinates else (None, None)
+        entry = {"key": normalize_location(location), "location": location, "lat": lat, "lon": lon}
+        self.entries[entry["key"]] = entry
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+# -----------------------
+# Catalog
+# -----------------------
+
+def geocode_catalog(catalog, geocoder=None, cache=None):
+    """
+    Returns a copy of `catalog` with Latitude / Longitude columns. Only
+    locations missing from the cache are sent to `geocoder`; without a
+    geocoder, uncached locations stay empty.
+    """
+    cache = cache if cache is not None else GeocodeCache()
+    catalog = catalog.copy()
+
+    new_lookups = failures = 0
+    for location in catalog["Location"].dropna().unique():
+        if location in cache or geocoder is None:
+            continue
+        try:
+            coordinates = geocoder.geocode(location)
+        except Exception as e:
+            # Not cached, so the next run tries again
+            print(f"⚠️ Geocoding failed for '{location}': {str(e)[:100]}")
+            failures += 1
+            continue
+        cache.put(location, coordinates)
+        new_lookups += 1
+
+    coordinates = catalog["Location"].map(lambda location: cache.get(location) if pd.notna(location) else None)
+    catalog["Latitude"] = coordinates.map(lambda c: c[0] if c else None)
+    catalog["Longitude"] = coordinates.map(lambda c: c[1] if c else None)
+
+    located = int(catalog["Latitude"].notna().sum())
+    print(f"📍 Located {located}/{len(catalog)} races ({new_lookups} new lookups, {failures} failed)")
+    return catalog
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add Latitude/Longitude to the race catalog.")
+    parser.add_argument("--catalog", default=CATALOG_CSV, help="Race catalog CSV to update in place")
+    parser.add_argument("--cache", default=CACHE_PATH, help="Geocode cache (JSONL)")
+    parser.add_argument("--offline", action="store_true", help="Only use cached coordinates")
+    args = parser.parse_args()
+
+    races = pd.read_csv(args.catalog, encoding="utf-8-sig")
+    races = geocode_catalog(
+        races, None if args.offline else NominatimGeocoder(), GeocodeCache(args.cache)
+    )
+    races.to_csv(args.catalog, index=False, encoding="utf-8-sig")
+    print(f"✅ Saved: {args.catalog}")
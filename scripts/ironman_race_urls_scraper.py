@@ -9,21 +9,38 @@ For each race, it collects:
 - Swim, Bike, Run terrain types (if available)
 
 The full race list is saved as 'all_ironman_races.csv'.
+
+"Load More" waits are event-driven (waits.py): the loop continues as soon
+as new race cards appear instead of sleeping a fixed time.
+
+Cards are parsed incrementally: after each "Load More" only the newly
+added cards are read, all of them in a single script call.
+
+The browser is the lightweight headless profile from browser_profile.py
+(images, fonts, media and analytics blocked); bytes transferred are
+reported at the end.
+
+No browser needed: race_catalog_crawler.py replaces this script for
+fetching the catalog. It reads the same listing pages over HTTP with
+AsyncFetcher (async_fetcher.py) and writes the same CSV in seconds. This
+Selenium version is kept as a fallback for when the listing is only
+rendered in a browser; it does not use AsyncFetcher.
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
-import time
+from selenium.common.exceptions import TimeoutException
+from browser_profile import start_chrome, transfer_report, transferred_bytes
+from race_catalog_crawler import catalog_row
+from waits import wait_for_count_increase, wait_report
 
 # -----------------------
 # Setup
 # -----------------------
 
-driver = webdriver.Chrome()
-driver.maximize_window()
+driver = start_chrome()
 driver.get("https://www.ironman.com/races")
 wait = WebDriverWait(driver, 20)
 race_data = []
@@ -33,62 +50,50 @@ race_data = []
 # Race Extraction Function
 # -----------------------
 
+# Reads every card from index `start` on in one script call
+_READ_CARDS_JS = """
+const cards = Array.from(document.querySelectorAll(".highlighted-card-wrapper")).slice(arguments[0]);
+const text = (root, css) => {
+    const el = root.querySelector(css);
+    return el ? el.innerText.trim() : null;  // Visible text, like WebElement.text
+};
+return cards.map(card => {
+    const link = card.querySelector("a.button--secondary");
+    const icons = Array.from(card.querySelectorAll(".icon-field-item")).map(field => ({
+        label: text(field, ".icon-field-label") || "",
+        value: text(field, ".icon-field-value") || "",
+    }));
+    return {
+        title: text(card, "h2"),
+        location: text(card, ".country-flag-formatter .label"),
+        url: link ? link.href : null,
+        icons: icons,
+    };
+});
+"""
+
+parsed_count = 0   # Cards already extracted (the list only grows)
+seen_urls = set()
+
+
 def extract_races():
     """
-    Extracts race information from currently loaded race cards.
+    Extracts race information from race cards added since the last call.
     Appends results to the global race_data list.
     """
-    wrappers = driver.find_elements(By.CSS_SELECTOR, ".highlighted-card-wrapper")
+    global parsed_count
+    cards = driver.execute_script(_READ_CARDS_JS, parsed_count)
+    parsed_count += len(cards)
 
-    for wrapper in wrappers:
-        try:
-            title = wrapper.find_element(By.TAG_NAME, "h2").text.strip()
-            location = wrapper.find_element(By.CSS_SELECTOR, ".country-flag-formatter .label").text.strip()
-            url = wrapper.find_element(By.CSS_SELECTOR, "a.button--secondary").get_attribute("href")
-
-            # Determine race type based on title content
-            if "5150" in title:
-                race_type = "5150 Triathlon Series"
-            elif "70.3" in title:
-                race_type = "IRONMAN 70.3"
-            elif "4:18:4" in title:
-                race_type = "4:18:4"
-            else:
-                race_type = "IRONMAN"
-
-            # Default values
-            swim_type = bike_type = run_type = ""
-
-            # Extract terrain types from icons
-            icon_fields = wrapper.find_elements(By.CLASS_NAME, "icon-field-item")
-            for field in icon_fields:
-                try:
-                    label = field.find_element(By.CLASS_NAME, "icon-field-label").text.strip().lower()
-                    value = field.find_element(By.CLASS_NAME, "icon-field-value").text.strip()
-
-                    if "swim" in label:
-                        swim_type = value
-                    elif "bike" in label:
-                        bike_type = value
-                    elif "run" in label:
-                        run_type = value
-                except:
-                    # Skip silently if field extraction fails
-                    continue
-
-            # Append result
-            race_data.append({
-                "Race Name": title,
-                "Race Type": race_type,
-                "Location": location,
-                "URL": url,
-                "Swim": swim_type,
-                "Bike": bike_type,
-                "Run": run_type
-            })
-
-        except Exception as e:
-            print(f"⚠️ Error parsing race card: {e}")
+    for card in cards:
+        row = catalog_row(card)
+        if row is None:
+            print(f"⚠️ Error parsing race card: {card['title'] or 'missing title'}")
+            continue
+        if row["URL"] in seen_urls:
+            continue
+        seen_urls.add(row["URL"])
+        race_data.append(row)
 
 
 # -----------------------
@@ -109,20 +114,17 @@ while True:
             EC.presence_of_element_located((By.CSS_SELECTOR, "a.text-link--chevron-down[rel='next']"))
         )
         driver.execute_script("arguments[0].scrollIntoView(true);", load_more_btn)
-        time.sleep(1)
 
         # Click using JavaScript
         driver.execute_script("arguments[0].click();", load_more_btn)
 
         # Wait until new race cards appear
-        max_retries = 10
-        for _ in range(max_retries):
-            time.sleep(2.5)
-            new_count = len(driver.find_elements(By.CLASS_NAME, "highlighted-card-wrapper"))
-            if new_count > current_count:
-                print(f"✅ Loaded more races: {new_count - current_count} new")
-                break
-        else:
+        try:
+            new_count = wait_for_count_increase(
+                driver, ".highlighted-card-wrapper", current_count, 25, "load_more"
+            )
+            print(f"✅ Loaded more races: {new_count - current_count} new")
+        except TimeoutException:
             print("⏳ Waited but no new races loaded.")
             break
 
@@ -139,6 +141,9 @@ while True:
 df = pd.DataFrame(race_data).drop_duplicates()
 df.to_csv("all_ironman_races.csv", index=False, encoding="utf-8-sig")
 print("✅ Races saved to 'all_ironman_races.csv'")
+transferred_bytes(driver)
+print(transfer_report())
+print(wait_report())
 
 # -----------------------
 # Cleanup
@@ -20,24 +20,69 @@ It handles:
 - A CSV file (e.g., `all_ironman_races.csv`) with at least:
     - 'Race' — The name of the race
     - 'URL' — Direct race page URL (without "-results" suffix — script appends this if needed)
-- Chrome WebDriver installed and accessible (tested with Selenium)
+- Chrome WebDriver installed and accessible (tested with Selenium);
+  runs headless with images/fonts/media/analytics blocked by default
+  (LIGHTWEIGHT_PROFILE in browser_profile.py)
+  (not needed with SCRAPE_ENGINE = "http")
 
 📤 What It Produces:
 --------------------
-- For each race, a CSV is saved to: `data/results/races/<race_name>.csv`
-- Each CSV includes per-athlete results like:
+- For each race, a typed, zstd-compressed Parquet file is saved to:
+  `data/results/races/<race_name>.parquet` (see results_schema.py)
+- Each file includes per-athlete results like:
     - Name, Designation (FINISHER, DNF, DNS, DQ)
-    - Swim/Bike/Run/Transition/Finish times
-    - Division, Gender, and Overall ranks (if available)
+    - Swim/Bike/Run/Transition/Finish times (integer seconds)
+    - Division, Gender, and Overall ranks (nullable ints, if available)
+    - Race Date as a date
+- With WRITE_CSV_EXPORT, the old all-text CSV (`<race_name>.csv`) is
+  written next to it
 
 🧠 Features & Logic:
 ---------------------
 - Headless-like navigation through race iframes and dropdowns
-- Retries on failures (selectors, page reloads, pagination)
+- Retry quarantine (retry_quarantine.py): a failing race (or race date)
+  is set aside and retried later with exponential backoff while the run
+  moves on to healthy races; races that keep failing are listed in
+  `failed_races.csv` at the end of the run
+- Event-driven waits instead of fixed sleeps, with time spent per call
+  site reported at the end of the run (waits.py)
 - Optional toggle for:
     - Showing 100 rows per page (SET_ROWS_TO_100)
     - Processing all pages vs. just the first (ENABLE_PAGINATION)
-- Driver restarts after every race date to mitigate memory leaks
+    - Selenium browser engine vs. direct HTTP results feed (SCRAPE_ENGINE,
+      see results_feed.py; fetched concurrently with per-host rate limits
+      by async_fetcher.py)
+    - Batch page extraction vs. legacy per-field lookups (BATCH_DOM_EXTRACTION)
+- Warm browser reused across race dates and races; it is only restarted
+  when its memory or recent error rate crosses a limit (DriverRecycler)
+- Parallel mode (NUM_WORKERS > 1): a pool of browser processes shares one
+  work queue of (race, race date) items (see worker_pool.py)
+- Raw payload archive (response_archive.py): every feed body / grid page
+  is kept on disk; `--replay` rebuilds the archived race dates from it
+  with no browser and no network (other stored race dates are kept)
+- Incremental mode (`--incremental`): only race dates missing from the
+  stored race CSV (or invalidated with `--invalidate`) are scraped, then
+  merged into the existing file
+- `--invalidate "Race|Date"` on its own re-scrapes just those race dates
+  of an already scraped race; its other stored dates are kept as they are
+- Catalog-driven mode (`--changed-only`): only races added or renamed in
+  the latest catalog sync (catalog_sync.py) are scraped
+- Crash-safe journal (scrape_journal.py): every finished race date is
+  committed immediately, and a restarted run skips committed work
+- Priority order (scrape_scheduler.py): recent and upcoming editions,
+  races not refreshed for a while and races that feed a World
+  Championship are scraped first
+- Shared work queue (`--queue`, work_queue.py): (race, race date) items in
+  a SQLite file with leases, heartbeats, retry counts and dead-letter;
+  start as many scraper processes as wanted and they split the catalog.
+  `python scripts/work_queue.py status` shows progress at any time
+  (pass --incremental / --invalidate / --changed-only to one process
+  only: they put already finished races back in the queue)
+- Telemetry (scrape_telemetry.py, ENABLE_TELEMETRY): one JSON line per
+  phase (open race, read dates, select date, grid read, row details,
+  next page, feed fetch) with duration, retries, rows and N/A rows, in
+  `scrape_metrics.jsonl`; `python scripts/scrape_telemetry.py summary`
+  ranks the slowest races and phases
 
 ⚠️ Known Notes:
 ----------------
@@ -50,16 +95,34 @@ It handles:
 """
 
 
+import argparse
+import asyncio
+import json
 import os
 import re
+import socket
 import time
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
+from async_fetcher import AsyncFetcher
+from browser_profile import transfer_report
+from catalog_sync import changed_urls
+from response_archive import ResponseArchive
+from results_browser import (
+    DriverRecycler, open_results_page, read_race_dates, scrape_current_date, scrape_race_date,
+    select_race_date, set_rows_to_100, start_driver,
+)
+from results_feed import async_fetch_race_date_results, async_fetch_race_dates, parse_results_feed
+from results_grid import rows_from_grid_page
+from results_schema import (
+    apply_results_schema, legacy_text, race_date_keys, read_results, write_results_parquet,
+)
+from retry_quarantine import RetryQuarantine, backoff_delay, run_with_quarantine, write_failure_report
+from scrape_journal import ScrapeJournal
+from scrape_scheduler import RaceScheduler, last_saved, load_wc_urls, saved_race_dates
+from scrape_telemetry import configure, count_na_rows, phase, set_context
+from waits import wait_report
+from work_queue import QUEUE_PATH, WorkQueue
+from worker_pool import run_worker_pool
 
 # -----------------------
 # Configurable Settings
@@ -67,262 +130,585 @@ from selenium.webdriver.common.action_chains import ActionChains
 
 SET_ROWS_TO_100 = True      # Try to show 100 rows per page
 ENABLE_PAGINATION = True    # Enable full table pagination
+SCRAPE_ENGINE = "selenium"  # "selenium" (click every row) or "http" (read the results feed)
+BATCH_DOM_EXTRACTION = True # Read each grid page in a few script calls (see results_grid.py)
+NUM_WORKERS = 1             # Browser processes for the selenium engine (1 = serial)
+ARCHIVE_RESPONSES = True    # Keep raw payloads for --replay (see response_archive.py)
+ENABLE_TELEMETRY = True     # Append per-phase metrics to scrape_metrics.jsonl
+WRITE_CSV_EXPORT = False    # Also write each race as the legacy all-text CSV
+
+# HTTP engine (see async_fetcher.py)
+HTTP_CONCURRENCY = 8        # Requests in flight
+HTTP_RATE_PER_HOST = 2.0    # Average requests per second per host
+HTTP_BURST = 4              # Back-to-back requests allowed per host
+HTTP_MAX_RETRIES = 4        # Retries with jittered backoff
+
+# Driver recycling (restart only when the browser is unhealthy)
+MAX_BROWSER_RSS_MB = 1500   # Browser memory limit before a restart
+MAX_ERROR_RATE = 0.5        # Share of recent race dates allowed to fail
+ERROR_WINDOW = 4            # How many recent race dates the error rate covers
+
+# Retry quarantine (see retry_quarantine.py)
+RETRY_MAX_ATTEMPTS = 4      # Attempts per race before it is reported as failing
+FAILED_RACES_REPORT = "failed_races.csv"   # In output_directory, rewritten every run
+
+# Shared work queue (--queue, see work_queue.py)
+QUEUE_POLL_SECONDS = 10     # Wait before asking again while other workers hold the last items
+
+# Output directory for per-race files
+output_directory = "data/urls/all_ironman_races/"
+
 
 # -----------------------
 # Load Race Data
 # -----------------------
 
-race_data = pd.read_csv("data/urls/all_ironman_races.csv")
-race_data['URL'] = race_data['URL'].apply(
-    lambda x: x.strip() + "-results" if isinstance(x, str) and not x.strip().endswith("-results") else x
-)
+def results_url(url):
+    """
+    Makes sure a race URL points at its results page.
+    """
+    if isinstance(url, str) and not url.strip().endswith("-results"):
+        return url.strip() + "-results"
+    return url
 
 
-# Ensure output directory exists
-output_directory = "data/urls/all_ironman_races/"
-os.makedirs(output_directory, exist_ok=True)
+def load_race_data():
+    """
+    Reads the race catalog and makes sure every URL points at the results page.
+    """
+    race_data = pd.read_csv("data/urls/all_ironman_races.csv")
+    race_data['URL'] = race_data['URL'].apply(results_url)
+    return race_data
 
-race_date_counter = 0  # Track how many race dates have been processed
 
 # -----------------------
-# Process Each Race
+# Save Results for a Race
 # -----------------------
 
-for index, row in race_data.iterrows():
-    race_url = row['URL']
-    race_name = row['Race Name']
-    print(f"\n📍 Processing: {race_name} | {race_url}")
-
+def race_csv_path(race_name, extension="csv"):
+    """
+    Returns `<output_directory>/<safe_race_name>.<extension>`.
+    """
     safe_race_name = re.sub(r'\W+', '_', race_name)
-    csv_filename = os.path.join(output_directory, f"{safe_race_name}.csv")
-    race_results = []
+    return os.path.join(output_directory, f"{safe_race_name}.{extension}")
 
-    # Start WebDriver
-    driver = webdriver.Chrome()
-    driver.maximize_window()
-    driver.get(race_url)
 
-    try:
-        # Switch into iframe
-        iframe = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "iframe.coh-iframe"))
-        )
-        driver.get(iframe.get_attribute("src"))
+def race_parquet_path(race_name):
+    return race_csv_path(race_name, "parquet")
 
-        # Open dropdown and collect all race date options
-        dropdown = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='combobox']"))
-        )
-        dropdown.click()
 
-        options = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ul[role='listbox'] li[role='option']"))
-        )
-        race_dates = [option.text for option in options]
-        print(f"🗓️ Found {len(race_dates)} race dates.")
+def stored_race_path(race_name):
+    """
+    The race's saved results: Parquet, or the CSV written before the
+    Parquet output existed.
+    """
+    path = race_parquet_path(race_name)
+    return path if os.path.exists(path) else race_csv_path(race_name)
 
-        ActionChains(driver).send_keys(Keys.ESCAPE).perform()  # Close dropdown
 
-        # -----------------------
-        # Loop Through Race Dates
-        # -----------------------
+def save_race_results(race_name, race_results):
+    """
+    Writes one race's rows as typed Parquet (parsed once, here), plus the
+    legacy all-text CSV when WRITE_CSV_EXPORT is on.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    df_race = apply_results_schema(pd.DataFrame(race_results))
 
-        for i in range(len(race_dates)):
-            # Optional: Restart WebDriver every race date to clear memory
-            if race_date_counter > 0 and race_date_counter % 1 == 0:
-                print("🔄 Restarting driver to clear memory...")
+    parquet_filename = race_parquet_path(race_name)
+    write_results_parquet(df_race, parquet_filename)
+    print(f"✅ Saved: {parquet_filename}")
 
-                for attempt in range(10):
-                    try:
-                        driver.quit()
-                        driver = webdriver.Chrome()
-                        driver.maximize_window()
-                        driver.get(race_url)
+    if WRITE_CSV_EXPORT:
+        csv_filename = race_csv_path(race_name)
+        legacy_text(df_race).to_csv(csv_filename, index=False, encoding="utf-8-sig")
+        print(f"✅ Saved: {csv_filename}")
 
-                        iframe = WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "iframe.coh-iframe"))
-                        )
-                        driver.get(iframe.get_attribute("src"))
-                        time.sleep(5)
-                        break
-                    except Exception as e:
-                        print(f"⚠️ Retry {attempt+1} on driver restart failed: {str(e)[:100]}")
-                        time.sleep(3)
-
-            # Select race date
-            for attempt in range(5):
-                try:
-                    dropdown = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "div[role='combobox']"))
-                    )
-                    dropdown.click()
-                    options = WebDriverWait(driver, 10).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ul[role='listbox'] li[role='option']"))
-                    )
-                    current_option = options[i]
-                    race_date_text = current_option.text
-                    print(f"➡️ Selecting race date: {race_date_text}")
-                    current_option.click()
-                    time.sleep(1)
-                    break
-                except Exception as e:
-                    print(f"Retry {attempt+1} on selecting race date failed: {str(e)[:100]}")
-                    time.sleep(0.5)
 
-            race_date_counter += 1
+# -----------------------
+# Which Race Dates to Scrape
+# -----------------------
+
+class RaceDatePlan:
+    """
+    Decides which race dates of one race need scraping and assembles the
+    race's output from the journal and (in incremental mode, or when some
+    of its dates are invalidated) the stored CSV.
+    """
+
+    def __init__(self, race_name, race_url, journal, incremental=False, invalidated=()):
+        self.race_url = race_url
+        self.journal = journal
+        self.invalidated = set(invalidated)    # dropdown texts, as given
+        self._invalidated_keys = set(race_date_keys(self.invalidated))
+        self.stored_rows = {}  # race date key → rows already in the stored race file
+
+        # Stored dates are compared as dates, so "2024 - June 9" matches a stored 2024-06-09
+        path = stored_race_path(race_name)
+        if (incremental or self.invalidated) and os.path.exists(path):
+            stored = read_results(path)
+            keys = pd.Series(race_date_keys(stored["Race Date"]), index=stored.index, dtype=object)
+            for key, group in stored.groupby(keys, sort=False, dropna=False):
+                self.stored_rows[key] = group.to_dict("records")
+
+    def _is_invalidated(self, race_date, key):
+        return race_date in self.invalidated or key in self._invalidated_keys
+
+    def should_scrape(self, race_date):
+        key = race_date_keys([race_date])[0]
+        if self._is_invalidated(race_date, key):
+            return True
+        if key in self.stored_rows:
+            return False
+        return not self.journal.is_date_done(self.race_url, race_date)
+
+    def race_rows(self, race_dates):
+        """
+        Rows for the whole race, ordered like the dropdown. Fresh journal
+        rows replace stored ones; stored dates no longer listed are kept.
+        """
+        rows = []
+        keys = race_date_keys(race_dates)
+        for race_date, key in zip(race_dates, keys):
+            fresh = key not in self.stored_rows or self._is_invalidated(race_date, key)
+            if fresh and self.journal.is_date_done(self.race_url, race_date):
+                rows.extend(self.journal.committed_rows(self.race_url, [race_date]))
+            else:
+                rows.extend(self.stored_rows.get(key, []))
+        for key, stored in self.stored_rows.items():
+            if key not in keys:
+                rows.extend(stored)
+        return rows
+
+
+# -----------------------
+# Process One Race (serial)
+# -----------------------
+
+async def scrape_race_http(fetcher, race_name, race_url, journal, plan, archive=None):
+    """
+    HTTP engine: read the results feed directly, no browser needed.
+    All race dates of the race are fetched concurrently; finished dates
+    are committed even when others fail. Returns None on success, or the
+    error (the race is then left for the retry quarantine).
+    """
+    # Races run concurrently here, so race / date go on each phase, not the shared context
+    with phase("race", race=race_name) as race_metrics:
+        try:
+            with phase("read_dates", race=race_name) as metrics:
+                subevents = await async_fetch_race_dates(race_url, fetcher)
+                metrics["rows"] = len(subevents)
+            print(f"🗓️ {race_name}: found {len(subevents)} race dates.")
+
+            async def fetch_date(event_id, race_date_text):
+                with phase("feed_fetch", race=race_name, race_date=race_date_text) as metrics:
+                    rows = await async_fetch_race_date_results(
+                        race_name, race_url, event_id, race_date_text, fetcher, archive
+                    )
+                    metrics.update(rows=len(rows), na_rows=count_na_rows(rows))
+                journal.commit_date(race_url, race_date_text, rows)
+
+            wanted = [
+                (event_id, race_date_text)
+                for event_id, race_date_text in subevents
+                if plan.should_scrape(race_date_text)
+            ]
+            outcomes = await asyncio.gather(
+                *[fetch_date(event_id, race_date_text) for event_id, race_date_text in wanted],
+                return_exceptions=True,
+            )
+            failed = [race_date_text for (_, race_date_text), outcome in zip(wanted, outcomes)
+                      if isinstance(outcome, Exception)]
+            if failed:
+                raise RuntimeError(f"{len(failed)} race dates failed: {', '.join(failed)}")
+
+            save_race_results(race_name, plan.race_rows([race_date_text for _, race_date_text in subevents]))
+            journal.commit_race(race_url)
+        except Exception as e:
+            race_metrics["error"] = str(e)[:200]
+            print(f"🚨 Error processing {race_url}: {str(e)[:100]}")
+            return e
+    return None
+
+
+async def scrape_races_http(races, journal, plan_for, quarantine, archive=None):
+    """
+    Runs every race through one AsyncFetcher; concurrency and per-host
+    rate limits are enforced by the fetcher, not by the loop. Failed
+    races are quarantined and retried once their backoff is over.
+    """
+    async with AsyncFetcher(
+        concurrency=HTTP_CONCURRENCY, rate_per_host=HTTP_RATE_PER_HOST,
+        burst=HTTP_BURST, max_retries=HTTP_MAX_RETRIES,
+    ) as fetcher:
+        race_slots = asyncio.Semaphore(HTTP_CONCURRENCY)  # Races open at once
+
+        async def one_race(race_name, race_url):
+            async with race_slots:
+                plan = plan_for(race_name, race_url)
+                error = await scrape_race_http(fetcher, race_name, race_url, journal, plan, archive)
+            if error is not None:
+                quarantine.add(race_url, (race_name, race_url), error)
+
+        await asyncio.gather(*[one_race(race_name, race_url) for race_name, race_url in races])
+        while len(quarantine):
+            wait = quarantine.next_due_in()
+            print(f"⏳ {len(quarantine)} quarantined races left, next retry in {wait:.0f}s")
+            await asyncio.sleep(wait)
+            await asyncio.gather(*[one_race(race_name, race_url) for race_name, race_url in quarantine.pop_all_due()])
+        print(fetcher.report())
+
+
+def scrape_race_selenium(driver, recycler, race_name, race_url, journal, plan, archive=None):
+    """
+    Selenium engine: walk every race date of one race in a warm browser.
+    A failing race date is skipped (finished ones are still committed).
+    Returns (driver, error): the driver may have been replaced by the
+    recycler, and error is None when the whole race was saved.
+    """
+    set_context(race=race_name, race_date=None)
+    error = None
+    with phase("race") as race_metrics:
+        try:
+            driver, _ = recycler.maybe_recycle(driver)
+
+            # Switch into iframe and collect all race date options
+            open_results_page(driver, race_url)
+            race_dates = read_race_dates(driver)
+            print(f"🗓️ Found {len(race_dates)} race dates.")
 
             # -----------------------
-            # Set Table to 100 Rows
+            # Loop Through Race Dates
             # -----------------------
-            if SET_ROWS_TO_100:
-                for attempt in range(5):
+
+            failed_dates = []
+            for i in range(len(race_dates)):
+                if not plan.should_scrape(race_dates[i]):
+                    print(f"⏭️ {race_dates[i]}: already stored")
+                    continue
+
+                # Restart only if memory or error rate say so
+                set_context(race_date=race_dates[i])
+                driver, _ = recycler.maybe_recycle(driver, race_url)
+
+                try:
+                    race_date_text = select_race_date(driver, i)
+
+                    if SET_ROWS_TO_100:
+                        set_rows_to_100(driver)
+
+                    date_results = scrape_current_date(
+                        driver, race_name, race_date_text, BATCH_DOM_EXTRACTION, ENABLE_PAGINATION,
+                        archive, race_url,
+                    )
+                except Exception as e:
+                    recycler.record(False)
+                    failed_dates.append(race_dates[i])
+                    print(f"⚠️ {race_dates[i]}: {str(e)[:100]}")
                     try:
-                        rows_dropdown = WebDriverWait(driver, 10).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, "div.MuiTablePagination-select"))
-                        )
-                        rows_dropdown.click()
-                        option_100 = WebDriverWait(driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, "//li[contains(text(),'100')]"))
-                        )
-                        option_100.click()
-                        print("📊 Set rows per page to 100.")
-                        time.sleep(10)  # Wait for reload
-                        break
-                    except Exception as e:
-                        print(f"Retry {attempt+1} on setting rows: {str(e)[:100]}")
-                        time.sleep(0.5)
+                        open_results_page(driver, race_url)  # Clean dropdown for the next date
+                    except Exception:
+                        pass  # The recycler restarts the browser if this keeps happening
+                    continue
+                recycler.record(True)
+
+                # Commit this race date before moving on
+                journal.commit_date(race_url, race_date_text, date_results)
+
+            if failed_dates:
+                raise RuntimeError(f"{len(failed_dates)} race dates failed: {', '.join(failed_dates)}")
+
+            # Include dates committed by earlier (interrupted) runs and stored dates
+            save_race_results(race_name, plan.race_rows(race_dates))
+            journal.commit_race(race_url)
+
+        except Exception as e:
+            race_metrics["error"] = str(e)[:200]
+            print(f"🚨 Error processing {race_url}: {str(e)[:100]}")
+            error = e
+    return driver, error
+
+
+def scrape_races_selenium(races, journal, plan_for, quarantine, archive=None):
+    """
+    Serial Selenium engine: one warm driver for the whole run. Failed
+    races are quarantined and retried between the remaining races.
+    """
+    recycler = DriverRecycler(MAX_BROWSER_RSS_MB, MAX_ERROR_RATE, ERROR_WINDOW)
+    driver = start_driver()
+
+    def attempt(race):
+        nonlocal driver
+        race_name, race_url = race
+        print(f"\n📍 Processing: {race_name} | {race_url}")
+        driver, error = scrape_race_selenium(
+            driver, recycler, race_name, race_url, journal, plan_for(race_name, race_url), archive
+        )
+        return error
 
-            # -----------------------
-            # Loop Through Table Pages
-            # -----------------------
+    try:
+        run_with_quarantine(races, attempt, quarantine, key=lambda race: race[1])
+    finally:
+        driver.quit()
+    print(recycler.report())
+    print(transfer_report())
+    print(wait_report())
+
+
+# -----------------------
+# Shared Work Queue
+# -----------------------
 
-            pagination_active = True
-            while pagination_active:
-                rows = WebDriverWait(driver, 10).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[role='row'][data-rowindex]"))
-                )
-                print(f"📋 Found {len(rows)} rows on this page.")
-
-                # -----------------------
-                # Process Each Athlete Row
-                # -----------------------
-
-                for row_number in range(len(rows)):
-
-                    def get_text(xpath, retries=3, delay=0.5):
-                        for attempt in range(retries):
-                            try:
-                                return driver.find_element(By.XPATH, xpath).text
-                            except Exception:
-                                time.sleep(delay)
-                        return "N/A"
-
-                    def get_text_by_data_field(row_index, field_name, retries=3, delay=0.5):
-                        xpath_variants = [
-                            f"//div[@data-rowindex='{row_index}']//div[@data-field='{field_name}']/p",
-                            f"//div[@data-rowindex='{row_index}']//div[@data-field='{field_name}']/span/p"
-                        ]
-                        for attempt in range(retries):
-                            for xpath in xpath_variants:
-                                try:
-                                    return driver.find_element(By.XPATH, xpath).text
-                                except:
-                                    continue
-                            time.sleep(delay)
-                        return "N/A"
-
-                    for attempt in range(10):
-                        try:
-                            rows = WebDriverWait(driver, 10).until(
-                                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[role='row'][data-rowindex]"))
-                            )
-                            row = rows[row_number]
-                            row_index = row.get_attribute("data-rowindex")
-                            driver.execute_script("arguments[0].scrollIntoView(true);", row)
-                            row.click()
-
-                            designation = get_text("//h6[contains(text(),'Designation')]/preceding-sibling::h6")
-
-                            # Handle different athlete result scenarios
-                            if designation in {"DNS", "DQ"}:
-                                race_results.append({
-                                    "Race Name": race_name,
-                                    "Race Date": race_date_text,
-                                    "Athlete": get_text_by_data_field(row_index, "athlete"),
-                                    "Designation": designation,
-                                })
-
-                            elif designation == "DNF":
-                                race_results.append({
-                                    "Race Name": race_name,
-                                    "Race Date": race_date_text,
-                                    "Athlete": get_text_by_data_field(row_index, "athlete"),
-                                    "Designation": designation,
-                                    "Swim Time": get_text_by_data_field(row_index, "wtc_swimtimeformatted"),
-                                    "Transition 1": get_text_by_data_field(row_index, "wtc_transition1timeformatted"),
-                                    "Bike Time": get_text_by_data_field(row_index, "wtc_biketimeformatted"),
-                                    "Transition 2": get_text_by_data_field(row_index, "wtc_transitiontime2formatted"),
-                                    "Run Time": get_text_by_data_field(row_index, "wtc_runtimeformatted"),
-                                    "Finish Time": get_text_by_data_field(row_index, "wtc_finishtimeformatted"),
-                                })
-
-                            else:
-                                race_results.append({
-                                    "Race Name": race_name,
-                                    "Race Date": race_date_text,
-                                    "Athlete": get_text_by_data_field(row_index, "athlete"),
-                                    "Div Rank": get_text("//h6[contains(text(),'Div Rank')]/preceding-sibling::h6"),
-                                    "Gender Rank": get_text("//h6[contains(text(),'Gender Rank')]/preceding-sibling::h6"),
-                                    "Overall Rank": get_text("//h6[contains(text(),'Overall Rank')]/preceding-sibling::h6"),
-                                    "Designation": designation,
-                                    "Division": get_text("//h6[contains(text(),'Division')]/preceding-sibling::h6"),
-                                    "Swim Time": get_text_by_data_field(row_index, "wtc_swimtimeformatted"),
-                                    "Transition 1": get_text_by_data_field(row_index, "wtc_transition1timeformatted"),
-                                    "Bike Time": get_text_by_data_field(row_index, "wtc_biketimeformatted"),
-                                    "Transition 2": get_text_by_data_field(row_index, "wtc_transitiontime2formatted"),
-                                    "Run Time": get_text_by_data_field(row_index, "wtc_runtimeformatted"),
-                                    "Finish Time": get_text_by_data_field(row_index, "wtc_finishtimeformatted"),
-                                })
-
-                            row.click()  # Close row
-                            break
-                        except Exception as e:
-                            print(f"Retry {attempt+1} on row {row_number+1}: {str(e)[:100]}")
-                            time.sleep(0.2)
-
-                # -----------------------
-                # Go to Next Page (if enabled)
-                # -----------------------
-                if ENABLE_PAGINATION:
-                    for attempt in range(5):
-                        try:
-                            next_button = WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.XPATH, "//button[@aria-label='Go to next page']"))
-                            )
-                            if "Mui-disabled" in next_button.get_attribute("class"):
-                                pagination_active = False
-                                break
-                            next_button.click()
-                            WebDriverWait(driver, 10).until(EC.staleness_of(rows[0]))
-                            break
-                        except:
-                            time.sleep(0.2)
+def run_queue_worker(queue, plan_for, archive=None, date_priorities=None):
+    """
+    Pulls items from the shared WorkQueue until it is drained, in one warm
+    browser. Race items list their dates (adding date items, scored by
+    `date_priorities(race_name, race_url, race_dates)`); date items are
+    scraped and committed. Whichever worker settles a race saves it.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    recycler = DriverRecycler(MAX_BROWSER_RSS_MB, MAX_ERROR_RATE, ERROR_WINDOW)
+    driver = start_driver()
+    print(f"📬 Worker {worker_id} pulling from {queue.path}")
+    try:
+        while True:
+            item = queue.lease(worker_id)
+            if item is None:
+                if queue.is_drained():
+                    break
+                time.sleep(QUEUE_POLL_SECONDS)
+                continue
+
+            race_name, race_url = item["race_name"], item["race_url"]
+            set_context(race=race_name, race_date=item["race_date"] or None)
+            driver, _ = recycler.maybe_recycle(driver)
+            plan = plan_for(race_name, race_url)
+            try:
+                with queue.keep_alive(item, worker_id):
+                    if item["kind"] == "race":
+                        open_results_page(driver, race_url)
+                        race_dates = read_race_dates(driver)
+                        print(f"🗓️ {race_name}: found {len(race_dates)} race dates.")
+                        queue.add_race_dates(
+                            item, race_dates, [plan.should_scrape(d) for d in race_dates], plan.invalidated,
+                            date_priorities(race_name, race_url, race_dates) if date_priorities else None,
+                        )
+                        if not queue.complete(item, worker_id):
+                            print(f"⌛ {race_name}: lease lost, another worker owns the race item now")
                     else:
-                        pagination_active = False
+                        race_date_text, rows = scrape_race_date(
+                            driver, race_url, race_name, item["date_index"],
+                            SET_ROWS_TO_100, BATCH_DOM_EXTRACTION, ENABLE_PAGINATION, archive,
+                        )
+                        if race_date_text != item["race_date"]:
+                            raise RuntimeError(f"Dropdown shows '{race_date_text}', expected '{item['race_date']}'")
+                        if queue.complete(item, worker_id, rows):
+                            print(f"✅ {race_name} | {race_date_text}: {len(rows)} rows")
+                        else:
+                            print(f"⌛ {race_name} | {race_date_text}: lease lost, rows discarded")
+                recycler.record(True)
+            except Exception as e:
+                recycler.record(False)
+                state = queue.fail(item, worker_id, e, retry_delay=backoff_delay(item["attempts"]))
+                print(f"⚠️ {race_name} {item['race_date']} (attempt {item['attempts']}, now {state}): {str(e)[:100]}")
+
+            # One snapshot: once another worker commits the race its rows leave the queue
+            with queue.snapshot():
+                status = queue.race_status(race_url)
+                finished = status["settled"] and not queue.is_race_done(race_url)
+                # Never overwrite the stored race with nothing (race item dead, no dates listed)
+                rows = plan.race_rows(queue.race_dates(race_url)) if finished and not status["race_dead"] else []
+            if finished:
+                if rows:
+                    save_race_results(race_name, rows)
+                if status["dead"]:
+                    print(f"⚠️ {race_name}: {status['dead']} items dead-lettered")
                 else:
-                    pagination_active = False
+                    queue.commit_race(race_url)
+    finally:
+        driver.quit()
+    print(recycler.report())
+    print(transfer_report())
+    print(wait_report())
 
-        # -----------------------
-        # Save Results for This Race
-        # -----------------------
 
-        df_race = pd.DataFrame(race_results)
-        df_race.to_csv(csv_filename, index=False, encoding="utf-8-sig")
-        print(f"✅ Saved: {csv_filename}")
+# -----------------------
+# Replay From Archive
+# -----------------------
 
-    except Exception as e:
-        print(f"🚨 Error processing {race_url}: {str(e)[:100]}")
-    finally:
-        driver.quit()
+def replay_race(race_name, entries, archive):
+    """
+    Rebuilds one race's rows from its archived payloads (index `entries`),
+    without browser or network, and merges them into the stored results:
+    replayed race dates replace their stored rows, stored race dates that
+    are not in the archive (scraped before archiving, or without batch
+    extraction) are kept. Returns the number of rows replayed.
+    """
+    replayed = {}  # race date → rows
+    for entry in entries:
+        payload = archive.get(entry["sha256"])
+        rows = replayed.setdefault(entry["race_date"], [])
+        if entry["kind"] == "feed":
+            rows.extend(parse_results_feed(payload, race_name, entry["race_date"]))
+        elif entry["kind"] == "grid_page":
+            page = json.loads(payload)
+            rows.extend(rows_from_grid_page(page["grid_rows"], page["details"], race_name, entry["race_date"]))
+    race_results = [row for rows in replayed.values() for row in rows]
+    if not race_results:
+        return 0
+
+    df_race = apply_results_schema(pd.DataFrame(race_results))
+    path = stored_race_path(race_name)
+    if os.path.exists(path):
+        stored = read_results(path)
+        replayed_dates = set(race_date_keys(replayed))
+        kept = [key not in replayed_dates for key in race_date_keys(stored["Race Date"])]
+        df_race = pd.concat([stored[kept], df_race], ignore_index=True)
+    save_race_results(race_name, df_race)
+    return len(race_results)
 
-print("\n🎉 All races processed!")
+
+# -----------------------
+# Process Each Race
+# -----------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape IRONMAN race results.")
+    parser.add_argument(
+        "--replay", action="store_true",
+        help="Re-parse archived payloads into the stored race results (no browser, no network)",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only scrape race dates missing from the stored race CSVs and merge them in",
+    )
+    parser.add_argument(
+        "--invalidate", action="append", default=[], metavar="RACE NAME|RACE DATE",
+        help='Re-scrape one stored race date, e.g. "IRONMAN Texas|2024 - April 20" (repeatable)',
+    )
+    parser.add_argument(
+        "--changed-only", action="store_true",
+        help="Only scrape races added or renamed in the latest catalog sync",
+    )
+    parser.add_argument(
+        "--queue", nargs="?", const=QUEUE_PATH, metavar="PATH",
+        help="Share work with other scraper processes through a SQLite work queue",
+    )
+    args = parser.parse_args()
+
+    invalidated = {}
+    for item in args.invalidate:
+        name, _, race_date = item.partition("|")
+        invalidated.setdefault(name.strip(), set()).add(race_date.strip())
+
+    race_data = load_race_data()
+    archive = ResponseArchive() if ARCHIVE_RESPONSES or args.replay else None
+
+    if args.replay:
+        entries_by_race = {}
+        for entry in archive.entries():
+            entries_by_race.setdefault(entry["race_url"], []).append(entry)
+        for index, row in race_data.iterrows():
+            rows_written = replay_race(row['Race Name'], entries_by_race.get(row['URL'], []), archive)
+            if rows_written:
+                print(f"♻️ Replayed {row['Race Name']}: {rows_written} rows")
+        print("\n🎉 Replay finished!")
+        raise SystemExit(0)
+
+    # Journal of committed race dates (lets a restarted run skip finished work);
+    # in queue mode the queue keeps them, shared by every worker
+    journal = WorkQueue(args.queue) if args.queue else ScrapeJournal()
+
+    telemetry = None
+    if ENABLE_TELEMETRY:
+        metrics_path = os.path.join(output_directory, "scrape_metrics.jsonl")
+        telemetry = {"path": metrics_path, "run_id": configure(metrics_path)}
+        print(f"📈 Telemetry: {metrics_path} (run {telemetry['run_id']})")
+
+    def plan_for(race_name, race_url):
+        return RaceDatePlan(
+            race_name, race_url, journal, args.incremental, invalidated.get(race_name, ())
+        )
+
+    if args.changed_only:
+        changed = {results_url(url) for url in changed_urls()}
+        race_data = race_data[race_data['URL'].isin(changed)]
+        print(f"🔄 {len(race_data)} races changed in the latest catalog sync")
+
+    races = []
+    for index, row in race_data.iterrows():
+        rescrape = args.incremental or args.changed_only or row['Race Name'] in invalidated
+        if not rescrape and journal.is_race_done(row['URL']):
+            print(f"⏭️ Already scraped (journal): {row['Race Name']}")
+            continue
+        races.append((row['Race Name'], row['URL']))
+
+    # Most time-sensitive work first (see scrape_scheduler.py)
+    scheduler = RaceScheduler({results_url(url) for url in load_wc_urls()})
+    race_types = dict(zip(race_data['URL'], race_data['Race Type']))
+
+    def race_priority(race_name, race_url):
+        path = stored_race_path(race_name)
+        return scheduler.race_priority(
+            race_types.get(race_url), race_url, saved_race_dates(path), last_saved(path)
+        )
+
+    def date_priorities(race_name, race_url, race_dates):
+        last_success = last_saved(stored_race_path(race_name))
+        return [
+            scheduler.date_priority(race_types.get(race_url), race_url, race_date, last_success)
+            for race_date in race_dates
+        ]
+
+    priorities = {race_url: race_priority(race_name, race_url) for race_name, race_url in races}
+    races.sort(key=lambda race: -priorities[race[1]])
+    for race_name, race_url in races[:5]:
+        print(f"🔝 {priorities[race_url]:.2f}  {race_name}")
+
+    report_path = os.path.join(output_directory, FAILED_RACES_REPORT)
+    quarantine = RetryQuarantine(RETRY_MAX_ATTEMPTS)
+
+    def describe(item):
+        if isinstance(item, tuple):
+            race_name, race_url = item
+            return {"Race Name": race_name, "URL": race_url, "Race Date": ""}
+        return {"Race Name": item["race_name"], "URL": item["race_url"], "Race Date": item.get("race_date", "")}
+
+    if args.queue:
+        for race_name, race_url in races:
+            rescrape = args.incremental or args.changed_only or race_name in invalidated
+            journal.enqueue_race(race_name, race_url, priorities[race_url], reset=rescrape)
+        run_queue_worker(journal, plan_for, archive, date_priorities)
+        print(journal.status_report())
+        write_failure_report([
+            {**describe(item), "Attempts": item["attempts"], "Last Error": item["last_error"]}
+            for item in journal.dead_items()
+        ], report_path)
+    elif SCRAPE_ENGINE == "selenium" and NUM_WORKERS > 1:
+        failed = run_worker_pool(
+            races, journal, save_race_results, plan_for, num_workers=NUM_WORKERS,
+            options={
+                "rows_to_100": SET_ROWS_TO_100,
+                "batch": BATCH_DOM_EXTRACTION,
+                "paginate": ENABLE_PAGINATION,
+                "archive": archive,
+            },
+            recycler_settings={
+                "max_rss_mb": MAX_BROWSER_RSS_MB,
+                "max_error_rate": MAX_ERROR_RATE,
+                "error_window": ERROR_WINDOW,
+            },
+            telemetry=telemetry,
+            quarantine=quarantine,
+        )
+        for race_url in failed:
+            print(f"🚨 Incomplete: {race_url}")
+    elif SCRAPE_ENGINE == "http":
+        asyncio.run(scrape_races_http(races, journal, plan_for, quarantine, archive))
+    else:
+        scrape_races_selenium(races, journal, plan_for, quarantine, archive)
+
+    if not args.queue:
+        print(quarantine.report())
+        quarantine.write_failure_report(report_path, describe)
+
+    print("\n🎉 All races processed!")
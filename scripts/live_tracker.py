@@ -0,0 +1,409 @@
+"""
+live_tracker.py
+
+────────────────────────────────────────────────────────────────────────────
+📡 Race-day Live Tracking (incremental polling of in-progress results)
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Polls the results feed of one race edition every POLL_INTERVAL_SECONDS
+while the race is running, and keeps only what changed:
+
+1. Conditional GET (ETag / Last-Modified): an unchanged feed costs a
+   304 and no parsing at all; identical bodies are also skipped by hash
+2. Every feed record is compared with the previous poll's record of the
+   same athlete key (bib / athlete id when the feed has one, else
+   Athlete + Division + feed row id); only new, changed or removed
+   athletes are hashed and converted to result rows. A poll without any
+   athlete records (glitchy, empty or truncated feed) counts as failed
+   and leaves the state alone
+3. The deltas are appended to an append-only JSONL store
+4. The changed rows are written as a small typed Parquet part; every
+   COMPACT_EVERY_PARTS parts are folded into one compacted state file
+
+📁 Layout:
+----------
+data/results/live/<race>_<race date>/
+├── deltas.jsonl          # {"polled_at", "key", "change", "row"} per change
+├── latest-<n>.parquet    # compacted state, parts 1…n folded in
+└── part-<n>.parquet      # changed rows of one poll (results_schema.py types)
+
+A restarted tracker replays `deltas.jsonl` (hashes only, so its first
+poll hashes each record once) and compacts, so it carries on without
+rewriting every athlete. The Live Tracking dashboard page reads the state
+with `load_live_state(race_name, race_date)`, which folds the parts newer
+than the compacted file into it.
+
+Usage:
+    python scripts/live_tracker.py --race-url URL --race-name NAME
+        [--race-date "2025 - June 15"] [--interval 30] [--polls N]
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from results_feed import (
+    DETAIL_FIELDS, GRID_FIELDS, REQUEST_TIMEOUT, RESULTS_FEED_URL, USER_AGENT, UrllibTransport,
+    feed_record_to_row, feed_records, fetch_race_dates,
+)
+from results_schema import read_results, write_results_parquet
+
+# -----------------------
+# Configurable Settings
+# -----------------------
+
+POLL_INTERVAL_SECONDS = 30
+LIVE_DIR = "data/results/live"
+COMPACT_EVERY_PARTS = 20
+
+# Feed fields that identify an athlete, first one present wins
+ATHLETE_KEY_FIELDS = ["wtc_bibnumber", "bib", "wtc_athleteid", "athleteid", "contactid"]
+
+# Feed row ids, added to the Athlete + Division fallback key
+ROW_ID_FIELDS = ["wtc_resultid", "resultid", "id"]
+
+# Extra columns of the state files
+KEY_COLUMN = "Live Key"
+CHANGE_COLUMN = "Live Change"
+
+
+def live_directory(race_name, race_date_text, root=LIVE_DIR):
+    safe = re.sub(r'\W+', '_', f"{race_name} {race_date_text}").strip("_")
+    return os.path.join(root, safe)
+
+
+def athlete_key(record):
+    """
+    Stable key for one athlete across polls, read from the raw feed record.
+    Without a bib or athlete id, the name and division are combined with
+    the feed row id (athletes can share a name within a division).
+    """
+    for field in ATHLETE_KEY_FIELDS:
+        if record.get(field) not in (None, ""):
+            return f"{field}:{record[field]}"
+    key = f"{record.get(GRID_FIELDS['Athlete'])}|{record.get(DETAIL_FIELDS['Division'], '')}"
+    for field in ROW_ID_FIELDS:
+        if record.get(field) not in (None, ""):
+            return f"{key}|{field}:{record[field]}"
+    return key
+
+
+def _record_hash(record):
+    return hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# -----------------------
+# Conditional Fetch
+# -----------------------
+
+class ConditionalFeed:
+    """
+    GETs one URL with If-None-Match / If-Modified-Since. `get()` returns
+    None when the server (or the body hash) says nothing changed.
+    """
+
+    def __init__(self, url, timeout=REQUEST_TIMEOUT, user_agent=USER_AGENT):
+        self.url = url
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+        self.bytes_received = 0
+
+    def get(self):
+        headers = {"User-Agent": self.user_agent}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        request = urllib.request.Request(self.url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                self.etag = response.headers.get("ETag") or self.etag
+                self.last_modified = response.headers.get("Last-Modified") or self.last_modified
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+        self.bytes_received += len(body)
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        if body_hash == self.body_hash:
+            return None
+        self.body_hash = body_hash
+        return body
+
+    def reset(self):
+        """
+        Forgets the validators, e.g. after a body that could not be used.
+        """
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+
+
+# -----------------------
+# Delta Store
+# -----------------------
+
+class LiveStore:
+    """
+    Append-only delta log plus the latest state of one race edition.
+    """
+
+    def __init__(self, directory, compact_every=COMPACT_EVERY_PARTS):
+        self.directory = directory
+        self.deltas_path = os.path.join(directory, "deltas.jsonl")
+        self.compact_every = compact_every
+        self.rows = {}     # key → latest row
+        self.hashes = {}   # key → record hash
+        self.records = {}  # key → feed record of the last poll (not kept across restarts)
+        os.makedirs(directory, exist_ok=True)
+        self._replay()
+        self.base, self.parts = _state_files(directory)
+        self.part_count = max([self.base, *self.parts])
+        if self.rows or self.base or self.parts:
+            self._compact()  # Also repairs a part lost to a crash between deltas and part
+
+    def _replay(self):
+        if not os.path.exists(self.deltas_path):
+            return
+        with open(self.deltas_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    delta = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line
+                if delta["change"] == "removed":
+                    self.rows.pop(delta["key"], None)
+                    self.hashes.pop(delta["key"], None)
+                else:
+                    self.rows[delta["key"]] = delta["row"]
+                    self.hashes[delta["key"]] = delta["hash"]
+
+    def apply(self, records, race_name, race_date_text):
+        """
+        Diffs one poll's feed records against the current state, appends
+        the deltas and returns {"new", "changed", "removed"} counts.
+        Raises ValueError for a poll without records, so a glitchy feed
+        never removes every athlete.
+        """
+        if not records:
+            raise ValueError("Feed returned no athlete records")
+        polled_at = datetime.now(timezone.utc).isoformat()
+        counts = {"new": 0, "changed": 0, "removed": 0}
+        deltas = []
+        polled = {}        # key → this poll's record
+        occurrences = {}
+
+        for record in records:
+            key = athlete_key(record)  # The result row is only built on change
+            repeats = occurrences.get(key, 0)
+            occurrences[key] = repeats + 1
+            if repeats:
+                key = f"{key}#{repeats}"  # Same name and division, no id: tell apart by feed order
+            polled[key] = record
+            previous = self.records.get(key)
+            if previous == record:
+                continue
+            record_hash = _record_hash(record)
+            if previous is None and self.hashes.get(key) == record_hash:
+                continue  # First poll after a restart: only the hashes were replayed
+            change = "changed" if key in self.hashes else "new"
+            row = feed_record_to_row(record, race_name, race_date_text)
+            deltas.append({"polled_at": polled_at, "key": key, "change": change, "hash": record_hash, "row": row})
+            counts[change] += 1
+
+        for key in [key for key in self.hashes if key not in polled]:
+            deltas.append({"polled_at": polled_at, "key": key, "change": "removed", "hash": None, "row": None})
+            counts["removed"] += 1
+
+        if deltas:
+            with open(self.deltas_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(delta, ensure_ascii=False) + "\n" for delta in deltas))
+                f.flush()
+                os.fsync(f.fileno())
+            for delta in deltas:
+                if delta["change"] == "removed":
+                    self.rows.pop(delta["key"], None)
+                    self.hashes.pop(delta["key"], None)
+                else:
+                    self.rows[delta["key"]] = delta["row"]
+                    self.hashes[delta["key"]] = delta["hash"]
+        self.records = polled
+
+        if deltas:
+            self._write_part(deltas)
+            if len(self.parts) >= self.compact_every:
+                self._compact()
+        return counts
+
+    def _write(self, name, rows):
+        """
+        Writes a state file atomically, so readers never see half of it.
+        """
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=[KEY_COLUMN, CHANGE_COLUMN])
+        write_results_parquet(df, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _write_part(self, deltas):
+        self.part_count += 1
+        self._write(f"part-{self.part_count}.parquet", [
+            {**(delta["row"] or {}), KEY_COLUMN: delta["key"], CHANGE_COLUMN: delta["change"]}
+            for delta in deltas
+        ])
+        self.parts.append(self.part_count)
+
+    def _compact(self):
+        """
+        Folds the current state into latest-<n>.parquet, then deletes the
+        older state files (readers that lose a file just read again).
+        """
+        self.part_count += 1
+        self._write(f"latest-{self.part_count}.parquet", [
+            {**row, KEY_COLUMN: key, CHANGE_COLUMN: "latest"} for key, row in self.rows.items()
+        ])
+        stale = [f"part-{n}.parquet" for n in self.parts]
+        if self.base:
+            stale.append(f"latest-{self.base}.parquet")
+        for name in stale:
+            os.remove(os.path.join(self.directory, name))
+        self.base, self.parts = self.part_count, []
+
+
+def _state_files(directory):
+    """
+    Returns (n of the newest latest-<n>.parquet or 0, sorted part numbers
+    newer than it).
+    """
+    numbers = {"latest": [0], "part": []}
+    for name in os.listdir(directory):
+        match = re.fullmatch(r"(latest|part)-(\d+)\.parquet", name)
+        if match:
+            numbers[match.group(1)].append(int(match.group(2)))
+    base = max(numbers["latest"])
+    return base, sorted(n for n in numbers["part"] if n > base)
+
+
+def _read_state(directory):
+    base, parts = _state_files(directory)
+    names = ([f"latest-{base}.parquet"] if base else []) + [f"part-{n}.parquet" for n in parts]
+    if not names:
+        return pd.DataFrame()
+    state = pd.concat([read_results(os.path.join(directory, name)) for name in names], ignore_index=True)
+    state = state.drop_duplicates(KEY_COLUMN, keep="last")
+    state = state[state[CHANGE_COLUMN] != "removed"]
+    return state.drop(columns=[KEY_COLUMN, CHANGE_COLUMN]).reset_index(drop=True)
+
+
+def load_live_state(race_name, race_date_text, root=LIVE_DIR, attempts=3):
+    """
+    Latest tracked state of one race edition (typed), for the dashboards.
+    """
+    directory = live_directory(race_name, race_date_text, root)
+    if not os.path.isdir(directory):
+        return pd.DataFrame()
+    for attempt in range(attempts):
+        try:
+            return _read_state(directory)
+        except FileNotFoundError:
+            if attempt == attempts - 1:
+                raise
+            # The tracker compacted while we were reading; read the new files
+
+
+def tracked_races(root=LIVE_DIR):
+    """
+    (race name, race date) of every tracked race edition under `root`.
+    """
+    races = []
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        path = os.path.join(root, name, "deltas.jsonl")
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            first = f.readline()
+        try:
+            row = json.loads(first)["row"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+        if row:
+            races.append((row["Race Name"], row["Race Date"]))
+    return races
+
+
+# -----------------------
+# Polling Loop
+# -----------------------
+
+def track_race(race_name, race_url, race_date_text=None, interval=POLL_INTERVAL_SECONDS, polls=None):
+    """
+    Polls one race edition until interrupted (or for `polls` polls).
+    Defaults to the newest race date of the race.
+    """
+    subevents = fetch_race_dates(race_url, UrllibTransport())
+    if not subevents:
+        raise ValueError(f"No race dates found on {race_url}")
+    if race_date_text is None:
+        event_id, race_date_text = subevents[0]
+    else:
+        matches = [event_id for event_id, text in subevents if text == race_date_text]
+        if not matches:
+            raise ValueError(f"Race date '{race_date_text}' not listed for {race_name}")
+        event_id = matches[0]
+
+    feed = ConditionalFeed(RESULTS_FEED_URL.format(event_id=event_id))
+    store = LiveStore(live_directory(race_name, race_date_text))
+    print(f"📡 Tracking {race_name} | {race_date_text} every {interval}s → {store.directory}")
+
+    count = 0
+    while polls is None or count < polls:
+        started = time.monotonic()
+        try:
+            body = feed.get()
+            if body is None:
+                print("   · no change")
+            else:
+                counts = store.apply(feed_records(body), race_name, race_date_text)
+                print(
+                    f"   ✅ {len(store.rows)} athletes | new {counts['new']} | "
+                    f"changed {counts['changed']} | removed {counts['removed']}"
+                )
+        except Exception as e:
+            feed.reset()  # Fetch the full feed next time, even if it is unchanged
+            print(f"   ⚠️ Poll failed: {str(e)[:100]}")
+        count += 1
+        if polls is None or count < polls:
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    print(f"📦 Received {feed.bytes_received / 1_000_000:.1f} MB in {count} polls")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live-track one IRONMAN race edition.")
+    parser.add_argument("--race-url", required=True, help="Race results page URL")
+    parser.add_argument("--race-name", required=True, help="Race name used in the output")
+    parser.add_argument("--race-date", help='Race date as in the dropdown, e.g. "2025 - June 15" (default: newest)')
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL_SECONDS, help="Seconds between polls")
+    parser.add_argument("--polls", type=int, help="Stop after N polls (default: run until interrupted)")
+    args = parser.parse_args()
+
+    try:
+        track_race(args.race_name, args.race_url, args.race_date, args.interval, args.polls)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped.")
@@ -0,0 +1,354 @@
+"""
+race_catalog_crawler.py
+
+────────────────────────────────────────────────────────────────────────────
+🗺️ Browser-free IRONMAN Race Catalog Crawler
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+The "Load More" button on https://www.ironman.com/races is a plain link
+(`a.text-link--chevron-down[rel='next']`) to the next listing page, so
+the catalog can be read over HTTP with no browser at all:
+
+1. Fetch the first listing page and parse its race cards and next link
+2. If the pager reveals the last page, fetch every page at once;
+   otherwise fetch the following pages in concurrent windows until a
+   page comes back without cards
+3. Write the same `all_ironman_races.csv` the Selenium scraper
+   (ironman_race_urls_scraper.py) produces
+
+Requests go through AsyncFetcher (async_fetcher.py): bounded concurrency,
+per-host rate limit, jittered retries.
+
+📤 What It Produces:
+--------------------
+`data/urls/all_ironman_races.csv` with the columns:
+    Race Name, Race Type, Location, URL, Swim, Bike, Run
+    (+ Latitude, Longitude)
+
+Usage:
+    python scripts/race_catalog_crawler.py [--output PATH] [--sync]
+
+Each Location is geocoded once (cached on disk) into Latitude / Longitude
+columns, see geocode_catalog.py; `--no-geocode` skips it.
+
+With `--sync` the fresh catalog is diffed against the stored one first and
+the changes are appended to `catalog_changes.csv` (see catalog_sync.py).
+
+⚠️ Known Notes:
+----------------
+- Cards are parsed with the standard library HTMLParser (no extra
+  dependency); the selectors match the ones the Selenium scraper uses.
+- Races listed on more than one page are kept once (first seen wins).
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import argparse
+import asyncio
+import os
+from html.parser import HTMLParser
+from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
+
+import pandas as pd
+
+from async_fetcher import AsyncFetcher
+from catalog_sync import sync_catalog
+from geocode_catalog import NominatimGeocoder, geocode_catalog
+
+# -----------------------
+# Configurable Settings
+# -----------------------
+
+RACES_URL = "https://www.ironman.com/races"
+OUTPUT_CSV = "data/urls/all_ironman_races.csv"
+PAGE_PARAM = "page"         # Query parameter the listing pages by
+PAGE_WINDOW = 8             # Pages fetched at once while the last page is unknown
+MAX_PAGES = 500             # Safety stop
+
+HTTP_CONCURRENCY = 8
+HTTP_RATE_PER_HOST = 4.0
+HTTP_BURST = 8
+
+GEOCODE_LOCATIONS = True    # Add Latitude / Longitude (cached, see geocode_catalog.py)
+
+CATALOG_COLUMNS = ["Race Name", "Race Type", "Location", "URL", "Swim", "Bike", "Run"]
+
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+
+# -----------------------
+# Catalog Rows
+# -----------------------
+
+def race_type_from_title(title):
+    """
+    Determines the race type based on title content.
+    """
+    if "5150" in title:
+        return "5150 Triathlon Series"
+    elif "70.3" in title:
+        return "IRONMAN 70.3"
+    elif "4:18:4" in title:
+        return "4:18:4"
+    return "IRONMAN"
+
+
+def catalog_row(card):
+    """
+    Turns a parsed race card ({title, location, url, icons}) into one
+    catalog row. Returns None when the card lacks a title, location or URL.
+    """
+    if not card.get("title") or not card.get("location") or not card.get("url"):
+        return None
+
+    # Terrain types from the icon fields
+    terrain = {"Swim": "", "Bike": "", "Run": ""}
+    for field in card.get("icons", []):
+        label = field["label"].lower()
+        for column in terrain:
+            if column.lower() in label:
+                terrain[column] = field["value"]
+                break
+
+    return {
+        "Race Name": card["title"],
+        "Race Type": race_type_from_title(card["title"]),
+        "Location": card["location"],
+        "URL": card["url"],
+        **terrain,
+    }
+
+
+# -----------------------
+# HTML Parsing
+# -----------------------
+
+class _CatalogPageParser(HTMLParser):
+    """
+    Collects the race cards (`.highlighted-card-wrapper`), the next-page
+    link and every page number linked from one listing page.
+    """
+
+    def __init__(self, page_url):
+        super().__init__()
+        self.page_url = page_url
+        self.stack = []        # [(tag, classes)] of open elements
+        self.cards = []
+        self.card = None
+        self.card_depth = None
+        self.field = None      # Card field the current text belongs to
+        self.field_depth = None
+        self.icon = None
+        self.icon_depth = None
+        self.next_url = None
+        self.page_numbers = set()
+
+    def _inside(self, css_class):
+        return any(css_class in classes for _, classes in self.stack)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get("class") or "").split())
+
+        if tag == "a" and attrs.get("href"):
+            href = urljoin(self.page_url, attrs["href"])
+            rel = (attrs.get("rel") or "").lower().split()  # e.g. rel="next nofollow"
+            if "text-link--chevron-down" in classes and "next" in rel:
+                self.next_url = href
+            page = page_number(href)
+            if page is not None and urlsplit(href).path == urlsplit(self.page_url).path:
+                self.page_numbers.add(page)
+
+        if tag in _VOID_TAGS:
+            return
+        self.stack.append((tag, classes))
+        depth = len(self.stack)
+
+        if "highlighted-card-wrapper" in classes and self.card is None:
+            self.card = {"title": "", "location": "", "url": None, "icons": []}
+            self.card_depth = depth
+        if self.card is None:
+            return
+
+        field = None
+        if tag == "h2":
+            field = "title"
+        elif "label" in classes and self._inside("country-flag-formatter"):
+            field = "location"
+        elif "icon-field-item" in classes:
+            self.icon = {"label": "", "value": ""}
+            self.icon_depth = depth
+            self.card["icons"].append(self.icon)
+        elif "icon-field-label" in classes and self.icon is not None:
+            field = "icon_label"
+        elif "icon-field-value" in classes and self.icon is not None:
+            field = "icon_value"
+        if field and self.field is None:
+            self.field, self.field_depth = field, depth
+        if tag == "a" and "button--secondary" in classes and self.card["url"] is None and attrs.get("href"):
+            self.card["url"] = urljoin(self.page_url, attrs["href"])
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS or not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, _ = self.stack.pop()
+            depth = len(self.stack)
+            if self.field is not None and depth < self.field_depth:
+                self.field = None
+            if self.icon is not None and depth < self.icon_depth:
+                self.icon = None
+            if self.card is not None and depth < self.card_depth:
+                self._close_card()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.card is None or self.field is None:
+            return
+        if self.field == "icon_label":
+            self.icon["label"] += data
+        elif self.field == "icon_value":
+            self.icon["value"] += data
+        else:
+            self.card[self.field] += data
+
+    def _close_card(self):
+        card = self.card
+        card["title"] = " ".join(card["title"].split())
+        card["location"] = " ".join(card["location"].split())
+        for icon in card["icons"]:
+            icon["label"] = " ".join(icon["label"].split())
+            icon["value"] = " ".join(icon["value"].split())
+        self.cards.append(card)
+        self.card = self.card_depth = None
+
+
+def page_number(url):
+    """
+    Returns the PAGE_PARAM value of a listing URL, or None.
+    """
+    values = parse_qs(urlsplit(url).query).get(PAGE_PARAM)
+    if values and values[0].isdigit():
+        return int(values[0])
+    return None
+
+
+def page_url(template_url, page):
+    """
+    Returns `template_url` with its PAGE_PARAM set to `page`.
+    """
+    parts = urlsplit(template_url)
+    query = parse_qs(parts.query)
+    query[PAGE_PARAM] = [str(page)]
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+
+def parse_catalog_page(html, url):
+    """
+    Parses one listing page. Returns (cards, next_url, last_page), where
+    last_page is the highest page number linked from the page (or None).
+    """
+    parser = _CatalogPageParser(url)
+    parser.feed(html)
+    parser.close()
+    last_page = max(parser.page_numbers) if parser.page_numbers else None
+    return parser.cards, parser.next_url, last_page
+
+
+# -----------------------
+# Crawl
+# -----------------------
+
+async def crawl_catalog(fetcher, start_url=RACES_URL):
+    """
+    Fetches every listing page and returns the catalog rows, in page order
+    and without duplicate URLs.
+    """
+    async def fetch(url):
+        body = await fetcher.get(url)
+        return parse_catalog_page(body.decode("utf-8", errors="replace"), url)
+
+    cards, next_url, last_page = await fetch(start_url)
+    pages = [cards]
+    print(f"📄 Page 1: {len(cards)} races")
+
+    first_page = page_number(next_url) if next_url else None
+    if first_page is not None:
+        if last_page is not None and last_page > first_page:
+            # Page count is known: fetch everything at once
+            urls = [page_url(next_url, page) for page in range(first_page, min(last_page, MAX_PAGES) + 1)]
+            for cards, _, _ in await asyncio.gather(*[fetch(url) for url in urls]):
+                pages.append(cards)
+        else:
+            # Unknown page count: fetch windows of pages until one comes back empty
+            page = first_page
+            done = False
+            while not done and page < MAX_PAGES:
+                window = range(page, min(page + PAGE_WINDOW, MAX_PAGES))
+                results = await asyncio.gather(*[fetch(page_url(next_url, p)) for p in window])
+                for cards, window_next, _ in results:
+                    if not cards:
+                        done = True
+                        break
+                    pages.append(cards)
+                    if window_next is None:
+                        done = True
+                        break
+                page += PAGE_WINDOW
+        print(f"📄 Fetched {len(pages)} listing pages")
+
+    rows = []
+    seen_urls = set()
+    for cards in pages:
+        for card in cards:
+            row = catalog_row(card)
+            if row is None:
+                print(f"⚠️ Error parsing race card: {card.get('title') or 'missing title'}")
+                continue
+            if row["URL"] in seen_urls:
+                continue
+            seen_urls.add(row["URL"])
+            rows.append(row)
+    return rows
+
+
+async def crawl_to_csv(output=OUTPUT_CSV, start_url=RACES_URL, sync=False, geocode=GEOCODE_LOCATIONS):
+    """
+    Crawls the catalog and writes it to `output` (through the delta sync
+    when `sync` is set). Returns the row count.
+    """
+    async with AsyncFetcher(
+        concurrency=HTTP_CONCURRENCY, rate_per_host=HTTP_RATE_PER_HOST, burst=HTTP_BURST,
+    ) as fetcher:
+        rows = await crawl_catalog(fetcher, start_url)
+        print(fetcher.report())
+
+    catalog = pd.DataFrame(rows, columns=CATALOG_COLUMNS)
+    if geocode:
+        catalog = geocode_catalog(catalog, NominatimGeocoder())
+    if sync:
+        sync_catalog(catalog, output)
+    else:
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        catalog.to_csv(output, index=False, encoding="utf-8-sig")
+    print(f"✅ {len(rows)} races saved to '{output}'")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl the IRONMAN race catalog over HTTP.")
+    parser.add_argument("--output", default=OUTPUT_CSV, help="Catalog CSV to write")
+    parser.add_argument("--start-url", default=RACES_URL, help="First listing page")
+    parser.add_argument("--sync", action="store_true", help="Diff against the stored catalog and log changes")
+    parser.add_argument("--no-geocode", action="store_true", help="Skip Latitude / Longitude")
+    args = parser.parse_args()
+
+    asyncio.run(crawl_to_csv(args.output, args.start_url, args.sync, GEOCODE_LOCATIONS and not args.no_geocode))
@@ -0,0 +1,135 @@
+"""
+response_archive.py
+
+────────────────────────────────────────────────────────────────────────────
+🗄️ Raw Response Archive for the Results Scraper
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Keeps the raw payload behind every scraped (race URL, race date, page) on
+local disk, so extraction logic can be changed and re-run without
+scraping ironman.com again (`ironman_results_scraper.py --replay`).
+
+What gets archived:
+- "feed"      → the JSON results feed body (HTTP engine)
+- "grid_page" → the grid cells + detail panels read from one grid page
+                (Selenium engine, batch mode)
+
+📁 Layout:
+----------
+data/archive/
+├── blobs/ab/ab12…ef.gz   # gzip payloads, named by SHA-256 of the content
+└── index.jsonl           # one line per archived page; replay uses the
+                          # pages of the latest scrape of each race date
+
+Identical payloads are stored once, no matter how often they are scraped.
+
+⚠️ Known Notes:
+----------------
+- Blobs are written to a temp file and renamed, so a crash never leaves a
+  half-written blob behind.
+- Worker processes may archive concurrently; each index line is a single
+  append.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+ARCHIVE_DIR = "data/archive"
+
+
+class ResponseArchive:
+    """
+    Content-addressed, gzip-compressed store of raw scrape payloads.
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.index_path = os.path.join(directory, "index.jsonl")
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.gz")
+
+    # -----------------------
+    # Writing
+    # -----------------------
+
+    def put(self, race_url, race_date, page, kind, payload):
+        """
+        Archives one payload (bytes or str) and returns its SHA-256.
+        """
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+        entry = {
+            "race_url": race_url,
+            "race_date": race_date,
+            "page": page,
+            "kind": kind,
+            "sha256": digest,
+            "archived_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return digest
+
+    # -----------------------
+    # Reading
+    # -----------------------
+
+    def get(self, digest):
+        """
+        Returns the raw payload bytes for a SHA-256.
+        """
+        with gzip.open(self._blob_path(digest), "rb") as f:
+            return f.read()
+
+    def entries(self, race_url=None):
+        """
+        Returns the pages of the latest scrape of every (race URL, race
+        date, kind), in the order the race dates were first archived.
+
+        Pages of one scrape are archived in increasing page order, so a
+        page number that does not increase starts a new scrape and drops
+        the older pages (a re-scrape with fewer pages leaves none behind).
+        """
+        latest = {}  # (race URL, race date, kind) → entries of its latest scrape
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if race_url is not None and entry["race_url"] != race_url:
+                    continue
+                key = (entry["race_url"], entry["race_date"], entry["kind"])
+                scrape = latest.setdefault(key, [])  # Keeps first-seen position
+                if scrape and entry["page"] <= scrape[-1]["page"]:
+                    scrape.clear()
+                scrape.append(entry)
+        return [entry for scrape in latest.values() for entry in scrape]
+
+    def race_urls(self):
+        """
+        Returns every race URL present in the archive.
+        """
+        return list(dict.fromkeys(entry["race_url"] for entry in self.entries()))
@@ -0,0 +1,471 @@
+"""
+results_browser.py
+
+────────────────────────────────────────────────────────────────────────────
+🌐 Selenium Engine for the IRONMAN Results Scraper
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+The browser steps of `ironman_results_scraper.py`, as functions that can be
+driven by the serial race loop or by the parallel worker pool
+(`worker_pool.py`):
+
+- start_driver()         → new Chrome WebDriver (lightweight headless
+                           profile by default, see browser_profile.py)
+- open_results_page()    → race page → results iframe
+- read_race_dates()      → texts of the race-date dropdown
+- select_race_date()     → picks the i-th race date
+- set_rows_to_100()      → 100 rows per grid page
+- scrape_current_date()  → all rows of the selected date, every page
+- scrape_race_date()     → open + select + scrape for one (race, date)
+
+All waits are event-driven (see waits.py): each step returns as soon as
+the grid has actually changed, instead of sleeping a fixed time. Every
+step is recorded as a telemetry phase (see scrape_telemetry.py).
+
+Steps retry at most STEP_ATTEMPTS times (enough for a stale element) and
+then raise: a race that keeps failing goes to the retry quarantine of the
+caller (retry_quarantine.py) instead of stalling the run here.
+
+♻️ Driver Recycling:
+--------------------
+DriverRecycler keeps one browser warm across race dates and races, and
+only restarts it when it is actually unhealthy:
+- browser memory (RSS of chromedriver + all Chrome processes) is above
+  the configured limit, or
+- too many of the last few work items failed, or
+- the browser no longer responds.
+It counts both the restarts it made and the restarts it avoided compared
+to the old restart-before-every-date policy.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import json
+import time
+from collections import deque
+
+import psutil
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.action_chains import ActionChains
+
+from browser_profile import start_chrome, transferred_bytes
+from retry_quarantine import backoff_delay
+from results_grid import (
+    open_row_and_read_detail, read_detail_panels, read_grid_rows, rows_from_grid_page,
+)
+from scrape_telemetry import add, count_na_rows, note, phase, traced
+from waits import grid_signature, wait_for_grid_change, wait_until
+
+GRID_CHANGE_TIMEOUT = 15    # Seconds to wait for the grid to reload after an action
+STEP_ATTEMPTS = 2           # Inline tries per browser step before the error is raised
+DRIVER_START_ATTEMPTS = 3   # Tries to start a fresh browser (with backoff) before giving up
+
+# -----------------------
+# Driver & Navigation
+# -----------------------
+
+def start_driver():
+    """
+    Starts a new Chrome WebDriver with the scraping profile.
+    """
+    return start_chrome()
+
+
+@traced("open_race")
+def open_results_page(driver, race_url):
+    """
+    Loads a race page and navigates into its results iframe.
+    """
+    driver.get(race_url)
+    iframe = WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "iframe.coh-iframe"))
+    )
+    driver.get(iframe.get_attribute("src"))
+    add(bytes=transferred_bytes(driver))
+
+
+@traced("driver_restart")
+def restart_driver(driver, race_url=None):
+    """
+    Quits the driver and starts a fresh one, reopening the race results
+    when `race_url` is given.
+    """
+    for attempt in range(DRIVER_START_ATTEMPTS):
+        try:
+            try:
+                driver.quit()
+            except Exception:
+                pass  # Already dead
+            driver = start_driver()
+            if race_url:
+                open_results_page(driver, race_url)
+                wait_until(
+                    driver, EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='combobox']")),
+                    10, "results_ready",
+                )
+            return driver
+        except Exception as e:
+            print(f"⚠️ Retry {attempt+1} on driver restart failed: {str(e)[:100]}")
+            note(retries=attempt + 1)
+            if attempt + 1 < DRIVER_START_ATTEMPTS:
+                time.sleep(backoff_delay(attempt + 1, base=3, cap=30))
+    return driver  # Possibly broken; the caller's next step fails and is quarantined
+
+
+@traced("read_dates")
+def read_race_dates(driver):
+    """
+    Opens the race-date dropdown and returns the text of every option.
+    """
+    dropdown = WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='combobox']"))
+    )
+    dropdown.click()
+
+    options = WebDriverWait(driver, 10).until(
+        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ul[role='listbox'] li[role='option']"))
+    )
+    race_dates = [option.text for option in options]
+    note(rows=len(race_dates))
+
+    ActionChains(driver).send_keys(Keys.ESCAPE).perform()  # Close dropdown
+    return race_dates
+
+
+@traced("select_date")
+def select_race_date(driver, i):
+    """
+    Selects the i-th race date in the dropdown and returns its text.
+    """
+    for attempt in range(STEP_ATTEMPTS):
+        try:
+            dropdown = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "div[role='combobox']"))
+            )
+            dropdown.click()
+            options = WebDriverWait(driver, 10).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ul[role='listbox'] li[role='option']"))
+            )
+            current_option = options[i]
+            race_date_text = current_option.text
+            already_selected = current_option.get_attribute("aria-selected") == "true"
+            before = grid_signature(driver)
+            print(f"➡️ Selecting race date: {race_date_text}")
+            current_option.click()
+            if not already_selected:
+                wait_for_grid_change(driver, before, GRID_CHANGE_TIMEOUT, "select_date")
+            return race_date_text
+        except Exception as e:
+            print(f"Retry {attempt+1} on selecting race date failed: {str(e)[:100]}")
+            note(retries=attempt + 1)
+    raise RuntimeError(f"Could not select race date #{i+1}")
+
+
+@traced("rows_to_100")
+def set_rows_to_100(driver):
+    """
+    Switches the results grid to 100 rows per page. Skipped when every
+    athlete already fits on the current page, or when 100 is already
+    selected (a warm browser keeps the setting from the previous date).
+    """
+    for attempt in range(STEP_ATTEMPTS):
+        try:
+            before = grid_signature(driver)
+            if before["displayed"] and before["displayed"].split()[-1] == str(before["count"]):
+                note(skipped=True)
+                return  # All rows already shown
+            rows_dropdown = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "div.MuiTablePagination-select"))
+            )
+            if rows_dropdown.text.strip() == "100":
+                note(skipped=True)
+                return  # Re-selecting would not change the grid (and wait for nothing)
+            rows_dropdown.click()
+            option_100 = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.XPATH, "//li[contains(text(),'100')]"))
+            )
+            option_100.click()
+            print("📊 Set rows per page to 100.")
+            wait_for_grid_change(driver, before, GRID_CHANGE_TIMEOUT, "rows_to_100")
+            return
+        except Exception as e:
+            print(f"Retry {attempt+1} on setting rows: {str(e)[:100]}")
+            note(retries=attempt + 1)
+    # Not fatal: the date is still scraped, just with more pages
+
+
+# -----------------------
+# Driver Recycling
+# -----------------------
+
+def browser_rss_mb(driver):
+    """
+    Resident memory of chromedriver and every browser process it started, in MB.
+    """
+    root = psutil.Process(driver.service.process.pid)
+    processes = [root] + root.children(recursive=True)
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+    return total / (1024 * 1024)
+
+
+class DriverRecycler:
+    """
+    Decides when a warm driver has to be restarted, based on measured
+    memory and recent error rate. The limits are configured in
+    ironman_results_scraper.py (MAX_BROWSER_RSS_MB, MAX_ERROR_RATE,
+    ERROR_WINDOW).
+    """
+
+    def __init__(self, max_rss_mb, max_error_rate, error_window):
+        self.max_rss_mb = max_rss_mb
+        self.max_error_rate = max_error_rate
+        self.outcomes = deque(maxlen=error_window)
+        self.items = 0
+        self.restarts = 0
+
+    @property
+    def restarts_avoided(self):
+        """
+        Restarts the old policy (restart before every item but the first)
+        would have made on top of the ones actually made.
+        """
+        return max(self.items - 1 - self.restarts, 0)
+
+    def record(self, ok):
+        """
+        Records whether the last work item on this driver succeeded.
+        """
+        self.outcomes.append(bool(ok))
+        self.items += 1
+
+    def recycle_reason(self, driver):
+        """
+        Returns why the driver should be restarted, or None if it is healthy.
+        """
+        failures = self.outcomes.count(False)
+        if self.outcomes and failures / self.outcomes.maxlen >= self.max_error_rate:
+            return f"{failures} of the last {len(self.outcomes)} items failed"
+        try:
+            driver.title  # Cheap liveness probe
+            rss = browser_rss_mb(driver)
+        except Exception:
+            return "browser not responding"
+        if rss > self.max_rss_mb:
+            return f"browser using {rss:.0f} MB"
+        return None
+
+    def maybe_recycle(self, driver, race_url=None):
+        """
+        Restarts the driver if it is unhealthy, otherwise keeps it warm.
+        Returns (driver, restarted).
+        """
+        reason = self.recycle_reason(driver)
+        if reason is None:
+            return driver, False
+        print(f"🔄 Restarting driver ({reason})...")
+        self.restarts += 1
+        self.outcomes.clear()
+        return restart_driver(driver, race_url), True
+
+    def report(self):
+        return f"♻️ Driver restarts: {self.restarts} | restarts avoided: {self.restarts_avoided}"
+
+
+# -----------------------
+# Row Extraction
+# -----------------------
+
+def _read_page_batch(driver):
+    """
+    Grid cells in one script call, detail panels in one async call.
+    Returns the raw page payload {"grid_rows": [...], "details": {...}}.
+    """
+    with phase("grid_read") as metrics:
+        grid_rows = read_grid_rows(driver)
+        metrics["rows"] = len(grid_rows)
+    with phase("row_details") as metrics:
+        details = read_detail_panels(driver)
+        metrics["rows"] = len(grid_rows)
+        for grid_row in grid_rows:
+            row_index = grid_row["rowindex"]
+            if not details.get(row_index):
+                details[row_index] = open_row_and_read_detail(driver, row_index)
+                metrics["retries"] = metrics.get("retries", 0) + 1
+    return {"grid_rows": grid_rows, "details": details}
+
+
+@traced("row_clicks")
+def _read_page_legacy(driver, rows, race_name, race_date_text):
+    """
+    Original per-row path: click every row and look up each field.
+    """
+    page_results = []
+
+    def get_text(xpath, timeout=1.5):
+        try:
+            return wait_until(
+                driver, EC.presence_of_element_located((By.XPATH, xpath)), timeout, "detail_field"
+            ).text
+        except Exception:
+            return "N/A"
+
+    def get_text_by_data_field(row_index, field_name, timeout=1.5):
+        xpath = (
+            f"//div[@data-rowindex='{row_index}']//div[@data-field='{field_name}']/p"
+            f" | //div[@data-rowindex='{row_index}']//div[@data-field='{field_name}']/span/p"
+        )
+        try:
+            return wait_until(
+                driver, EC.presence_of_element_located((By.XPATH, xpath)), timeout, "grid_field"
+            ).text
+        except Exception:
+            return "N/A"
+
+    for row_number in range(len(rows)):
+        for attempt in range(STEP_ATTEMPTS):
+            try:
+                rows = WebDriverWait(driver, 10).until(
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[role='row'][data-rowindex]"))
+                )
+                row = rows[row_number]
+                row_index = row.get_attribute("data-rowindex")
+                driver.execute_script("arguments[0].scrollIntoView(true);", row)
+                row.click()
+
+                designation = get_text("//h6[contains(text(),'Designation')]/preceding-sibling::h6")
+
+                # Handle different athlete result scenarios
+                if designation in {"DNS", "DQ"}:
+                    page_results.append({
+                        "Race Name": race_name,
+                        "Race Date": race_date_text,
+                        "Athlete": get_text_by_data_field(row_index, "athlete"),
+                        "Designation": designation,
+                    })
+
+                elif designation == "DNF":
+                    page_results.append({
+                        "Race Name": race_name,
+                        "Race Date": race_date_text,
+                        "Athlete": get_text_by_data_field(row_index, "athlete"),
+                        "Designation": designation,
+                        "Swim Time": get_text_by_data_field(row_index, "wtc_swimtimeformatted"),
+                        "Transition 1": get_text_by_data_field(row_index, "wtc_transition1timeformatted"),
+                        "Bike Time": get_text_by_data_field(row_index, "wtc_biketimeformatted"),
+                        "Transition 2": get_text_by_data_field(row_index, "wtc_transitiontime2formatted"),
+                        "Run Time": get_text_by_data_field(row_index, "wtc_runtimeformatted"),
+                        "Finish Time": get_text_by_data_field(row_index, "wtc_finishtimeformatted"),
+                    })
+
+                else:
+                    page_results.append({
+                        "Race Name": race_name,
+                        "Race Date": race_date_text,
+                        "Athlete": get_text_by_data_field(row_index, "athlete"),
+                        "Div Rank": get_text("//h6[contains(text(),'Div Rank')]/preceding-sibling::h6"),
+                        "Gender Rank": get_text("//h6[contains(text(),'Gender Rank')]/preceding-sibling::h6"),
+                        "Overall Rank": get_text("//h6[contains(text(),'Overall Rank')]/preceding-sibling::h6"),
+                        "Designation": designation,
+                        "Division": get_text("//h6[contains(text(),'Division')]/preceding-sibling::h6"),
+                        "Swim Time": get_text_by_data_field(row_index, "wtc_swimtimeformatted"),
+                        "Transition 1": get_text_by_data_field(row_index, "wtc_transition1timeformatted"),
+                        "Bike Time": get_text_by_data_field(row_index, "wtc_biketimeformatted"),
+                        "Transition 2": get_text_by_data_field(row_index, "wtc_transitiontime2formatted"),
+                        "Run Time": get_text_by_data_field(row_index, "wtc_runtimeformatted"),
+                        "Finish Time": get_text_by_data_field(row_index, "wtc_finishtimeformatted"),
+                    })
+
+                row.click()  # Close row
+                break
+            except Exception as e:
+                print(f"Retry {attempt+1} on row {row_number+1}: {str(e)[:100]}")
+                add(retries=1)
+                if attempt + 1 == STEP_ATTEMPTS:
+                    raise RuntimeError(f"Could not read row {row_number+1}") from e
+
+    note(rows=len(page_results))
+    return page_results
+
+
+@traced("next_page")
+def _go_to_next_page(driver, rows):
+    """
+    Clicks "next page". Returns False when there is no further page;
+    raises when the click keeps failing (instead of silently stopping).
+    """
+    for attempt in range(STEP_ATTEMPTS):
+        try:
+            next_button = WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located((By.XPATH, "//button[@aria-label='Go to next page']"))
+            )
+            if "Mui-disabled" in next_button.get_attribute("class"):
+                return False
+            next_button.click()
+            wait_until(driver, EC.staleness_of(rows[0]), 10, "next_page")
+            return True
+        except Exception as e:
+            note(retries=attempt + 1)
+            error = e
+    raise RuntimeError(f"Could not go to the next page: {str(error)[:100]}")
+
+
+@traced("scrape_date")
+def scrape_current_date(driver, race_name, race_date_text, batch=True, paginate=True,
+                        archive=None, race_url=None):
+    """
+    Reads every athlete row of the currently selected race date,
+    page by page, and returns the list of result dicts.
+
+    With a ResponseArchive, each batch-mode page payload is archived under
+    (race_url, race_date_text, page number).
+    """
+    date_results = []
+    page = 0
+    pagination_active = True
+    while pagination_active:
+        rows = WebDriverWait(driver, 10).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[role='row'][data-rowindex]"))
+        )
+        print(f"📋 Found {len(rows)} rows on this page.")
+
+        if batch:
+            payload = _read_page_batch(driver)
+            if archive is not None:
+                archive.put(race_url, race_date_text, page, "grid_page", json.dumps(payload))
+            date_results.extend(
+                rows_from_grid_page(payload["grid_rows"], payload["details"], race_name, race_date_text)
+            )
+        else:
+            date_results.extend(_read_page_legacy(driver, rows, race_name, race_date_text))
+
+        page += 1
+        pagination_active = paginate and _go_to_next_page(driver, rows)
+
+    note(pages=page, rows=len(date_results), na_rows=count_na_rows(date_results))
+    add(bytes=transferred_bytes(driver))
+    return date_results
+
+
+def scrape_race_date(driver, race_url, race_name, date_index, rows_to_100=True, batch=True, paginate=True,
+                     archive=None):
+    """
+    Opens a race, selects one race date and scrapes it.
+    Returns (race_date_text, rows).
+    """
+    open_results_page(driver, race_url)
+    race_date_text = select_race_date(driver, date_index)
+    if rows_to_100:
+        set_rows_to_100(driver)
+    return race_date_text, scrape_current_date(
+        driver, race_name, race_date_text, batch, paginate, archive, race_url
+    )
@@ -0,0 +1,335 @@
+"""
+results_feed.py
+
+────────────────────────────────────────────────────────────────────────────
+⚡ IRONMAN Results Feed Fetcher (HTTP engine)
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+The results iframe on every IRONMAN race page is a data grid that renders
+from a JSON results feed. This module reads that feed directly over HTTP,
+so a whole race date is captured in one request instead of one Selenium
+click per athlete row.
+
+It produces exactly the same columns as the Selenium engine in
+`ironman_results_scraper.py`:
+    Race Name, Race Date, Athlete, Div Rank, Gender Rank, Overall Rank,
+    Designation, Division, Swim Time, Transition 1, Bike Time,
+    Transition 2, Run Time, Finish Time
+
+🔌 Transports:
+--------------
+All network access goes through a transport object with one method,
+`get(url) -> bytes`:
+- UrllibTransport    → live HTTP (standard library only)
+- RecordingTransport → wraps another transport and saves every response
+- ReplayTransport    → serves recorded responses from a local directory,
+                       so tests never touch ironman.com
+
+The `async_*` entry points take an AsyncFetcher (async_fetcher.py), whose
+`await get(url) -> bytes` is the async twin of the transports above.
+
+⚠️ Known Notes:
+----------------
+- Feed endpoints and field names live in the settings block below; if the
+  results provider renames them, only that block needs updating.
+- Grid field names are the same `data-field` values the Selenium engine
+  reads (GRID_FIELDS in results_grid.py).
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import hashlib
+import json
+import os
+import re
+import urllib.request
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from results_grid import GRID_FIELDS, build_result_row
+
+# -----------------------
+# Configurable Settings
+# -----------------------
+
+RESULTS_FEED_URL = "https://labs-v2.competitor.com/api/results?wtc_eventid={event_id}"
+REQUEST_TIMEOUT = 30
+USER_AGENT = "Mozilla/5.0 (ironman-races-analysis)"
+
+# Race-date (sub-event) records embedded in the iframe page
+SUBEVENT_ID_FIELD = "wtc_eventid"
+SUBEVENT_DATE_FIELD = "wtc_eventdate"
+
+# Detail-panel values (only visible after clicking a row in the browser)
+DETAIL_FIELDS = {
+    "Div Rank": "wtc_divisionrank",
+    "Gender Rank": "wtc_genderrank",
+    "Overall Rank": "wtc_overallrank",
+    "Division": "wtc_agegroupname",
+}
+
+# Boolean status flags mapped to the Designation text shown in the panel
+DESIGNATION_FLAGS = {
+    "wtc_dns": "DNS",
+    "wtc_dq": "DQ",
+    "wtc_dnf": "DNF",
+}
+DEFAULT_DESIGNATION = "Finisher"
+
+
+# -----------------------
+# Transports
+# -----------------------
+
+class UrllibTransport:
+    """
+    Plain HTTP transport built on urllib (no extra dependencies).
+    """
+
+    def __init__(self, timeout=REQUEST_TIMEOUT, user_agent=USER_AGENT):
+        self.timeout = timeout
+        self.user_agent = user_agent
+
+    def get(self, url):
+        request = urllib.request.Request(url, headers={"User-Agent": self.user_agent})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+
+def _response_path(directory, url):
+    """
+    Returns the file used to store the recorded response for a URL.
+    """
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(directory, f"{digest}.bin")
+
+
+class RecordingTransport:
+    """
+    Wraps another transport and saves every response it returns,
+    so the run can later be replayed offline with ReplayTransport.
+    """
+
+    def __init__(self, inner, directory):
+        self.inner = inner
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, url):
+        body = self.inner.get(url)
+        with open(_response_path(self.directory, url), "wb") as f:
+            f.write(body)
+        return body
+
+
+class ReplayTransport:
+    """
+    Serves responses recorded by RecordingTransport. Raises KeyError for
+    any URL that was never recorded.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def get(self, url):
+        path = _response_path(self.directory, url)
+        if not os.path.exists(path):
+            raise KeyError(f"No recorded response for {url}")
+        with open(path, "rb") as f:
+            return f.read()
+
+
+# -----------------------
+# Page Parsing Helpers
+# -----------------------
+
+class _IframeFinder(HTMLParser):
+    """
+    Collects the src of the first `iframe.coh-iframe` on a race page.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.src = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "iframe" or self.src:
+            return
+        attrs = dict(attrs)
+        if "coh-iframe" in (attrs.get("class") or "").split():
+            self.src = attrs.get("src")
+
+
+def find_results_iframe_src(race_page_html, race_url):
+    """
+    Returns the absolute URL of the results iframe on a race page.
+    """
+    finder = _IframeFinder()
+    finder.feed(race_page_html)
+    if not finder.src:
+        raise ValueError(f"No results iframe found on {race_url}")
+    return urljoin(race_url, finder.src)
+
+
+def _find_records(payload, required_field):
+    """
+    Walks a decoded JSON payload and returns the first list of dicts
+    whose items carry `required_field`.
+    """
+    if isinstance(payload, list):
+        if payload and all(isinstance(item, dict) for item in payload) and required_field in payload[0]:
+            return payload
+        for item in payload:
+            found = _find_records(item, required_field)
+            if found is not None:
+                return found
+    elif isinstance(payload, dict):
+        for value in payload.values():
+            found = _find_records(value, required_field)
+            if found is not None:
+                return found
+    return None
+
+
+def _embedded_json(page_html):
+    """
+    Extracts the JSON state the iframe page ships with (`__NEXT_DATA__`).
+    """
+    match = re.search(
+        r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', page_html, flags=re.DOTALL
+    )
+    if not match:
+        raise ValueError("Results page has no embedded __NEXT_DATA__ state")
+    return json.loads(match.group(1))
+
+
+def format_race_date(value):
+    """
+    Formats an ISO date the way the race-date dropdown shows it,
+    e.g. "2024 - June 09".
+    """
+    date = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return f"{date.year} - {date.strftime('%B %d')}"
+
+
+def parse_subevents(iframe_html):
+    """
+    Returns [(event_id, race_date_text), ...] for every race date listed
+    in the iframe page, newest first (same order as the dropdown).
+    """
+    records = _find_records(_embedded_json(iframe_html), SUBEVENT_ID_FIELD) or []
+    subevents = [
+        (record[SUBEVENT_ID_FIELD], record.get(SUBEVENT_DATE_FIELD))
+        for record in records
+        if record.get(SUBEVENT_DATE_FIELD)
+    ]
+    subevents.sort(key=lambda item: str(item[1]), reverse=True)
+    return [(event_id, format_race_date(date)) for event_id, date in subevents]
+
+
+# -----------------------
+# Record Conversion
+# -----------------------
+
+def designation_from_record(record):
+    """
+    Returns the Designation text (Finisher, DNF, DNS or DQ) for a feed record.
+    """
+    for flag, designation in DESIGNATION_FLAGS.items():
+        if record.get(flag):
+            return designation
+    return DEFAULT_DESIGNATION
+
+
+def feed_record_to_row(record, race_name, race_date_text):
+    """
+    Converts one feed record into the same dict the Selenium engine builds,
+    including its per-designation column subsets.
+    """
+    cells = {column: record.get(field) for column, field in GRID_FIELDS.items()}
+    detail = {column: record.get(field) for column, field in DETAIL_FIELDS.items()}
+    detail["Designation"] = designation_from_record(record)
+    return build_result_row(race_name, race_date_text, cells, detail)
+
+
+def feed_records(body):
+    """
+    Returns the raw athlete records of one results feed response.
+    """
+    return _find_records(json.loads(body), GRID_FIELDS["Athlete"]) or []
+
+
+def parse_results_feed(body, race_name, race_date_text):
+    """
+    Parses one results feed response into a list of result rows.
+    """
+    return [feed_record_to_row(record, race_name, race_date_text) for record in feed_records(body)]
+
+
+# -----------------------
+# Public Entry Points
+# -----------------------
+
+def fetch_race_dates(race_url, transport):
+    """
+    Returns [(event_id, race_date_text), ...] for every race date of a race.
+    """
+    race_page = transport.get(race_url).decode("utf-8", errors="replace")
+    iframe_url = find_results_iframe_src(race_page, race_url)
+    iframe_page = transport.get(iframe_url).decode("utf-8", errors="replace")
+    return parse_subevents(iframe_page)
+
+
+def fetch_race_date_results(race_name, race_url, event_id, race_date_text, transport, archive=None):
+    """
+    Fetches and parses the results feed of one race date.
+    With a ResponseArchive, the feed body is archived before parsing.
+    """
+    body = transport.get(RESULTS_FEED_URL.format(event_id=event_id))
+    if archive is not None:
+        archive.put(race_url, race_date_text, 0, "feed", body)
+    rows = parse_results_feed(body, race_name, race_date_text)
+    print(f"➡️ {race_date_text}: {len(rows)} rows")
+    return rows
+
+
+def fetch_race_results(race_name, race_url, transport=None, archive=None):
+    """
+    Fetches every race date of a race over HTTP and returns all result rows,
+    in the same shape as the Selenium engine's `race_results` list.
+    """
+    transport = transport or UrllibTransport()
+    subevents = fetch_race_dates(race_url, transport)
+    print(f"🗓️ Found {len(subevents)} race dates.")
+
+    race_results = []
+    for event_id, race_date_text in subevents:
+        race_results.extend(
+            fetch_race_date_results(race_name, race_url, event_id, race_date_text, transport, archive)
+        )
+    return race_results
+
+
+async def async_fetch_race_dates(race_url, fetcher):
+    """
+    Async version of fetch_race_dates() using an AsyncFetcher.
+    """
+    race_page = (await fetcher.get(race_url)).decode("utf-8", errors="replace")
+    iframe_url = find_results_iframe_src(race_page, race_url)
+    iframe_page = (await fetcher.get(iframe_url)).decode("utf-8", errors="replace")
+    return parse_subevents(iframe_page)
+
+
+async def async_fetch_race_date_results(race_name, race_url, event_id, race_date_text, fetcher, archive=None):
+    """
+    Async version of fetch_race_date_results() using an AsyncFetcher.
+    """
+    body = await fetcher.get(RESULTS_FEED_URL.format(event_id=event_id))
+    if archive is not None:
+        archive.put(race_url, race_date_text, 0, "feed", body)
+    rows = parse_results_feed(body, race_name, race_date_text)
+    print(f"➡️ {race_date_text}: {len(rows)} rows")
+    return rows
@@ -0,0 +1,245 @@
+"""
+results_grid.py
+
+────────────────────────────────────────────────────────────────────────────
+📋 Batch Extraction from the IRONMAN Results Data Grid
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Reads the results grid inside the race iframe with a few `execute_script`
+calls per page instead of one `find_element` per field per row:
+
+1. read_grid_rows()      → every visible row and every `data-field` cell
+                           in a single round trip
+2. read_detail_panels()  → opens each row in the page, reads the detail
+                           panel (Designation, Div/Gender/Overall Rank,
+                           Division) and closes it again, all inside one
+                           async script
+3. open_row_and_read_detail() → per-row fallback for rows the batch pass
+                                missed
+
+`build_result_row()` turns grid cells + detail values into the same dict
+shape the scraper has always written, and is shared with the HTTP engine
+in `results_feed.py`. `rows_from_grid_page()` does it for a whole page and
+is also used to re-parse archived pages (response_archive.py).
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from results_schema import SPLIT_COLUMNS
+
+# -----------------------
+# Field Mapping
+# -----------------------
+
+# Output column → grid `data-field`
+GRID_FIELDS = {
+    "Athlete": "athlete",
+    "Swim Time": "wtc_swimtimeformatted",
+    "Transition 1": "wtc_transition1timeformatted",
+    "Bike Time": "wtc_biketimeformatted",
+    "Transition 2": "wtc_transitiontime2formatted",
+    "Run Time": "wtc_runtimeformatted",
+    "Finish Time": "wtc_finishtimeformatted",
+}
+
+# Labels shown in the detail panel once a row is opened
+DETAIL_LABELS = ["Designation", "Div Rank", "Gender Rank", "Overall Rank", "Division"]
+
+ROW_SELECTOR = "div[role='row'][data-rowindex]"
+DETAIL_TIMEOUT_MS = 3000    # Per-row wait for the detail panel inside the batch script
+SCRIPT_TIMEOUT = 300        # Seconds Selenium allows one async script to run
+FALLBACK_TIMEOUT = 5        # Seconds to wait for a panel in the per-row fallback
+
+# -----------------------
+# Browser-side Scripts
+# -----------------------
+
+_READ_GRID_JS = """
+const rows = document.querySelectorAll(arguments[0]);
+return Array.from(rows).map(row => {
+    const cells = {};
+    row.querySelectorAll("div[data-field]").forEach(cell => {
+        const p = cell.querySelector(":scope > p, :scope > span > p");
+        cells[cell.getAttribute("data-field")] = p ? p.innerText.trim() : null;
+    });
+    return {rowindex: row.getAttribute("data-rowindex"), cells: cells};
+});
+"""
+
+_DETAIL_JS = """
+function readDetail(labels) {
+    const headings = Array.from(document.querySelectorAll("h6"));
+    const detail = {};
+    for (const label of labels) {
+        const heading = headings.find(h => h.textContent.includes(label));
+        let value = heading ? heading.previousElementSibling : null;
+        while (value && value.tagName !== "H6") {
+            value = value.previousElementSibling;
+        }
+        detail[label] = value ? value.innerText.trim() : null;
+    }
+    return detail;
+}
+"""
+
+_READ_DETAIL_JS = _DETAIL_JS + """
+const detail = readDetail(arguments[0]);
+return detail["Designation"] === null ? null : detail;
+"""
+
+_READ_DETAIL_PANELS_JS = _DETAIL_JS + """
+const [selector, labels, timeoutMs, done] = arguments;
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+async function waitFor(check) {
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+        const value = check();
+        if (value) return value;
+        await sleep(25);
+    }
+    return null;
+}
+
+(async () => {
+    const results = {};
+    const indexes = Array.from(document.querySelectorAll(selector)).map(r => r.getAttribute("data-rowindex"));
+    for (const index of indexes) {
+        const row = document.querySelector(`div[role='row'][data-rowindex='${index}']`);
+        if (!row) { results[index] = null; continue; }
+        row.scrollIntoView(true);
+        row.click();
+        const detail = await waitFor(() => {
+            const d = readDetail(labels);
+            return d["Designation"] === null ? null : d;
+        });
+        results[index] = detail;
+        row.click();
+        if (detail) {
+            await waitFor(() => readDetail(["Designation"])["Designation"] === null);
+        }
+    }
+    done(results);
+})().catch(() => done(null));
+"""
+
+# -----------------------
+# Extraction Functions
+# -----------------------
+
+def read_grid_rows(driver):
+    """
+    Returns [{"rowindex": "0", "cells": {data-field: text}}, ...] for every
+    row currently rendered in the grid, in one WebDriver round trip.
+    """
+    return driver.execute_script(_READ_GRID_JS, ROW_SELECTOR)
+
+
+def read_detail_panel(driver):
+    """
+    Reads the detail panel of the currently opened row.
+    Returns None if no panel is open yet.
+    """
+    return driver.execute_script(_READ_DETAIL_JS, DETAIL_LABELS)
+
+
+def open_row_and_read_detail(driver, row_index):
+    """
+    Per-row fallback: clicks one row, waits for its detail panel, reads it
+    and closes the row again. Returns None if the panel never appears.
+    """
+    row = driver.find_element(By.CSS_SELECTOR, f"div[role='row'][data-rowindex='{row_index}']")
+    driver.execute_script("arguments[0].scrollIntoView(true);", row)
+    row.click()
+    try:
+        return WebDriverWait(driver, FALLBACK_TIMEOUT).until(read_detail_panel)
+    except TimeoutException:
+        return None
+    finally:
+        row.click()  # Close row
+
+
+def read_detail_panels(driver):
+    """
+    Opens, reads and closes every row on the current page inside a single
+    async script. Returns {rowindex: detail dict or None}.
+    """
+    driver.set_script_timeout(SCRIPT_TIMEOUT)
+    return driver.execute_async_script(
+        _READ_DETAIL_PANELS_JS, ROW_SELECTOR, DETAIL_LABELS, DETAIL_TIMEOUT_MS
+    ) or {}
+
+
+# -----------------------
+# Row Building
+# -----------------------
+
+def _text(value):
+    """
+    Missing values become "N/A", as they always have in the scraper output.
+    """
+    if value is None or value == "":
+        return "N/A"
+    return str(value)
+
+
+def build_result_row(race_name, race_date_text, cells, detail):
+    """
+    Builds one result dict from grid cells (keyed by output column) and
+    detail-panel values (keyed by DETAIL_LABELS).
+
+    Column subsets depend on the designation:
+    - DNS / DQ → name and designation only
+    - DNF      → plus splits
+    - others   → plus ranks and division
+    """
+    designation = _text(detail.get("Designation"))
+    row = {
+        "Race Name": race_name,
+        "Race Date": race_date_text,
+        "Athlete": _text(cells.get("Athlete")),
+    }
+
+    if designation in {"DNS", "DQ"}:
+        row["Designation"] = designation
+        return row
+
+    if designation != "DNF":
+        row["Div Rank"] = _text(detail.get("Div Rank"))
+        row["Gender Rank"] = _text(detail.get("Gender Rank"))
+        row["Overall Rank"] = _text(detail.get("Overall Rank"))
+    row["Designation"] = designation
+    if designation != "DNF":
+        row["Division"] = _text(detail.get("Division"))
+
+    for column in SPLIT_COLUMNS:
+        row[column] = _text(cells.get(column))
+    return row
+
+
+def grid_cells_by_column(grid_row):
+    """
+    Re-keys a read_grid_rows() entry from data-field names to output columns.
+    """
+    cells = grid_row["cells"]
+    return {column: cells.get(field) for column, field in GRID_FIELDS.items()}
+
+
+def rows_from_grid_page(grid_rows, details, race_name, race_date_text):
+    """
+    Builds the result rows of one grid page from read_grid_rows() output and
+    {rowindex: detail}. Used live and when replaying archived pages.
+    """
+    return [
+        build_result_row(
+            race_name, race_date_text, grid_cells_by_column(grid_row),
+            details.get(grid_row["rowindex"]) or {},
+        )
+        for grid_row in grid_rows
+    ]
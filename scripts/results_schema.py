@@ -0,0 +1,243 @@
+"""
+results_schema.py
+
+────────────────────────────────────────────────────────────────────────────
+🧾 Typed Schema for IRONMAN Race Results
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+One definition of the per-athlete result columns and their types, so the
+text the scrapers read ("01:02:03", "N/A", "2024 - June 09") is parsed
+once, at capture time, instead of in every downstream script:
+
+    Race Name, Athlete, Designation, Division → string
+    Race Date                                 → date
+    Div Rank, Gender Rank, Overall Rank       → nullable int
+    Swim Time … Finish Time                   → nullable int (seconds)
+
+"N/A", "--" and empty values become typed nulls.
+
+Splits are read as "h:mm:ss" and also as "mm:ss" (short transitions are
+often shown that way). The cleaning step used to turn "mm:ss" values
+into NaT, so cleaned outputs now hold those transitions (e.g. "05:00" →
+5 minutes) where they used to be null.
+
+- apply_results_schema() → any results DataFrame (scraped text, legacy
+                           CSV, typed Parquet) → typed columns; date and
+                           number columns that already have their type
+                           are kept as is
+- write_results_parquet() → zstd-compressed Parquet with a fixed Arrow
+                            schema (Race Date stored as date32)
+- read_results()          → typed DataFrame from .parquet or .csv; CSVs
+                            are read as plain text (no dtype inference)
+                            and parsed once, missing columns become
+                            typed nulls
+- from_arrow()            → typed Arrow table → DataFrame, no parsing
+- legacy_text()           → back to the old all-text CSV layout
+
+Shared by the scraper, `combine_race_results.py` (parses every race file
+once, at read time) and `clean_race_results.py` (works on the typed
+columns, no string re-conversion).
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+RACE_DATE_FORMAT = "%Y - %B %d"     # As shown in the race-date dropdown
+PARQUET_COMPRESSION = "zstd"
+
+TEXT_COLUMNS = ["Race Name", "Athlete", "Designation", "Division"]
+RANK_COLUMNS = ["Div Rank", "Gender Rank", "Overall Rank"]
+SPLIT_COLUMNS = ["Swim Time", "Transition 1", "Bike Time", "Transition 2", "Run Time", "Finish Time"]
+DATE_COLUMN = "Race Date"
+
+RESULT_COLUMNS = [
+    "Race Name", "Race Date", "Athlete", "Div Rank", "Gender Rank", "Overall Rank",
+    "Designation", "Division", *SPLIT_COLUMNS,
+]
+
+MISSING_TEXT = ["", "N/A", "--", "-", "nan", "NaN", "None", "<NA>"]
+
+# pandas dtype of every result column
+PANDAS_DTYPES = {
+    **{column: "string" for column in TEXT_COLUMNS},
+    DATE_COLUMN: "datetime64[s]",
+    **{column: "Int32" for column in RANK_COLUMNS + SPLIT_COLUMNS},
+}
+
+ARROW_SCHEMA = pa.schema([
+    ("Race Name", pa.string()),
+    ("Race Date", pa.date32()),
+    ("Athlete", pa.string()),
+    *[(column, pa.int32()) for column in RANK_COLUMNS],
+    ("Designation", pa.string()),
+    ("Division", pa.string()),
+    *[(column, pa.int32()) for column in SPLIT_COLUMNS],
+])
+
+
+# -----------------------
+# Column Parsers
+# -----------------------
+
+def _text(series):
+    text = series.astype("string").str.strip()
+    return text.mask(text.isin(MISSING_TEXT))
+
+
+def to_text(series):
+    """
+    Strings with "N/A" / empty values as nulls.
+    """
+    return _text(series)
+
+
+def to_rank(series):
+    """
+    Ranks as nullable ints; anything that is not a number becomes null.
+    """
+    return pd.to_numeric(_text(series), errors="coerce").round().astype("Int32")
+
+
+def to_seconds(series):
+    """
+    Splits as nullable int seconds. Accepts "h:mm:ss", "mm:ss", timedeltas
+    and values that already are seconds. "mm:ss" is read as minutes and
+    seconds ("05:00" → 300), not as hours and minutes.
+    """
+    if pd.api.types.is_timedelta64_dtype(series):
+        return series.dt.total_seconds().round().astype("Int32")
+    text = _text(series)
+    seconds = pd.to_numeric(text, errors="coerce").astype("float64")  # Float, so fractional clock values can fill it
+    clock = text.mask(seconds.notna())
+    clock = clock.mask(clock.str.count(":") == 1, "0:" + clock)
+    parsed = pd.to_timedelta(clock, errors="coerce").dt.total_seconds()
+    return seconds.fillna(parsed).round().astype("Int32")
+
+
+def to_race_date(series):
+    """
+    Race dates as dates (datetime64, no time part). Accepts the dropdown
+    text ("2024 - June 09"), ISO dates and date objects.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.normalize().astype("datetime64[s]")
+    text = _text(series)
+    dates = pd.to_datetime(text, format=RACE_DATE_FORMAT, errors="coerce")
+    iso = pd.to_datetime(text.mask(dates.notna()), format="ISO8601", errors="coerce")
+    return dates.fillna(iso).dt.normalize().astype("datetime64[s]")
+
+
+def race_date_keys(values):
+    """
+    Comparable keys for race dates given as dropdown text (zero-padded or
+    not), ISO text or dates; values that are not a date keep their text.
+    """
+    values = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    dates = to_race_date(values)
+    return [date.date() if pd.notna(date) else value for value, date in zip(values, dates)]
+
+
+def race_date_text(series):
+    """
+    Dates back to the dropdown text, e.g. "2024 - June 09".
+    """
+    return to_race_date(series).dt.strftime(RACE_DATE_FORMAT)
+
+
+# -----------------------
+# Frames
+# -----------------------
+
+def apply_results_schema(df):
+    """
+    Returns `df` with every result column present and typed, result
+    columns first (in RESULT_COLUMNS order), other columns after.
+    """
+    typed = pd.DataFrame(index=df.index)
+    for column in RESULT_COLUMNS:
+        if column not in df:
+            typed[column] = pd.Series(pd.NA, index=df.index, dtype=PANDAS_DTYPES[column])
+            continue
+        values = df[column]
+        if column not in TEXT_COLUMNS and values.dtype == PANDAS_DTYPES[column]:
+            typed[column] = values  # Already typed (e.g. read from typed Parquet), nothing to parse
+        elif column == DATE_COLUMN:
+            typed[column] = to_race_date(values)
+        elif column in RANK_COLUMNS:
+            typed[column] = to_rank(values)
+        elif column in SPLIT_COLUMNS:
+            typed[column] = to_seconds(values)
+        else:
+            typed[column] = to_text(values)
+    extra = [column for column in df.columns if column not in RESULT_COLUMNS]
+    return pd.concat([typed, df[extra]], axis=1) if extra else typed
+
+
+def legacy_text(df):
+    """
+    Typed results back to the old all-text layout ("N/A", "h:mm:ss",
+    "2024 - June 09"), e.g. for CSV exports read by older scripts.
+    """
+    df = apply_results_schema(df)
+    text = pd.DataFrame(index=df.index)
+    for column in df.columns:
+        if column == DATE_COLUMN:
+            values = df[column].dt.strftime(RACE_DATE_FORMAT)
+        elif column in SPLIT_COLUMNS:
+            seconds = df[column]
+            values = (
+                (seconds // 3600).astype("string").str.zfill(2) + ":"
+                + (seconds % 3600 // 60).astype("string").str.zfill(2) + ":"
+                + (seconds % 60).astype("string").str.zfill(2)
+            )
+        else:
+            values = df[column].astype("string")
+        text[column] = values.fillna("N/A")
+    return text
+
+
+def write_results_parquet(df, path, compression=PARQUET_COMPRESSION):
+    """
+    Writes results as Parquet with ARROW_SCHEMA (plus any extra columns).
+    """
+    df = apply_results_schema(df)
+    extra = [column for column in df.columns if column not in RESULT_COLUMNS]
+    schema = ARROW_SCHEMA
+    for column in extra:
+        schema = schema.append(pa.field(column, pa.string()))
+    table = pa.Table.from_pandas(
+        df.astype({column: "string" for column in extra}), schema=schema, preserve_index=False
+    )
+    pq.write_table(table, path, compression=compression)
+
+
+_ARROW_TO_PANDAS = {pa.int32(): pd.Int32Dtype(), pa.string(): pd.StringDtype()}
+
+
+def from_arrow(table):
+    """
+    Arrow table written with ARROW_SCHEMA → DataFrame with the fixed
+    pandas dtypes (PANDAS_DTYPES), without parsing any values.
+    """
+    df = table.to_pandas(date_as_object=False, types_mapper=_ARROW_TO_PANDAS.get)
+    if DATE_COLUMN in df:
+        df[DATE_COLUMN] = df[DATE_COLUMN].astype(PANDAS_DTYPES[DATE_COLUMN])
+    return df
+
+
+def read_results(path):
+    """
+    Reads a race results file (.parquet or .csv) into a typed DataFrame.
+    """
+    if os.path.splitext(path)[1] == ".parquet":
+        df = from_arrow(pq.read_table(path))
+    else:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    return apply_results_schema(df)
@@ -0,0 +1,178 @@
+"""
+retry_quarantine.py
+
+────────────────────────────────────────────────────────────────────────────
+🧯 Retry Quarantine with Exponential Backoff
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Keeps failing work out of the way of healthy work. Instead of retrying a
+broken race inline (and stalling the whole run), the scraper hands the
+failure to a RetryQuarantine and moves on:
+
+- a failed item is quarantined and becomes due again after
+  BASE_DELAY_SECONDS × 2^(attempt − 1) (± JITTER, capped at
+  MAX_DELAY_SECONDS)
+- due items are retried between healthy items; the run only waits when
+  nothing but quarantined work is left
+- after MAX_ATTEMPTS failures an item is failed permanently and listed
+  in the failure report (`write_failure_report()`, one CSV row per item
+  with attempts and last error)
+
+Used by the serial, parallel (worker_pool.py) and HTTP engines; the
+shared SQLite queue (work_queue.py) gets the same delays through
+`backoff_delay()`.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import heapq
+import itertools
+import os
+import random
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+# -----------------------
+# Configurable Settings
+# -----------------------
+
+MAX_ATTEMPTS = 4            # Failures before an item is failed permanently
+BASE_DELAY_SECONDS = 30     # Wait before the first retry; doubled on every retry
+MAX_DELAY_SECONDS = 900     # Longest wait between two attempts
+JITTER = 0.2                # ± share of random spread on every delay
+
+
+def backoff_delay(attempt, base=BASE_DELAY_SECONDS, cap=MAX_DELAY_SECONDS, jitter=JITTER):
+    """
+    Seconds to wait after the `attempt`-th failure (1-based).
+    """
+    delay = min(cap, base * 2 ** max(attempt - 1, 0))
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+class RetryQuarantine:
+    """
+    Failed items waiting for their next attempt, plus the items that
+    failed permanently. Items are identified by a hashable key.
+    """
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY_SECONDS, max_delay=MAX_DELAY_SECONDS):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempts = {}      # key → failures so far
+        self.errors = {}        # key → last error
+        self.failed = {}        # key → item, failed permanently
+        self._waiting = []      # heap of (due, order, key, item)
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self._waiting)
+
+    def add(self, key, item, error):
+        """
+        Records a failure. Returns the retry delay in seconds, or None when
+        the item has used up its attempts and failed permanently.
+        """
+        self.attempts[key] = self.attempts.get(key, 0) + 1
+        self.errors[key] = str(error)[:300]
+        if self.attempts[key] >= self.max_attempts:
+            self.failed[key] = item
+            print(f"⛔ Giving up after {self.attempts[key]} attempts: {key}")
+            return None
+        delay = backoff_delay(self.attempts[key], self.base_delay, self.max_delay)
+        heapq.heappush(self._waiting, (time.monotonic() + delay, next(self._order), key, item))
+        print(f"🧯 Quarantined (attempt {self.attempts[key]}), retry in {delay:.0f}s: {key}")
+        return delay
+
+    def pop_due(self):
+        """
+        Returns the next item whose retry time has come, or None.
+        """
+        if self._waiting and self._waiting[0][0] <= time.monotonic():
+            return heapq.heappop(self._waiting)[3]
+        return None
+
+    def pop_all_due(self):
+        due = []
+        item = self.pop_due()
+        while item is not None:
+            due.append(item)
+            item = self.pop_due()
+        return due
+
+    def next_due_in(self):
+        """
+        Seconds until the next quarantined item is due (None if empty).
+        """
+        if not self._waiting:
+            return None
+        return max(0.0, self._waiting[0][0] - time.monotonic())
+
+    # -----------------------
+    # Reporting
+    # -----------------------
+
+    def report(self):
+        recovered = sum(1 for key in self.attempts if key not in self.failed and key not in self._keys_waiting())
+        return (
+            f"🧯 Quarantine: {len(self.attempts)} items failed at least once | "
+            f"recovered {recovered} | still waiting {len(self)} | failed permanently {len(self.failed)}"
+        )
+
+    def _keys_waiting(self):
+        return {entry[2] for entry in self._waiting}
+
+    def write_failure_report(self, path, describe=None):
+        """
+        Writes one CSV row per permanently failed item. `describe(item)`
+        returns the identifying columns (dict) of an item.
+        """
+        rows = [
+            {
+                **(describe(item) if describe else {"Item": str(key)}),
+                "Attempts": self.attempts[key],
+                "Last Error": self.errors[key],
+            }
+            for key, item in self.failed.items()
+        ]
+        write_failure_report(rows, path)
+
+
+def write_failure_report(rows, path):
+    """
+    Writes (or clears) the failure report CSV of the current run.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=["Item", "Attempts", "Last Error"])
+    df.insert(0, "Reported At", datetime.now().isoformat(timespec="seconds"))
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    if rows:
+        print(f"⛔ {len(rows)} permanently failing items listed in {path}")
+
+
+def run_with_quarantine(items, attempt, quarantine, key=lambda item: item, sleep=time.sleep):
+    """
+    Runs `attempt(item)` for every item; it returns None on success or the
+    error. Failed items are quarantined and retried once due, between the
+    remaining fresh items. Returns when every item succeeded or failed
+    permanently.
+    """
+    fresh = deque(items)
+    while fresh or len(quarantine):
+        item = quarantine.pop_due()
+        if item is None:
+            if not fresh:
+                wait = quarantine.next_due_in()
+                print(f"⏳ {len(quarantine)} quarantined items left, next retry in {wait:.0f}s")
+                sleep(wait)
+                continue
+            item = fresh.popleft()
+        error = attempt(item)
+        if error is not None:
+            quarantine.add(key(item), item, error)
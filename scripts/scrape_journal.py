@@ -0,0 +1,163 @@
+"""
+scrape_journal.py
+
+────────────────────────────────────────────────────────────────────────────
+📓 Crash-safe Scraping Journal
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Append-only JSONL journal that commits every finished (race, race date)
+as soon as it completes, so a browser crash or a reboot never loses more
+than the race date that was in progress.
+
+Each line is one of:
+    {"type": "date", "race_url": ..., "race_date": ..., "rows": [...]}
+    {"type": "race", "race_url": ...}        ← all dates of the race saved
+
+On restart the journal is replayed:
+- races with a "race" entry are skipped entirely
+- dates with a "date" entry are skipped, and their rows are reused when
+  the race file is written
+
+Once a race is saved its rows live in its Parquet file, so its "date"
+entries are dropped: the journal is compacted down to the race markers
+plus the dates of races still in progress (on load and after every
+saved race), instead of growing into a second copy of the dataset.
+
+⚠️ Known Notes:
+----------------
+- Every commit is flushed and fsync'ed before the scraper moves on.
+- A half-written last line (crash mid-write) is ignored on load.
+- Compaction writes a temp file and renames it over the journal, so a
+  crash leaves either the old or the compacted journal.
+- Delete the journal file to force a full re-scrape.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+JOURNAL_PATH = "data/results/scrape_journal.jsonl"
+
+
+class ScrapeJournal:
+    """
+    Append-only record of committed race dates and completed races.
+    """
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self.date_entries = {}   # (race_url, race_date) → "date" entry, races in progress only
+        self.race_entries = {}   # race_url → "race" entry
+        self._needs_newline = False
+        self._load()
+
+    # -----------------------
+    # Loading
+    # -----------------------
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                self._needs_newline = f.read(1) != b"\n"
+        stale = False
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn write from a crash
+                if entry.get("type") == "date":
+                    self.date_entries[(entry["race_url"], entry["race_date"])] = entry
+                elif entry.get("type") == "race":
+                    stale |= self._drop_dates(entry["race_url"])
+                    stale |= entry["race_url"] in self.race_entries
+                    self.race_entries[entry["race_url"]] = entry
+        if stale:
+            self._compact()
+
+    def _drop_dates(self, race_url):
+        """
+        Forgets the committed dates of a saved race. Returns True if any.
+        """
+        keys = [key for key in self.date_entries if key[0] == race_url]
+        for key in keys:
+            del self.date_entries[key]
+        return bool(keys)
+
+    def _compact(self):
+        """
+        Rewrites the journal as race markers + dates of unsaved races.
+        """
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in [*self.race_entries.values(), *self.date_entries.values()]:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._needs_newline = False
+
+    # -----------------------
+    # Queries
+    # -----------------------
+
+    def is_race_done(self, race_url):
+        return race_url in self.race_entries
+
+    def is_date_done(self, race_url, race_date):
+        return (race_url, race_date) in self.date_entries
+
+    def committed_rows(self, race_url, race_dates):
+        """
+        Returns the committed rows of a race, ordered like `race_dates`.
+        """
+        rows = []
+        for race_date in race_dates:
+            entry = self.date_entries.get((race_url, race_date))
+            if entry is not None:
+                rows.extend(entry["rows"])
+        return rows
+
+    # -----------------------
+    # Commits
+    # -----------------------
+
+    def _append(self, entry):
+        entry["committed_at"] = datetime.now(timezone.utc).isoformat()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            if self._needs_newline:
+                f.write("\n")  # Start fresh after a torn last line
+                self._needs_newline = False
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def commit_date(self, race_url, race_date, rows):
+        """
+        Durably records all rows of one finished race date.
+        """
+        entry = {"type": "date", "race_url": race_url, "race_date": race_date, "rows": rows}
+        self._append(entry)
+        self.date_entries[(race_url, race_date)] = entry
+
+    def commit_race(self, race_url):
+        """
+        Marks a race as fully scraped and saved, and drops its rows from
+        the journal (they are in the race file now).
+        """
+        entry = {"type": "race", "race_url": race_url}
+        self._append(entry)
+        self.race_entries[race_url] = entry
+        if self._drop_dates(race_url):
+            self._compact()
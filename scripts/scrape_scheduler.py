@@ -0,0 +1,183 @@
+"""
+scrape_scheduler.py
+
+────────────────────────────────────────────────────────────────────────────
+🗂️ Priority Scheduling for Results Refreshes
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Ranks scrape work so the results that actually change are fetched first,
+instead of walking `all_ironman_races.csv` top to bottom. Each race and
+race date gets a priority score from three signals:
+
+- Recency  → how close the race date (from the dropdown) is to today:
+             races from the last few weeks score highest, halving every
+             RECENT_HALF_LIFE_DAYS; editions due in the next
+             UPCOMING_WINDOW_DAYS score too. Before its dates are known,
+             a race is scored by the anniversary of its latest known
+             edition (most races repeat on about the same weekend).
+- Staleness → how long ago the race was last saved successfully (never
+             scraped counts as fully stale)
+- WC        → races that feed a World Championship (WC_RACE_TYPES, plus
+             the WC events themselves) get a bonus
+
+    priority = RECENCY_WEIGHT × recency + STALENESS_WEIGHT × staleness
+             + WC_WEIGHT × feeds_wc
+
+Used by every engine: races are processed in priority order, and the
+shared work queue (work_queue.py) leases race dates by priority.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+from results_schema import RACE_DATE_FORMAT
+
+# -----------------------
+# Configurable Settings
+# -----------------------
+
+WC_RACE_TYPES = ["IRONMAN", "IRONMAN 70.3"]     # Race types that award WC slots
+WC_CATALOG_CSV = "data/urls/all_ironman_races_wc.csv"
+
+RECENT_HALF_LIFE_DAYS = 21      # Recency score halves every N days after race day
+UPCOMING_WINDOW_DAYS = 14       # Editions due within N days count as upcoming
+UPCOMING_SCORE = 0.5            # Recency score of an upcoming edition
+STALE_AFTER_DAYS = 30           # A race saved N days ago counts as fully stale
+
+RECENCY_WEIGHT = 3.0
+STALENESS_WEIGHT = 1.0
+WC_WEIGHT = 1.0
+
+
+def parse_race_date(race_date):
+    """
+    Dropdown text ("2024 - June 09"), ISO text or date → date (None if unknown).
+    """
+    if isinstance(race_date, datetime):
+        return race_date.date()
+    if isinstance(race_date, date):
+        return race_date
+    for fmt in (RACE_DATE_FORMAT, "%Y-%m-%d"):
+        try:
+            return datetime.strptime(str(race_date).strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+class RaceScheduler:
+    """
+    Scores races and race dates; higher scores are scraped first.
+    """
+
+    def __init__(self, wc_urls=(), today=None):
+        self.wc_urls = set(wc_urls)
+        self.today = today or date.today()
+
+    # -----------------------
+    # Signals
+    # -----------------------
+
+    def recency(self, race_date):
+        race_date = parse_race_date(race_date)
+        if race_date is None:
+            return 0.0
+        days = (self.today - race_date).days
+        if days >= 0:
+            return 0.5 ** (days / RECENT_HALF_LIFE_DAYS)
+        return UPCOMING_SCORE if -days <= UPCOMING_WINDOW_DAYS else 0.0
+
+    def anniversary_recency(self, known_dates):
+        """
+        Recency of the edition expected around now, from the latest known
+        edition moved by whole years. Unknown races score 1 (discover them).
+        """
+        known = [d for d in map(parse_race_date, known_dates) if d is not None]
+        if not known:
+            return 1.0
+        latest = max(known)
+        years = round((self.today - latest).days / 365.25)
+        try:
+            expected = latest.replace(year=latest.year + years)
+        except ValueError:  # 29 February
+            expected = latest.replace(year=latest.year + years, day=28)
+        return max(self.recency(latest), self.recency(expected))
+
+    def staleness(self, last_success):
+        if last_success is None:
+            return 1.0
+        # Whole days from `today`, like recency, so scores are reproducible
+        age_days = (self.today - parse_race_date(last_success)).days
+        return min(1.0, max(0.0, age_days / STALE_AFTER_DAYS))
+
+    def feeds_wc(self, race_type, race_url=None):
+        return race_type in WC_RACE_TYPES or race_url in self.wc_urls
+
+    # -----------------------
+    # Priorities
+    # -----------------------
+
+    def _score(self, recency, last_success, race_type, race_url):
+        return round(
+            RECENCY_WEIGHT * recency
+            + STALENESS_WEIGHT * self.staleness(last_success)
+            + WC_WEIGHT * self.feeds_wc(race_type, race_url),
+            4,
+        )
+
+    def race_priority(self, race_type, race_url, known_dates=(), last_success=None):
+        """
+        Priority of a race before its current race dates are known.
+        """
+        return self._score(self.anniversary_recency(known_dates), last_success, race_type, race_url)
+
+    def date_priority(self, race_type, race_url, race_date, last_success=None):
+        """
+        Priority of one race date.
+        """
+        return self._score(self.recency(race_date), last_success, race_type, race_url)
+
+
+# -----------------------
+# Inputs From Disk
+# -----------------------
+
+def load_wc_urls(path=WC_CATALOG_CSV):
+    """
+    URLs of the WC events themselves (if the WC catalog is available).
+    """
+    if not os.path.exists(path):
+        return set()
+    try:
+        return set(pd.read_csv(path, encoding="utf-8-sig")["URL"].dropna().str.strip())
+    except (KeyError, ValueError, pd.errors.ParserError):
+        return set()
+
+
+def last_saved(path):
+    """
+    Modification time of a race's saved results (None if never saved).
+    """
+    return datetime.fromtimestamp(os.path.getmtime(path)) if os.path.exists(path) else None
+
+
+def saved_race_dates(path):
+    """
+    Race dates present in a saved race file (.parquet or .csv).
+    """
+    if not os.path.exists(path):
+        return []
+    try:
+        if path.endswith(".parquet"):
+            dates = pd.read_parquet(path, columns=["Race Date"])["Race Date"]
+        else:
+            dates = pd.read_csv(path, usecols=["Race Date"], dtype=str, encoding="utf-8-sig")["Race Date"]
+    except (KeyError, ValueError, OSError):
+        return []
+    return list(dates.dropna().unique())
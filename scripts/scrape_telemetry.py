@@ -0,0 +1,239 @@
+"""
+scrape_telemetry.py
+
+────────────────────────────────────────────────────────────────────────────
+📈 Scrape Telemetry (JSONL metrics + summary command)
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Records one JSON line per scrape phase so throughput can be tuned from
+data instead of guesses. Each line carries:
+- run_id, phase, race, race_date
+- duration_s, ok, error
+- retries, rows, na_rows (rows with at least one "N/A"), pages, bytes
+  (transferred by the browser; whichever apply to the phase)
+
+Phases written by the scrapers:
+    race, open_race, read_dates, driver_restart, select_date, rows_to_100,
+    scrape_date, grid_read, row_details, row_clicks, next_page, feed_fetch
+
+Telemetry is off until `configure(path)` is called; until then `phase()`
+costs next to nothing.
+
+Functions are instrumented with `@traced("phase")`; code inside a traced
+function adds its counters with `note(retries=...)` / `add(rows=...)`.
+Concurrent asyncio code should use `with phase(...) as metrics:` and set
+fields on `metrics` directly instead.
+
+📊 Summary Command:
+-------------------
+    python scripts/scrape_telemetry.py summary [--metrics PATH] [--top N]
+
+Ranks the slowest races and phases, with retries and rows/sec.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import argparse
+import functools
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+METRICS_PATH = "data/urls/all_ironman_races/scrape_metrics.jsonl"
+
+# Phases that never contain each other, so their durations add up per race
+RACE_PHASES = ["open_race", "read_dates", "select_date", "rows_to_100", "scrape_date", "feed_fetch"]
+
+_state = {"path": None, "run_id": None, "context": {}, "stack": []}
+
+
+# -----------------------
+# Recording
+# -----------------------
+
+def configure(path=METRICS_PATH, run_id=None):
+    """
+    Turns telemetry on, appending to `path`. Returns the run id.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    _state["path"] = path
+    _state["run_id"] = run_id or uuid.uuid4().hex[:12]
+    return _state["run_id"]
+
+
+def set_context(**fields):
+    """
+    Sets fields (e.g. race, race_date) added to every following record.
+    Passing None removes a field.
+    """
+    for key, value in fields.items():
+        if value is None:
+            _state["context"].pop(key, None)
+        else:
+            _state["context"][key] = value
+
+
+def _write(record):
+    with open(_state["path"], "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@contextmanager
+def phase(name, **fields):
+    """
+    Times a block and writes one record for it. The yielded dict can be
+    updated inside the block (retries, rows, na_rows, pages, ...).
+    """
+    metrics = dict(fields)
+    if _state["path"] is None:
+        yield metrics
+        return
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    start = time.perf_counter()
+    ok, error = True, None
+    _state["stack"].append(metrics)
+    try:
+        yield metrics
+    except Exception as e:
+        ok, error = False, str(e)[:200]
+        raise
+    finally:
+        _state["stack"] = [m for m in _state["stack"] if m is not metrics]
+        if metrics.get("error"):
+            ok, error = False, metrics.pop("error")
+        _write({
+            "run_id": _state["run_id"],
+            "phase": name,
+            **_state["context"],
+            **metrics,
+            "started_at": started_at,
+            "duration_s": round(time.perf_counter() - start, 4),
+            "ok": ok,
+            "error": error,
+        })
+
+
+def traced(name):
+    """
+    Decorator: records every call of the function as phase `name`.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def note(**fields):
+    """
+    Sets fields on the innermost running phase.
+    """
+    if _state["stack"]:
+        _state["stack"][-1].update(fields)
+
+
+def add(**counts):
+    """
+    Increments counters on the innermost running phase.
+    """
+    if _state["stack"]:
+        metrics = _state["stack"][-1]
+        for key, value in counts.items():
+            metrics[key] = metrics.get(key, 0) + value
+
+
+def count_na_rows(rows):
+    """
+    Number of rows where at least one field fell back to "N/A".
+    """
+    return sum(1 for row in rows if "N/A" in row.values())
+
+
+# -----------------------
+# Summary
+# -----------------------
+
+def summarize(path=METRICS_PATH, top=10):
+    """
+    Returns a text report of the slowest races and phases.
+    """
+    metrics = pd.read_json(path, lines=True)
+    counters = ["retries", "rows", "na_rows", "pages", "bytes"]
+    for column in counters:
+        if column not in metrics:
+            metrics[column] = 0
+    if "race" not in metrics:
+        metrics["race"] = None
+    metrics[counters] = metrics[counters].fillna(0)
+    is_date = metrics["phase"].isin(["scrape_date", "feed_fetch"])
+
+    by_phase = (
+        metrics.groupby("phase")
+        .agg(
+            calls=("duration_s", "size"),
+            total_s=("duration_s", "sum"),
+            mean_s=("duration_s", "mean"),
+            p95_s=("duration_s", lambda s: s.quantile(0.95)),
+            retries=("retries", "sum"),
+            failures=("ok", lambda s: int((~s.astype(bool)).sum())),
+        )
+        .sort_values("total_s", ascending=False)
+        .round(2)
+    )
+
+    # Race time = its non-nested phases (works for serial and pool runs)
+    races = metrics[metrics["phase"].isin(RACE_PHASES) & metrics["race"].notna()].assign(
+        rows=lambda d: d["rows"].where(is_date, 0),
+        na_rows=lambda d: d["na_rows"].where(is_date, 0),
+    )
+    by_race = (
+        races.groupby("race")
+        .agg(total_s=("duration_s", "sum"), rows=("rows", "sum"), na_rows=("na_rows", "sum"),
+             mb=("bytes", lambda s: s.sum() / 1_000_000))
+        .assign(rows_per_s=lambda d: (d["rows"] / d["total_s"].where(d["total_s"] > 0)).round(1))
+        .sort_values("total_s", ascending=False)
+        .head(top)
+        .round(1)
+    )
+
+    dates = metrics[is_date]
+    total_rows = int(dates["rows"].sum())
+    total_s = float(dates["duration_s"].sum())
+
+    lines = [
+        f"📈 Runs: {metrics['run_id'].nunique()} | records: {len(metrics)}",
+        f"   Rows captured: {total_rows} | N/A rows: {int(dates['na_rows'].sum())} | "
+        f"rows/sec while scraping: {total_rows / total_s if total_s else 0:.1f} | "
+        f"transferred: {metrics['bytes'].sum() / 1_000_000:.1f} MB",
+        "",
+        "⏳ Phases by total time:",
+        by_phase.to_string(),
+        "",
+        f"🐢 Slowest {top} races:",
+        by_race.to_string() if not by_race.empty else "   (no race records)",
+    ]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape telemetry tools.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    summary = subcommands.add_parser("summary", help="Rank the slowest races and phases")
+    summary.add_argument("--metrics", default=METRICS_PATH, help="Metrics JSONL file")
+    summary.add_argument("--top", type=int, default=10, help="Number of races to list")
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        print(summarize(args.metrics, args.top))
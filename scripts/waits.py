@@ -0,0 +1,119 @@
+"""
+waits.py
+
+────────────────────────────────────────────────────────────────────────────
+⏱️ Event-driven Waits for the IRONMAN Scrapers
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Replaces fixed `time.sleep()` calls with waits that return as soon as the
+page has actually changed, each with an explicit timeout:
+
+- wait_until()              → generic WebDriverWait with timing
+- wait_for_grid_change()    → results grid rows / pager text differ from a
+                              snapshot taken before an action
+- wait_for_count_increase() → more elements match a selector than before
+                              (e.g. race cards after "Load More")
+
+Every call is recorded under a call-site name, so `wait_report()` shows
+where the scrape spends its waiting time.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_FREQUENCY = 0.1  # Seconds between checks
+
+# call site → {"calls", "seconds", "timeouts"}
+WAIT_STATS = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "timeouts": 0})
+
+_GRID_SIGNATURE_JS = """
+const rows = document.querySelectorAll("div[role='row'][data-rowindex]");
+const pager = document.querySelector(".MuiTablePagination-displayedRows");
+return {
+    count: rows.length,
+    first: rows.length ? rows[0].textContent : null,
+    last: rows.length ? rows[rows.length - 1].textContent : null,
+    displayed: pager ? pager.textContent : null,
+};
+"""
+
+
+# -----------------------
+# Timing
+# -----------------------
+
+def wait_until(driver, condition, timeout, site):
+    """
+    Waits for `condition(driver)` to return something truthy and returns it.
+    Raises TimeoutException after `timeout` seconds. Time spent is
+    recorded under `site`.
+    """
+    stats = WAIT_STATS[site]
+    stats["calls"] += 1
+    start = time.perf_counter()
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(condition)
+    except TimeoutException:
+        stats["timeouts"] += 1
+        raise
+    finally:
+        stats["seconds"] += time.perf_counter() - start
+
+
+def wait_report():
+    """
+    Returns a table of wait time per call site, slowest first.
+    """
+    lines = ["⏱️ Wait time by call site:"]
+    for site, stats in sorted(WAIT_STATS.items(), key=lambda item: -item[1]["seconds"]):
+        lines.append(
+            f"   {site:<20} {stats['seconds']:8.1f}s  {stats['calls']:6d} calls  {stats['timeouts']:4d} timeouts"
+        )
+    return "\n".join(lines)
+
+
+# -----------------------
+# Results Grid
+# -----------------------
+
+def grid_signature(driver):
+    """
+    Snapshot of the results grid: row count, first/last row text and the
+    "1–25 of 312" pager text.
+    """
+    return driver.execute_script(_GRID_SIGNATURE_JS)
+
+
+def wait_for_grid_change(driver, before, timeout, site):
+    """
+    Waits until the grid has rows and differs from the `before` snapshot.
+    """
+    def changed(d):
+        now = grid_signature(d)
+        return now if now["count"] and now != before else False
+
+    return wait_until(driver, changed, timeout, site)
+
+
+# -----------------------
+# Growing Lists
+# -----------------------
+
+def wait_for_count_increase(driver, css_selector, previous_count, timeout, site):
+    """
+    Waits until more than `previous_count` elements match `css_selector`
+    and returns the new count.
+    """
+    def grown(d):
+        count = len(d.find_elements(By.CSS_SELECTOR, css_selector))
+        return count if count > previous_count else False
+
+    return wait_until(driver, grown, timeout, site)
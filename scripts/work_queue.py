@@ -0,0 +1,466 @@
+"""
+work_queue.py
+
+────────────────────────────────────────────────────────────────────────────
+📬 Lease-based SQLite Work Queue for the Results Scraper
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+A durable queue of scrape work in one local SQLite file, so any number of
+scraper processes (`ironman_results_scraper.py --queue`) can pull work
+from the same catalog without stepping on each other:
+
+- "race" items → open the race and list its race dates (which become
+                 "date" items)
+- "date" items → scrape one (race URL, race date)
+
+Every item moves through:
+
+    pending ──lease──▶ leased ──complete──▶ done
+       ▲                  │
+       └──fail / lease────┤
+          expired         └──fail after MAX_ATTEMPTS──▶ dead
+
+- Leases: a worker owns an item for LEASE_SECONDS; a background heartbeat
+  extends the lease while the work is running
+- A worker that crashes stops heartbeating; its lease expires and the
+  item goes to the next worker
+- Priorities: items are leased highest priority first (scores from
+  scrape_scheduler.py)
+- Retry counts: each lease counts as an attempt; after MAX_ATTEMPTS the
+  item is dead-lettered with its last error
+- Finished race dates store their rows in the same file until their race
+  is saved, and the queue answers the ScrapeJournal questions
+  (is_date_done, committed_rows, …), so RaceDatePlan works on top of it
+  unchanged
+
+📊 Progress (at any time, from any shell):
+------------------------------------------
+    python scripts/work_queue.py status [--queue PATH]
+    python scripts/work_queue.py dead   [--queue PATH]
+    python scripts/work_queue.py requeue-dead [--queue PATH]
+
+⚠️ Known Notes:
+----------------
+- The database runs in WAL mode; leases are taken inside
+  `BEGIN IMMEDIATE` transactions, so two processes never get the same item.
+- SQLite locking is only reliable on a local disk; for several machines,
+  put the file on one host and run the workers there, or use a shared
+  disk with proper locking.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+QUEUE_PATH = "data/results/work_queue.sqlite"
+LEASE_SECONDS = 300         # How long a worker owns an item without a heartbeat
+HEARTBEAT_SECONDS = 60      # How often a running item's lease is extended
+MAX_ATTEMPTS = 3            # Leases per item before it is dead-lettered
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id            INTEGER PRIMARY KEY,
+    kind          TEXT NOT NULL,               -- 'race' or 'date'
+    race_url      TEXT NOT NULL,
+    race_name     TEXT NOT NULL,
+    race_date     TEXT NOT NULL DEFAULT '',    -- '' for race items
+    date_index    INTEGER,
+    state         TEXT NOT NULL DEFAULT 'pending',
+    priority      REAL NOT NULL DEFAULT 0,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    available_at  REAL NOT NULL DEFAULT 0,
+    last_error    TEXT,
+    updated_at    REAL,
+    UNIQUE (race_url, race_date)
+);
+CREATE INDEX IF NOT EXISTS items_by_state ON items (state, priority DESC, id);
+CREATE TABLE IF NOT EXISTS results (
+    race_url     TEXT NOT NULL,
+    race_date    TEXT NOT NULL,
+    rows         TEXT NOT NULL,
+    committed_at REAL NOT NULL,
+    PRIMARY KEY (race_url, race_date)
+);
+CREATE TABLE IF NOT EXISTS races (
+    race_url   TEXT PRIMARY KEY,
+    race_name  TEXT NOT NULL,
+    race_dates TEXT,                           -- JSON list, dropdown order
+    done_at    REAL
+);
+"""
+
+
+class WorkQueue:
+    """
+    SQLite-backed work queue with leases, heartbeats, retry counts and a
+    dead-letter state. Also usable as the scraper's journal.
+    """
+
+    def __init__(self, path=QUEUE_PATH, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Runs several reads against one consistent view of the queue, even
+        while other processes write to it (WAL keeps the view).
+        """
+        self.db.execute("BEGIN")
+        try:
+            yield self.db
+        finally:
+            self.db.execute("COMMIT")
+
+    # -----------------------
+    # Producing Work
+    # -----------------------
+
+    def enqueue_race(self, race_name, race_url, priority=0, reset=False):
+        """
+        Adds a race item. An existing item is left alone unless `reset`,
+        which puts it (and the race) back to pending.
+        """
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR IGNORE INTO items (kind, race_url, race_name, priority, updated_at) "
+                "VALUES ('race', ?, ?, ?, ?)",
+                (race_url, race_name, priority, time.time()),
+            )
+            db.execute(
+                "INSERT OR IGNORE INTO races (race_url, race_name) VALUES (?, ?)", (race_url, race_name)
+            )
+            db.execute(
+                "UPDATE items SET priority = ? WHERE race_url = ? AND kind = 'race' AND state = 'pending'",
+                (priority, race_url),
+            )
+            if reset:
+                self._reset(db, "race_url = ? AND kind = 'race'", (race_url,))
+                db.execute("UPDATE races SET done_at = NULL WHERE race_url = ?", (race_url,))
+
+    def add_race_dates(self, race_item, race_dates, wanted, reset_dates=(), priorities=None):
+        """
+        Records a race's dropdown dates and adds a date item for every date
+        with `wanted[i]` true. Dates that are already queued keep their
+        state, except those in `reset_dates` (e.g. invalidated dates) and
+        done dates whose rows left the queue when their race was saved.
+        """
+        now = time.time()
+        priorities = priorities or [race_item["priority"]] * len(race_dates)
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE races SET race_dates = ? WHERE race_url = ?",
+                (json.dumps(race_dates), race_item["race_url"]),
+            )
+            for date_index, (race_date, want, priority) in enumerate(zip(race_dates, wanted, priorities)):
+                if not want:
+                    continue
+                db.execute(
+                    "INSERT OR IGNORE INTO items "
+                    "(kind, race_url, race_name, race_date, date_index, priority, updated_at) "
+                    "VALUES ('date', ?, ?, ?, ?, ?, ?)",
+                    (race_item["race_url"], race_item["race_name"], race_date, date_index, priority, now),
+                )
+                # Dropdown order (and priority) may have changed since the item was queued
+                db.execute(
+                    "UPDATE items SET date_index = ?, priority = ? WHERE race_url = ? AND race_date = ?",
+                    (date_index, priority, race_item["race_url"], race_date),
+                )
+                if race_date in reset_dates:
+                    self._reset(db, "race_url = ? AND race_date = ?", (race_item["race_url"], race_date))
+                else:
+                    self._reset(
+                        db,
+                        "race_url = ? AND race_date = ? AND state = 'done' AND NOT EXISTS "
+                        "(SELECT 1 FROM results WHERE results.race_url = items.race_url "
+                        "AND results.race_date = items.race_date)",
+                        (race_item["race_url"], race_date),
+                    )
+
+    def _reset(self, db, where, params):
+        db.execute(
+            "UPDATE items SET state = 'pending', attempts = 0, lease_owner = NULL, lease_expires = NULL, "
+            f"available_at = 0, last_error = NULL, updated_at = ? WHERE {where} AND state != 'leased'",
+            (time.time(), *params),
+        )
+
+    # -----------------------
+    # Consuming Work
+    # -----------------------
+
+    def lease(self, worker_id):
+        """
+        Leases the highest-priority ready item to `worker_id` and returns it
+        as a dict, or None when nothing is ready right now.
+        """
+        while True:
+            now = time.time()
+            with self._transaction() as db:
+                item = db.execute(
+                    "SELECT * FROM items WHERE (state = 'pending' AND available_at <= ?) "
+                    "OR (state = 'leased' AND lease_expires < ?) "
+                    "ORDER BY priority DESC, id LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if item is None:
+                    return None
+                if item["state"] == "leased" and item["attempts"] >= self.max_attempts:
+                    # Its worker died on the last allowed attempt
+                    db.execute(
+                        "UPDATE items SET state = 'dead', lease_owner = NULL, last_error = ?, updated_at = ? "
+                        "WHERE id = ?",
+                        (f"lease expired ({item['lease_owner']})", now, item["id"]),
+                    )
+                    continue
+                db.execute(
+                    "UPDATE items SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, now, item["id"]),
+                )
+                item = dict(item)
+                item["attempts"] += 1
+                return item
+
+    def heartbeat(self, item, worker_id):
+        """
+        Extends the lease. Returns False if the worker no longer owns it.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, now, item["id"], worker_id),
+            )
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def keep_alive(self, item, worker_id, interval=HEARTBEAT_SECONDS):
+        """
+        Heartbeats `item` from a background thread while the block runs.
+        """
+        stop = threading.Event()
+
+        def beat():
+            queue = WorkQueue(self.path, self.lease_seconds, self.max_attempts)  # Own connection
+            while not stop.wait(interval):
+                if not queue.heartbeat(item, worker_id):
+                    break
+            queue.db.close()
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, item, worker_id, rows=None):
+        """
+        Marks an item done; for date items, stores its rows in the same
+        transaction. Returns False (and stores nothing) when the worker
+        lost its lease, e.g. it expired and the item went to another worker.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET state = 'done', lease_owner = NULL, lease_expires = NULL, "
+                "last_error = NULL, updated_at = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (now, item["id"], worker_id),
+            )
+            if cursor.rowcount != 1:
+                return False
+            if item["kind"] == "date":
+                db.execute(
+                    "INSERT OR REPLACE INTO results (race_url, race_date, rows, committed_at) VALUES (?, ?, ?, ?)",
+                    (item["race_url"], item["race_date"], json.dumps(rows or [], ensure_ascii=False), now),
+                )
+        return True
+
+    def fail(self, item, worker_id, error, retry_delay=0):
+        """
+        Returns a failed item to pending (available again after
+        `retry_delay` seconds), or dead-letters it once it has used up its
+        attempts. Returns the new state.
+        """
+        now = time.time()
+        state = "dead" if item["attempts"] >= self.max_attempts else "pending"
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE items SET state = ?, lease_owner = NULL, lease_expires = NULL, "
+                "available_at = ?, last_error = ?, updated_at = ? WHERE id = ? AND lease_owner = ?",
+                (state, now + retry_delay, str(error)[:500], now, item["id"], worker_id),
+            )
+        return state
+
+    # -----------------------
+    # Race Completion
+    # -----------------------
+
+    def race_dates(self, race_url):
+        row = self.db.execute("SELECT race_dates FROM races WHERE race_url = ?", (race_url,)).fetchone()
+        return json.loads(row["race_dates"]) if row and row["race_dates"] else []
+
+    def race_status(self, race_url):
+        """
+        Returns {"settled": bool, "dead": int, "race_dead": bool}. A race is
+        settled once its race item is done (or dead) and none of its date
+        items are pending or leased; "race_dead" means its race dates were
+        never listed.
+        """
+        counts = dict(self.db.execute(
+            "SELECT state, COUNT(*) FROM items WHERE race_url = ? GROUP BY state", (race_url,)
+        ).fetchall())
+        race_item = self.db.execute(
+            "SELECT state FROM items WHERE race_url = ? AND kind = 'race'", (race_url,)
+        ).fetchone()
+        settled = (
+            race_item is not None and race_item["state"] in ("done", "dead")
+            and not counts.get("pending") and not counts.get("leased")
+        )
+        return {
+            "settled": settled,
+            "dead": counts.get("dead", 0),
+            "race_dead": race_item is not None and race_item["state"] == "dead",
+        }
+
+    def is_drained(self):
+        """
+        True when no item is pending or leased.
+        """
+        row = self.db.execute(
+            "SELECT COUNT(*) FROM items WHERE state IN ('pending', 'leased')"
+        ).fetchone()
+        return row[0] == 0
+
+    # -----------------------
+    # Journal Interface (used by RaceDatePlan)
+    # -----------------------
+
+    def is_race_done(self, race_url):
+        row = self.db.execute("SELECT done_at FROM races WHERE race_url = ?", (race_url,)).fetchone()
+        return bool(row and row["done_at"])
+
+    def is_date_done(self, race_url, race_date):
+        row = self.db.execute(
+            "SELECT 1 FROM results WHERE race_url = ? AND race_date = ?", (race_url, race_date)
+        ).fetchone()
+        return row is not None
+
+    def committed_rows(self, race_url, race_dates):
+        """
+        Returns the committed rows of a race, ordered like `race_dates`.
+        """
+        rows = []
+        for race_date in race_dates:
+            row = self.db.execute(
+                "SELECT rows FROM results WHERE race_url = ? AND race_date = ?", (race_url, race_date)
+            ).fetchone()
+            if row:
+                rows.extend(json.loads(row["rows"]))
+        return rows
+
+    def commit_date(self, race_url, race_date, rows):
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO results (race_url, race_date, rows, committed_at) VALUES (?, ?, ?, ?)",
+                (race_url, race_date, json.dumps(rows, ensure_ascii=False), time.time()),
+            )
+
+    def commit_race(self, race_url):
+        """
+        Marks a race as fully scraped and saved, and drops its rows from
+        the queue (they are in the race file now).
+        """
+        with self._transaction() as db:
+            db.execute("UPDATE races SET done_at = ? WHERE race_url = ?", (time.time(), race_url))
+            db.execute("DELETE FROM results WHERE race_url = ?", (race_url,))
+
+    # -----------------------
+    # Progress
+    # -----------------------
+
+    def progress(self):
+        """
+        Returns {(kind, state): count}.
+        """
+        return {
+            (row["kind"], row["state"]): row["n"]
+            for row in self.db.execute("SELECT kind, state, COUNT(*) AS n FROM items GROUP BY kind, state")
+        }
+
+    def status_report(self):
+        counts = self.progress()
+        states = ["pending", "leased", "done", "dead"]
+        lines = [f"📬 Work queue: {self.path}", f"   {'':6} " + "".join(f"{s:>9}" for s in states)]
+        for kind in ["race", "date"]:
+            lines.append(f"   {kind:6} " + "".join(f"{counts.get((kind, s), 0):>9}" for s in states))
+        now = time.time()
+        for row in self.db.execute(
+            "SELECT race_name, race_date, lease_owner, lease_expires FROM items WHERE state = 'leased' ORDER BY id"
+        ):
+            lines.append(
+                f"   ⏳ {row['race_name']} {row['race_date']} → {row['lease_owner']} "
+                f"(lease {row['lease_expires'] - now:+.0f}s)"
+            )
+        races_done = self.db.execute("SELECT COUNT(*) FROM races WHERE done_at IS NOT NULL").fetchone()[0]
+        lines.append(f"   🏁 Races saved: {races_done}")
+        return "\n".join(lines)
+
+    def dead_items(self):
+        return [dict(row) for row in self.db.execute("SELECT * FROM items WHERE state = 'dead' ORDER BY id")]
+
+    def requeue_dead(self):
+        """
+        Puts every dead item back to pending with fresh attempts.
+        """
+        with self._transaction() as db:
+            dead = db.execute("SELECT COUNT(*) FROM items WHERE state = 'dead'").fetchone()[0]
+            self._reset(db, "state = 'dead'", ())
+        return dead
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the scraper work queue.")
+    parser.add_argument("command", choices=["status", "dead", "requeue-dead"])
+    parser.add_argument("--queue", default=QUEUE_PATH, help="Queue database")
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.queue)
+    if args.command == "status":
+        print(queue.status_report())
+    elif args.command == "dead":
+        for item in queue.dead_items():
+            print(f"💀 {item['race_name']} {item['race_date']} ({item['attempts']} attempts): {item['last_error']}")
+    else:
+        print(f"♻️ Requeued {queue.requeue_dead()} dead items")
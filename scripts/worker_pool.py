@@ -0,0 +1,293 @@
+"""
+worker_pool.py
+
+────────────────────────────────────────────────────────────────────────────
+🧵 Parallel Browser Worker Pool for the Results Scraper
+────────────────────────────────────────────────────────────────────────────
+
+🔍 What It Does:
+---------------
+Spreads scraping work across N headless-browser worker processes that all
+pull from one shared work queue:
+
+1. "race" items  → a worker opens the race and reads its race dates
+2. "date" items  → a worker scrapes one (race URL, race date)
+
+The parent process is the only one that touches the journal and the
+output files, so every finished date is committed once, and each race is
+written as one merged file ordered like its date dropdown. Which dates
+are scraped is decided by the race's RaceDatePlan (journal, incremental
+mode).
+
+🛡️ Failure Isolation:
+---------------------
+- An exception inside a worker fails only that item; the worker keeps
+  its warm browser unless its DriverRecycler (memory / error rate) says
+  it needs a restart.
+- A worker process that dies outright is replaced by a process with a
+  new worker id, and the item it was holding goes back on the queue
+  (also when its "start" message is only read after the death was
+  noticed). Items are settled by item id, so a late result for an item
+  that was already requeued never settles it twice.
+- A failed item goes to the retry quarantine (retry_quarantine.py) and
+  is handed out again after an exponential backoff, while the workers
+  carry on with healthy items. After MAX_ITEM_ATTEMPTS failures it is
+  failed permanently. A race with failed dates is saved but not marked
+  done in the journal, so the next run retries just those dates.
+
+⚠️ Known Notes:
+----------------
+- Speed-up is close to linear until the remote host starts throttling;
+  keep NUM_WORKERS at a polite level.
+- Workers are started with the "spawn" method, so the calling script must
+  keep its run logic under `if __name__ == "__main__":`.
+
+────────────────────────────────────────────────────────────────────────────
+"""
+
+import itertools
+import multiprocessing as mp
+import queue
+
+from browser_profile import transfer_report
+from results_browser import (
+    DriverRecycler, open_results_page, read_race_dates, scrape_race_date, start_driver,
+)
+from retry_quarantine import RetryQuarantine
+from scrape_telemetry import configure, set_context
+from waits import wait_report
+
+MAX_ITEM_ATTEMPTS = 3
+RESULT_POLL_SECONDS = 5
+
+
+# -----------------------
+# Worker Process
+# -----------------------
+
+def _worker_main(worker_id, task_queue, result_queue, options, recycler_settings, telemetry=None):
+    """
+    Pulls items until it receives None. Each worker owns one warm browser.
+    """
+    if telemetry:
+        configure(**telemetry)
+        set_context(worker=worker_id)
+    recycler = DriverRecycler(**recycler_settings)
+    driver = None
+    while True:
+        item = task_queue.get()
+        if item is None:
+            break
+        result_queue.put(("start", worker_id, item, None))
+        set_context(race=item["race_name"], race_date=item.get("race_date"))
+        try:
+            if driver is None:
+                driver = start_driver()
+            else:
+                driver, _ = recycler.maybe_recycle(driver)
+            if item["kind"] == "race":
+                open_results_page(driver, item["race_url"])
+                result_queue.put(("dates", worker_id, item, read_race_dates(driver)))
+            else:
+                race_date_text, rows = scrape_race_date(
+                    driver, item["race_url"], item["race_name"], item["date_index"], **options
+                )
+                if race_date_text != item["race_date"]:
+                    # Dropdown order changed since the race dates were listed
+                    raise RuntimeError(f"Dropdown shows '{race_date_text}', expected '{item['race_date']}'")
+                result_queue.put(("rows", worker_id, item, rows))
+            recycler.record(True)
+        except Exception as e:
+            recycler.record(False)
+            result_queue.put(("error", worker_id, item, str(e)[:200]))
+    if driver is not None:
+        driver.quit()
+    print(f"Worker {worker_id}: {recycler.report()}")
+    print(transfer_report())
+    print(wait_report())
+
+
+# -----------------------
+# Scheduler
+# -----------------------
+
+class _RaceState:
+    """
+    Progress of one race inside the pool run.
+    """
+
+    def __init__(self, race_name, race_url, plan):
+        self.race_name = race_name
+        self.race_url = race_url
+        self.plan = plan
+        self.race_dates = None
+        self.pending = set()
+        self.failed = set()
+
+
+def run_worker_pool(races, journal, save_race, plan_for, recycler_settings, num_workers=4, options=None,
+                    telemetry=None, quarantine=None):
+    """
+    Scrapes `races` ([(race_name, race_url), ...]) with `num_workers`
+    browser processes.
+
+    - journal:   ScrapeJournal; finished dates are committed as they arrive
+    - save_race: callback(race_name, rows) that writes one race's output
+    - plan_for:  callback(race_name, race_url) returning the race's
+                 RaceDatePlan (which dates to scrape, how to merge output)
+    - recycler_settings: keyword arguments for each worker's DriverRecycler
+                 (max_rss_mb, max_error_rate, error_window)
+    - options:   keyword arguments for results_browser.scrape_race_date
+                 (rows_to_100, batch, paginate, archive)
+    - telemetry: keyword arguments for scrape_telemetry.configure (path,
+                 run_id), so workers append to the run's metrics file
+    - quarantine: RetryQuarantine for failed items (keyed by
+                 (race_url, kind, date_index)); its permanent failures
+                 can be reported by the caller afterwards
+
+    Returns the list of race URLs that still have failed dates.
+    """
+    ctx = mp.get_context("spawn")
+    task_queue = ctx.Queue()
+    result_queue = ctx.Queue()
+    options = options or {}
+
+    states = {
+        race_url: _RaceState(race_name, race_url, plan_for(race_name, race_url))
+        for race_name, race_url in races
+    }
+    if quarantine is None:
+        quarantine = RetryQuarantine(max_attempts=MAX_ITEM_ATTEMPTS)
+    in_flight = {}              # worker id → item it is working on
+    dead_workers = set()        # ids of worker processes that died
+    settled_items = set()       # item ids that are finished (done or failed for good)
+    item_ids = itertools.count()
+    worker_ids = itertools.count()  # Never reused, so a dead worker's messages stay its own
+    outstanding = 0
+
+    def submit(item):
+        nonlocal outstanding
+        item["item_id"] = next(item_ids)
+        task_queue.put(item)
+        outstanding += 1
+
+    def start_worker(worker_id):
+        process = ctx.Process(
+            target=_worker_main,
+            args=(worker_id, task_queue, result_queue, options, recycler_settings, telemetry),
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def finish_race(state):
+        rows = state.plan.race_rows(state.race_dates or [])
+        if rows:
+            save_race(state.race_name, rows)
+        if state.failed:
+            print(f"⚠️ {state.race_name}: {len(state.failed)} items failed, will retry next run")
+        else:
+            journal.commit_race(state.race_url)
+
+    def settle(item):
+        """
+        Marks an item as no longer outstanding; closes its race if complete.
+        """
+        nonlocal outstanding
+        if item["item_id"] in settled_items:
+            return
+        settled_items.add(item["item_id"])
+        outstanding -= 1
+        state = states[item["race_url"]]
+        if item["kind"] == "date":
+            state.pending.discard(item["date_index"])
+        if state.race_dates is not None and not state.pending:
+            finish_race(state)
+
+    def fail_or_retry(item, message):
+        if item["item_id"] in settled_items:
+            return  # A copy of it already finished
+        key = (item["race_url"], item["kind"], item.get("date_index"))
+        print(f"⚠️ {item['race_name']} ({item['kind']} {item.get('date_index', '')}): {message[:100]}")
+        if quarantine.add(key, item, message) is not None:
+            return  # Still outstanding, handed out again once its backoff is over
+        state = states[item["race_url"]]
+        if item["kind"] == "date":
+            state.failed.add(item["date_index"])
+        else:
+            state.race_dates = []
+            state.failed.add("race dates")
+        settle(item)
+
+    for race_name, race_url in races:
+        submit({"kind": "race", "race_name": race_name, "race_url": race_url})
+
+    workers = {}
+    for _ in range(num_workers):
+        worker_id = next(worker_ids)
+        workers[worker_id] = start_worker(worker_id)
+    print(f"🧵 Started {num_workers} browser workers for {len(races)} races.")
+
+    while outstanding > 0:
+        # Quarantined items whose backoff is over go back on the queue
+        for item in quarantine.pop_all_due():
+            task_queue.put(item)
+
+        # Replace crashed workers and requeue what they were holding
+        for worker_id, process in list(workers.items()):
+            if not process.is_alive():
+                del workers[worker_id]
+                dead_workers.add(worker_id)
+                lost = in_flight.pop(worker_id, None)
+                new_id = next(worker_ids)
+                print(f"💥 Worker {worker_id} died, starting worker {new_id}.")
+                workers[new_id] = start_worker(new_id)
+                if lost is not None:
+                    fail_or_retry(lost, "worker process died")
+
+        try:
+            next_due = quarantine.next_due_in()
+            timeout = RESULT_POLL_SECONDS if next_due is None else min(RESULT_POLL_SECONDS, next_due + 0.01)
+            message, worker_id, item, payload = result_queue.get(timeout=timeout)
+        except queue.Empty:
+            continue
+
+        if message == "start":
+            if worker_id in dead_workers:
+                fail_or_retry(item, "worker process died")  # Its start was still queued when it died
+            else:
+                in_flight[worker_id] = item
+            continue
+        in_flight.pop(worker_id, None)
+        if item["item_id"] in settled_items:
+            continue  # Late result of a requeued item that already finished
+        state = states[item["race_url"]]
+
+        if message == "dates":
+            state.race_dates = payload
+            print(f"🗓️ {state.race_name}: found {len(payload)} race dates.")
+            for date_index, race_date in enumerate(payload):
+                if state.plan.should_scrape(race_date):
+                    state.pending.add(date_index)
+                    submit({
+                        "kind": "date", "race_name": state.race_name,
+                        "race_url": state.race_url, "date_index": date_index,
+                        "race_date": race_date,
+                    })
+            settle(item)
+
+        elif message == "rows":
+            race_date = state.race_dates[item["date_index"]]
+            journal.commit_date(state.race_url, race_date, payload)
+            print(f"✅ {state.race_name} | {race_date}: {len(payload)} rows")
+            settle(item)
+
+        elif message == "error":
+            fail_or_retry(item, payload)
+
+    for _ in workers:
+        task_queue.put(None)
+    for process in workers.values():
+        process.join(timeout=30)
+
+    return [state.race_url for state in states.values() if state.failed]
@@ -0,0 +1,24 @@
+"""
+Stand-in for worker_pool._worker_main: no browser, fixed race dates and
+rows, and a worker that dies on its second date item (once per run).
+"""
+
+import os
+
+
+def worker_main(worker_id, task_queue, result_queue, options, recycler_settings, telemetry=None):
+    while True:
+        item = task_queue.get()
+        if item is None:
+            break
+        result_queue.put(("start", worker_id, item, None))
+        if item["kind"] == "race":
+            result_queue.put(("dates", worker_id, item, options["race_dates"]))
+            continue
+        if item["date_index"] == 1 and not os.path.exists(options["died_flag"]):
+            open(options["died_flag"], "w").close()
+            result_queue.close()
+            result_queue.join_thread()  # The "start" is on its way; then die without a word
+            os._exit(1)
+        rows = [{"Race Name": item["race_name"], "Race Date": item["race_date"], "Athlete": "A"}]
+        result_queue.put(("rows", worker_id, item, rows))
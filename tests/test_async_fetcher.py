@@ -0,0 +1,147 @@
+"""
+Offline checks for async_fetcher.py, against a local aiohttp server.
+"""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from async_fetcher import AsyncFetcher, HTTPStatusError, TokenBucket
+
+
+async def serve(routes, check):
+    """
+    Runs `check(base_url)` against a local aiohttp server with `routes`
+    ({path: handler}).
+    """
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_get(path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        return await check(f"http://127.0.0.1:{port}")
+    finally:
+        await runner.cleanup()
+
+
+def fast_fetcher(**settings):
+    return AsyncFetcher(**{"rate_per_host": 1000, "burst": 1000, "backoff_base": 0.01, **settings})
+
+
+def test_fetcher_retries_transient_statuses():
+    calls = []
+
+    async def flaky(request):
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            return web.Response(status=503)
+        return web.Response(body=b"ok")
+
+    async def check(base_url):
+        async with fast_fetcher(max_retries=4) as fetcher:
+            return await fetcher.get(f"{base_url}/feed"), fetcher.retries
+
+    body, retries = asyncio.run(serve({"/feed": flaky}, check))
+    assert body == b"ok"
+    assert retries == 2 and len(calls) == 3
+
+
+def test_fetcher_honours_retry_after():
+    calls = []
+
+    async def limited(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0.3"})
+        return web.Response(body=b"ok")
+
+    async def check(base_url):
+        async with fast_fetcher() as fetcher:
+            return await fetcher.get(f"{base_url}/feed")
+
+    assert asyncio.run(serve({"/feed": limited}, check)) == b"ok"
+    assert calls[1] - calls[0] >= 0.3
+
+
+def test_fetcher_does_not_retry_client_errors():
+    calls = []
+
+    async def missing(request):
+        calls.append(request.path)
+        return web.Response(status=404)
+
+    async def check(base_url):
+        async with fast_fetcher(max_retries=4) as fetcher:
+            with pytest.raises(HTTPStatusError) as error:
+                await fetcher.get(f"{base_url}/gone")
+            return error.value.status
+
+    assert asyncio.run(serve({"/gone": missing}, check)) == 404
+    assert calls == ["/gone"]
+
+
+def test_fetcher_gives_up_after_max_retries():
+    async def broken(request):
+        return web.Response(status=500)
+
+    async def check(base_url):
+        async with fast_fetcher(max_retries=2) as fetcher:
+            with pytest.raises(HTTPStatusError):
+                await fetcher.get(f"{base_url}/feed")
+            return fetcher.requests
+
+    assert asyncio.run(serve({"/feed": broken}, check)) == 3
+
+
+def test_fetcher_rate_limits_each_host():
+    async def ok(request):
+        return web.Response(body=b"ok")
+
+    async def check(base_url):
+        async with AsyncFetcher(rate_per_host=20, burst=2) as fetcher:
+            started = time.monotonic()
+            await asyncio.gather(*[fetcher.get(f"{base_url}/feed") for _ in range(6)])
+            return time.monotonic() - started
+
+    # 2 requests from the burst, the other 4 at 20 per second
+    assert asyncio.run(serve({"/feed": ok}, check)) >= 4 / 20 - 0.02
+
+
+def test_token_bucket_allows_a_burst_then_refills_at_rate():
+    async def take(count):
+        bucket = TokenBucket(rate=10, capacity=3)
+        started = time.monotonic()
+        waits = []
+        for _ in range(count):
+            await bucket.acquire()
+            waits.append(time.monotonic() - started)
+        return waits
+
+    waits = asyncio.run(take(5))
+    assert waits[2] < 0.05                  # The burst is free
+    assert waits[4] >= 2 / 10 - 0.02        # Then one token every 1/rate seconds
+
+
+def test_fetcher_caps_requests_in_flight():
+    in_flight = []
+    peak = []
+
+    async def slow(request):
+        in_flight.append(request.path)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.05)
+        in_flight.pop()
+        return web.Response(body=b"ok")
+
+    async def check(base_url):
+        async with fast_fetcher(concurrency=3) as fetcher:
+            return await asyncio.gather(*[fetcher.get(f"{base_url}/feed/{i}") for i in range(10)])
+
+    assert asyncio.run(serve({"/feed/{i}": slow}, check)) == [b"ok"] * 10
+    assert max(peak) == 3
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from catalog_sync import changed_urls, diff_catalogs, sync_catalog
+
+
+def catalog(*rows):
+    return pd.DataFrame(
+        [dict(zip(["Race Name", "URL", "Race Type", "Location", "Swim", "Bike", "Run"], row)) for row in rows]
+    )
+
+
+CAIRNS = ("IRONMAN Cairns", "u1", "IRONMAN", "Cairns, Australia", "3.8 km", "180 km", "42.2 km")
+KONA = ("IRONMAN World Championship", "u2", "IRONMAN", "Kona, Hawaii", "3.8 km", "180 km", "42.2 km")
+
+
+def test_diff_catalogs_reports_each_kind_of_change():
+    renamed = ("IRONMAN Cairns Asia-Pacific", *CAIRNS[1:5], "185 km", CAIRNS[6])
+    changes = diff_catalogs(catalog(CAIRNS, KONA), catalog(renamed))
+
+    kinds = sorted((change["Change"], change.get("Field")) for change in changes)
+    assert kinds == [("course_changed", "Bike"), ("removed", None), ("renamed", "Race Name")]
+
+
+def test_changed_urls_follow_the_latest_sync(tmp_path):
+    paths = {"catalog_path": tmp_path / "races.csv", "changelog_path": tmp_path / "changes.csv"}
+
+    sync_catalog(catalog(CAIRNS), **paths)
+    assert changed_urls(paths["changelog_path"]) == {"u1"}
+
+    sync_catalog(catalog(CAIRNS, KONA), **paths)
+    assert changed_urls(paths["changelog_path"]) == {"u2"}
+
+    # A sync without changes is still the latest sync
+    assert sync_catalog(catalog(CAIRNS, KONA), **paths) == []
+    assert changed_urls(paths["changelog_path"]) == set()
+
+
+def test_changed_urls_without_a_log(tmp_path):
+    assert changed_urls(tmp_path / "missing.csv") == set()
@@ -0,0 +1,105 @@
+import json
+import os
+
+import pandas as pd
+
+import combine_race_results
+from combine_race_results import (
+    CombineStore, combine_csvs_from_directory, race_files, write_csv_stream, write_parquet_stream,
+)
+from results_schema import write_results_parquet
+
+HEADER = "Race Name,Race Date,Athlete,Overall Rank,Designation,Finish Time\n"
+
+
+def race_csv(directory, name, *athletes):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(HEADER + "".join(f"{name},2024 - June 09,{a},1,Finisher,10:00:00\n" for a in athletes))
+    return path
+
+
+def test_race_files_prefer_parquet_over_its_legacy_csv(tmp_path):
+    race_csv(tmp_path, "IM_A", "Ann")
+    race_csv(tmp_path, "IM_B", "Bo")
+    write_results_parquet(pd.DataFrame({"Race Name": ["IM_A"], "Athlete": ["Ann"]}), str(tmp_path / "IM_A.parquet"))
+
+    assert sorted(os.path.basename(path) for path in race_files(str(tmp_path))) == ["IM_A.parquet", "IM_B.csv"]
+
+
+def test_combined_directory_is_typed(tmp_path):
+    race_csv(tmp_path, "IM_A", "Ann", "Bo")
+    race_csv(tmp_path, "IM_B", "Cy")
+
+    combined = combine_csvs_from_directory(str(tmp_path), workers=1)
+
+    assert sorted(combined["Athlete"]) == ["Ann", "Bo", "Cy"]
+    assert combined["Finish Time"].dtype == "Int32" and combined["Finish Time"].tolist() == [36000] * 3
+
+
+def test_sync_only_reparses_changed_inputs(tmp_path, monkeypatch):
+    races = tmp_path / "races"
+    race_csv(races, "IM_A", "Ann")
+    race_csv(races, "IM_B", "Bo")
+    store = CombineStore(str(tmp_path / "store"))
+    assert store.sync("races", str(races), workers=1) == {"added": ["IM_A.csv", "IM_B.csv"], "changed": [], "removed": []}
+
+    parsed = []
+    original = combine_race_results._parse_to_part
+    monkeypatch.setattr(combine_race_results, "_parse_to_part", lambda job: parsed.append(job) or original(job))
+
+    race_csv(races, "IM_B", "Bo", "Bea")
+    race_csv(races, "IM_C", "Cy")
+    os.remove(races / "IM_A.csv")
+    store = CombineStore(str(tmp_path / "store"))
+    changes = store.sync("races", str(races), workers=1)
+
+    assert changes == {"added": ["IM_C.csv"], "changed": ["IM_B.csv"], "removed": ["IM_A.csv"]}
+    assert len(parsed) == 2
+    assert sorted(store.load("races")["Athlete"]) == ["Bea", "Bo", "Cy"]
+    assert sorted(os.listdir(tmp_path / "store" / "wc=false")) == ["IM_B.csv.parquet", "IM_C.csv.parquet"]
+
+
+def test_touched_file_is_not_reparsed(tmp_path, monkeypatch):
+    races = tmp_path / "races"
+    race_csv(races, "IM_A", "Ann")
+    store = CombineStore(str(tmp_path / "store"))
+    store.sync("races", str(races), workers=1)
+    monkeypatch.setattr(combine_race_results, "_parse_to_part", None)  # Any parse would fail
+
+    os.utime(races / "IM_A.csv", ns=(1, 1))   # New mtime, same content: hashed only
+
+    assert store.sync("races", str(races), workers=1) == {"added": [], "changed": [], "removed": []}
+
+
+def test_older_part_format_rebuilds_and_prunes(tmp_path):
+    races = tmp_path / "races"
+    race_csv(races, "IM_A", "Ann")
+    store_dir = tmp_path / "store"
+    os.makedirs(store_dir / "wc=false")
+    (store_dir / "wc=false" / "IM_gone.csv.parquet").write_bytes(b"old")
+    (store_dir / "_manifest.json").write_text(json.dumps({"format": 1, "groups": {}}))
+
+    store = CombineStore(str(store_dir))
+    assert store.rebuilt
+    store.sync("races", str(races), workers=1)
+
+    assert os.listdir(store_dir / "wc=false") == ["IM_A.csv.parquet"]
+
+
+def test_views_and_streamed_exports(tmp_path):
+    race_csv(tmp_path / "races", "IM_A", "Ann", "Bo")
+    race_csv(tmp_path / "wc", "IM_WC", "Cy")
+    store = CombineStore(str(tmp_path / "store"))
+    store.sync("races", str(tmp_path / "races"), workers=1)
+    store.sync("wc", str(tmp_path / "wc"), workers=1)
+
+    both = store.view("both", wc_flag=True)
+    assert both[["Athlete", "WC"]].values.tolist() == [["Ann", False], ["Bo", False], ["Cy", True]]
+
+    parts = store.view_parts("both")
+    assert write_parquet_stream(parts, str(tmp_path / "all.parquet"), memory_limit_mb=0) == 3
+    assert pd.read_parquet(tmp_path / "all.parquet")["Athlete"].tolist() == ["Ann", "Bo", "Cy"]
+    assert write_csv_stream(parts, str(tmp_path / "all.csv"), memory_limit_mb=0) == 3
+    assert pd.read_csv(tmp_path / "all.csv")["Finish Time"].tolist() == ["10:00:00"] * 3
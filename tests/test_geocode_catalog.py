@@ -0,0 +1,86 @@
+"""
+Offline checks for geocode_catalog.py, with a static geocoder (no Nominatim).
+"""
+
+import pandas as pd
+
+from geocode_catalog import GeocodeCache, StaticGeocoder, geocode_catalog, normalize_location
+
+CATALOG = pd.DataFrame({
+    "Race Name": ["IRONMAN Cairns", "IRONMAN 70.3 Cairns", "IRONMAN Nowhere", "IRONMAN TBA"],
+    "Location": ["Cairns, Australia", "cairns ,  Australia ", "Nowhere, Atlantis", None],
+})
+
+
+class FailingGeocoder:
+    def __init__(self):
+        self.lookups = 0
+
+    def geocode(self, location):
+        self.lookups += 1
+        raise TimeoutError("geocoder unavailable")
+
+
+def test_normalize_location_tidies_case_spaces_and_commas():
+    assert normalize_location("  Cairns ,Australia ") == "cairns, australia"
+    assert normalize_location("Kailua-Kona,  Hawaii,") == "kailua-kona, hawaii"
+
+
+def test_each_location_is_looked_up_once_ever(tmp_path):
+    cache_path = tmp_path / "geocode_cache.jsonl"
+    geocoder = StaticGeocoder({"Cairns, Australia": (-16.92, 145.77)})
+
+    located = geocode_catalog(CATALOG, geocoder, GeocodeCache(cache_path))
+
+    assert located["Latitude"].tolist()[:2] == [-16.92, -16.92]
+    assert located["Longitude"].tolist()[:2] == [145.77, 145.77]
+    assert located.iloc[2:]["Latitude"].isna().all()
+    assert geocoder.lookups == 2            # Both Cairns spellings share one key; missing Location skipped
+
+    # A new run (fresh cache object) sends nothing to the geocoder, not even the "not found"
+    again = StaticGeocoder({})
+    relocated = geocode_catalog(CATALOG, again, GeocodeCache(cache_path))
+    assert again.lookups == 0
+    assert relocated["Latitude"].tolist()[:2] == [-16.92, -16.92]
+
+
+def test_offline_run_only_uses_the_cache(tmp_path):
+    cache = GeocodeCache(tmp_path / "geocode_cache.jsonl")
+    cache.put("Cairns, Australia", (-16.92, 145.77))
+
+    located = geocode_catalog(CATALOG, None, cache)
+
+    assert located["Latitude"].notna().tolist() == [True, True, False, False]
+
+
+def test_failed_lookups_are_not_cached(tmp_path):
+    cache_path = tmp_path / "geocode_cache.jsonl"
+
+    geocode_catalog(CATALOG, FailingGeocoder(), GeocodeCache(cache_path))
+
+    assert "Cairns, Australia" not in GeocodeCache(cache_path)
+    retry = StaticGeocoder({"Cairns, Australia": (-16.92, 145.77)})
+    geocode_catalog(CATALOG, retry, GeocodeCache(cache_path))
+    assert retry.lookups == 2
+
+
+def test_cache_ignores_a_torn_last_line(tmp_path):
+    cache_path = tmp_path / "geocode_cache.jsonl"
+    GeocodeCache(cache_path).put("Cairns, Australia", (-16.92, 145.77))
+    with open(cache_path, "a", encoding="utf-8") as f:
+        f.write('{"key": "kona, hawa')
+
+    cache = GeocodeCache(cache_path)
+
+    assert cache.get("CAIRNS, australia") == (-16.92, 145.77)
+    assert "Kona, Hawaii" not in cache
+
+
+def test_last_cache_line_wins(tmp_path):
+    cache_path = tmp_path / "geocode_cache.jsonl"
+    GeocodeCache(cache_path).put("Nowhere, Atlantis", None)
+    GeocodeCache(cache_path).put("nowhere,atlantis", (1.5, 2.5))
+
+    cache = GeocodeCache(cache_path)
+
+    assert cache.get("Nowhere, Atlantis") == (1.5, 2.5)
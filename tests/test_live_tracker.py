@@ -0,0 +1,66 @@
+import os
+
+import live_tracker
+from live_tracker import LiveStore, live_directory, load_live_state, tracked_races
+
+RACE = ("IM Test", "2025 - June 15")
+
+
+def record(bib, finish=None):
+    return {"wtc_bibnumber": bib, "athlete": f"Athlete {bib}", "wtc_finishtimeformatted": finish}
+
+
+def state_files(store):
+    return sorted(name for name in os.listdir(store.directory) if name.endswith(".parquet"))
+
+
+def finish_times(root):
+    """
+    {athlete: finish seconds, -1 when not finished} of the loaded state.
+    """
+    state = load_live_state(*RACE, root=root)
+    return dict(zip(state["Athlete"], state["Finish Time"].fillna(-1).tolist()))
+
+
+def test_each_poll_writes_only_its_changed_rows(tmp_path):
+    store = LiveStore(live_directory(*RACE, root=tmp_path), compact_every=3)
+
+    assert store.apply([record(1), record(2)], *RACE) == {"new": 2, "changed": 0, "removed": 0}
+    assert store.apply([record(1, "09:00:00"), record(2)], *RACE) == {"new": 0, "changed": 1, "removed": 0}
+    assert state_files(store) == ["part-1.parquet", "part-2.parquet"]
+    assert len(live_tracker.read_results(os.path.join(store.directory, "part-2.parquet"))) == 1
+    assert finish_times(tmp_path) == {"Athlete 1": 32400, "Athlete 2": -1}
+
+    # Athlete 2 leaves the feed; the third part triggers a compaction
+    assert store.apply([record(1, "09:00:00")], *RACE) == {"new": 0, "changed": 0, "removed": 1}
+    assert state_files(store) == ["latest-4.parquet"]
+    assert finish_times(tmp_path) == {"Athlete 1": 32400}
+
+
+def test_unchanged_records_are_not_hashed(tmp_path, monkeypatch):
+    store = LiveStore(live_directory(*RACE, root=tmp_path))
+    records = [record(bib) for bib in range(50)]
+    store.apply(records, *RACE)
+
+    hashed = []
+    monkeypatch.setattr(live_tracker, "_record_hash", lambda r: hashed.append(r) or "changed")
+    store.apply([*records[:49], record(49, "10:00:00")], *RACE)
+
+    assert hashed == [record(49, "10:00:00")]
+
+
+def test_a_restarted_tracker_carries_on(tmp_path):
+    directory = live_directory(*RACE, root=tmp_path)
+    LiveStore(directory).apply([record(1), record(2, "10:00:00")], *RACE)
+
+    store = LiveStore(directory)
+
+    assert state_files(store) == ["latest-2.parquet"]
+    assert store.apply([record(1), record(2, "10:00:00")], *RACE) == {"new": 0, "changed": 0, "removed": 0}
+    assert finish_times(tmp_path) == {"Athlete 1": -1, "Athlete 2": 36000}
+    assert tracked_races(tmp_path) == [RACE]
+
+
+def test_an_untracked_race_has_an_empty_state(tmp_path):
+    assert load_live_state(*RACE, root=tmp_path).empty
+    assert tracked_races(tmp_path) == []
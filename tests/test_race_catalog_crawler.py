@@ -0,0 +1,118 @@
+import asyncio
+
+import race_catalog_crawler
+from race_catalog_crawler import crawl_catalog, parse_catalog_page
+
+RACES_URL = "https://www.ironman.com/races"
+
+
+def card(title, url, location="Cairns, Australia", swim="Ocean"):
+    return f"""
+    <div class="highlighted-card-wrapper">
+      <h2>
+        {title}
+      </h2>
+      <div class="country-flag-formatter"><img src="flag.png"><span class="label">{location}</span></div>
+      <div class="icon-field-item">
+        <span class="icon-field-label">Swim</span><span class="icon-field-value">{swim}</span>
+      </div>
+      <div class="icon-field-item">
+        <span class="icon-field-label">Bike Course</span><span class="icon-field-value">Rolling</span>
+      </div>
+      <a class="button button--secondary" href="{url}">Race details</a>
+    </div>"""
+
+
+def listing(*cards, next_page=None, pager=(), rel="next"):
+    links = "".join(f'<a href="/races?page={page}">{page}</a>' for page in pager)
+    more = (
+        f'<a class="text-link text-link--chevron-down" rel="{rel}" href="/races?page={next_page}">Load More</a>'
+        if next_page else ""
+    )
+    return f"<html><body><main>{''.join(cards)}</main><nav>{links}{more}</nav></body></html>"
+
+
+class PageFetcher:
+    """
+    Serves listing pages by URL; unknown pages come back without cards.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    async def get(self, url):
+        self.requested.append(url)
+        return self.pages.get(url, listing()).encode("utf-8")
+
+
+def test_parse_catalog_page_reads_card_fields_and_pager():
+    html = listing(
+        card("IRONMAN 70.3   Cairns", "/im703-cairns"),
+        next_page=2, pager=(2, 3, 7), rel="next nofollow",
+    )
+
+    cards, next_url, last_page = parse_catalog_page(html, RACES_URL)
+
+    assert next_url == "https://www.ironman.com/races?page=2"
+    assert last_page == 7
+    row = race_catalog_crawler.catalog_row(cards[0])
+    assert row == {
+        "Race Name": "IRONMAN 70.3 Cairns", "Race Type": "IRONMAN 70.3", "Location": "Cairns, Australia",
+        "URL": "https://www.ironman.com/im703-cairns", "Swim": "Ocean", "Bike": "Rolling", "Run": "",
+    }
+
+
+def test_crawl_fetches_up_to_the_last_linked_page():
+    fetcher = PageFetcher({
+        RACES_URL: listing(card("IRONMAN Cairns", "/im-cairns"), next_page=2, pager=(2, 3)),
+        f"{RACES_URL}?page=2": listing(card("IRONMAN Kona", "/im-kona")),
+        f"{RACES_URL}?page=3": listing(card("IRONMAN Nice", "/im-nice")),
+    })
+
+    rows = asyncio.run(crawl_catalog(fetcher, RACES_URL))
+
+    assert [row["Race Name"] for row in rows] == ["IRONMAN Cairns", "IRONMAN Kona", "IRONMAN Nice"]
+    assert len(fetcher.requested) == 3
+
+
+def test_crawl_without_a_pager_stops_at_the_first_empty_page(monkeypatch):
+    monkeypatch.setattr(race_catalog_crawler, "PAGE_WINDOW", 2)
+    fetcher = PageFetcher({
+        RACES_URL: listing(card("IRONMAN Cairns", "/im-cairns"), next_page=2),
+        f"{RACES_URL}?page=2": listing(card("IRONMAN Kona", "/im-kona"), next_page=3),
+        f"{RACES_URL}?page=3": listing(card("IRONMAN Nice", "/im-nice"), next_page=4),
+    })
+
+    rows = asyncio.run(crawl_catalog(fetcher, RACES_URL))
+
+    assert [row["Race Name"] for row in rows] == ["IRONMAN Cairns", "IRONMAN Kona", "IRONMAN Nice"]
+    # Windows of 2 pages: 2-3, then 4-5 where page 4 is empty
+    assert len(fetcher.requested) == 5
+
+
+def test_crawl_stops_when_a_page_has_no_next_link(monkeypatch):
+    monkeypatch.setattr(race_catalog_crawler, "PAGE_WINDOW", 4)
+    fetcher = PageFetcher({
+        RACES_URL: listing(card("IRONMAN Cairns", "/im-cairns"), next_page=2),
+        f"{RACES_URL}?page=2": listing(card("IRONMAN Kona", "/im-kona")),
+        f"{RACES_URL}?page=3": listing(card("IRONMAN Ghost", "/im-ghost")),
+    })
+
+    rows = asyncio.run(crawl_catalog(fetcher, RACES_URL))
+
+    assert [row["Race Name"] for row in rows] == ["IRONMAN Cairns", "IRONMAN Kona"]
+
+
+def test_crawl_keeps_duplicate_races_once_and_skips_broken_cards():
+    fetcher = PageFetcher({
+        RACES_URL: listing(
+            card("IRONMAN Cairns", "/im-cairns"), card("IRONMAN Broken", "/im-broken", location=""),
+            next_page=2, pager=(2,),
+        ),
+        f"{RACES_URL}?page=2": listing(card("IRONMAN Cairns (listed again)", "/im-cairns")),
+    })
+
+    rows = asyncio.run(crawl_catalog(fetcher, RACES_URL))
+
+    assert [row["Race Name"] for row in rows] == ["IRONMAN Cairns"]
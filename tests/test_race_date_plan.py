@@ -0,0 +1,48 @@
+import ironman_results_scraper as scraper
+from ironman_results_scraper import RaceDatePlan
+from scrape_journal import ScrapeJournal
+
+RACE_URL = "https://www.ironman.com/im-test-results"
+
+
+def stored_race(monkeypatch, tmp_path, race_dates):
+    monkeypatch.setattr(scraper, "output_directory", str(tmp_path))
+    scraper.save_race_results("IM Test", [
+        {"Race Name": "IM Test", "Race Date": race_date, "Athlete": f"Stored {race_date}"}
+        for race_date in race_dates
+    ])
+
+
+def test_invalidate_alone_rescrapes_only_that_date(monkeypatch, tmp_path):
+    stored_race(monkeypatch, tmp_path, ["2024 - June 09", "2023 - June 11"])
+    journal = ScrapeJournal(str(tmp_path / "journal.jsonl"))
+
+    # Dates are compared as dates: "June 9" is the stored 2024-06-09
+    plan = RaceDatePlan("IM Test", RACE_URL, journal, invalidated=["2024 - June 9"])
+    dropdown = ["2024 - June 9", "2023 - June 11"]
+
+    assert [plan.should_scrape(d) for d in dropdown] == [True, False]
+    journal.commit_date(RACE_URL, "2024 - June 9", [{"Race Date": "2024 - June 9", "Athlete": "Fresh"}])
+    athletes = [row["Athlete"] for row in plan.race_rows(dropdown)]
+    assert athletes == ["Fresh", "Stored 2023 - June 11"]
+
+
+def test_incremental_keeps_stored_dates_no_longer_listed(monkeypatch, tmp_path):
+    stored_race(monkeypatch, tmp_path, ["2019 - June 09"])
+    journal = ScrapeJournal(str(tmp_path / "journal.jsonl"))
+    plan = RaceDatePlan("IM Test", RACE_URL, journal, incremental=True)
+
+    assert plan.should_scrape("2024 - June 09")
+    journal.commit_date(RACE_URL, "2024 - June 09", [{"Athlete": "Fresh"}])
+    assert [row["Athlete"] for row in plan.race_rows(["2024 - June 09"])] == ["Fresh", "Stored 2019 - June 09"]
+
+
+def test_without_a_stored_file_the_journal_decides(monkeypatch, tmp_path):
+    monkeypatch.setattr(scraper, "output_directory", str(tmp_path))
+    journal = ScrapeJournal(str(tmp_path / "journal.jsonl"))
+    journal.commit_date(RACE_URL, "2023 - June 11", [{"Athlete": "Done"}])
+
+    plan = RaceDatePlan("IM Test", RACE_URL, journal)
+
+    assert [plan.should_scrape(d) for d in ["2024 - June 09", "2023 - June 11"]] == [True, False]
+    assert plan.race_rows(["2024 - June 09", "2023 - June 11"]) == [{"Athlete": "Done"}]
@@ -0,0 +1,79 @@
+import json
+
+import ironman_results_scraper as scraper
+from ironman_results_scraper import replay_race
+from response_archive import ResponseArchive
+from results_schema import read_results
+
+RACE_URL = "https://www.ironman.com/im-test-results"
+
+
+def feed_body(*athletes):
+    return json.dumps({"resultsJson": {"value": [
+        {"athlete": athlete, "wtc_finishtimeformatted": "10:00:00"} for athlete in athletes
+    ]}})
+
+
+def grid_page(*athletes):
+    return json.dumps({
+        "grid_rows": [
+            {"rowindex": str(i), "cells": {"athlete": athlete, "wtc_finishtimeformatted": "11:00:00"}}
+            for i, athlete in enumerate(athletes)
+        ],
+        "details": {str(i): {"Designation": "Finisher", "Overall Rank": str(i + 1)} for i in range(len(athletes))},
+    })
+
+
+def test_entries_keep_only_the_latest_scrape_of_each_race_date(tmp_path):
+    archive = ResponseArchive(str(tmp_path))
+    for page in (1, 2, 3):
+        archive.put(RACE_URL, "2024 - June 09", page, "grid_page", grid_page(f"Old {page}"))
+    archive.put(RACE_URL, "2023 - June 11", 0, "feed", feed_body("Old feed"))
+    # Re-scrapes: the grid now has fewer pages, the feed is fetched again
+    for page in (1, 2):
+        archive.put(RACE_URL, "2024 - June 09", page, "grid_page", grid_page(f"New {page}"))
+    archive.put(RACE_URL, "2023 - June 11", 0, "feed", feed_body("New feed"))
+
+    entries = archive.entries()
+
+    assert [(e["race_date"], e["kind"], e["page"]) for e in entries] == [
+        ("2024 - June 09", "grid_page", 1), ("2024 - June 09", "grid_page", 2), ("2023 - June 11", "feed", 0),
+    ]
+    assert json.loads(archive.get(entries[0]["sha256"]))["grid_rows"][0]["cells"]["athlete"] == "New 1"
+    assert archive.entries(race_url="https://elsewhere") == []
+
+
+def test_identical_payloads_are_stored_once(tmp_path):
+    archive = ResponseArchive(str(tmp_path))
+
+    first = archive.put(RACE_URL, "2024 - June 09", 0, "feed", feed_body("Ann"))
+    second = archive.put(RACE_URL, "2024 - June 10", 0, "feed", feed_body("Ann"))
+
+    assert first == second
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+    assert archive.race_urls() == [RACE_URL]
+
+
+def test_replay_rebuilds_archived_dates_and_keeps_the_others(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, "output_directory", str(tmp_path / "races"))
+    scraper.save_race_results("IM Test", [
+        {"Race Name": "IM Test", "Race Date": "2019 - June 09", "Athlete": "Stored 2019"},
+        {"Race Name": "IM Test", "Race Date": "2024 - June 09", "Athlete": "Stored 2024"},
+    ])
+    archive = ResponseArchive(str(tmp_path / "archive"))
+    archive.put(RACE_URL, "2024 - June 9", 1, "grid_page", grid_page("Grid A", "Grid B"))
+    archive.put(RACE_URL, "2023 - June 11", 0, "feed", feed_body("Feed C"))
+
+    assert replay_race("IM Test", archive.entries(RACE_URL), archive) == 3
+
+    stored = read_results(scraper.stored_race_path("IM Test"))
+    assert stored["Athlete"].tolist() == ["Stored 2019", "Grid A", "Grid B", "Feed C"]
+    assert stored.loc[stored["Athlete"] == "Grid B", "Overall Rank"].tolist() == [2]
+    assert stored.loc[stored["Athlete"] == "Feed C", "Finish Time"].tolist() == [36000]
+
+
+def test_replay_without_archived_pages_leaves_the_race_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, "output_directory", str(tmp_path / "races"))
+
+    assert replay_race("IM Test", [], ResponseArchive(str(tmp_path / "archive"))) == 0
+    assert not (tmp_path / "races").exists()
@@ -0,0 +1,97 @@
+"""
+Offline checks for results_feed.py: recorded responses, no ironman.com.
+"""
+
+import json
+
+import pytest
+
+from results_feed import (
+    RESULTS_FEED_URL, RecordingTransport, ReplayTransport, feed_records, fetch_race_results, parse_results_feed,
+)
+
+RACE_URL = "https://www.ironman.com/im-test-results"
+IFRAME_URL = "https://labs-v2.competitor.com/results/event/test"
+
+RACE_PAGE = f'<html><body><iframe class="coh-iframe" src="{IFRAME_URL}"></iframe></body></html>'
+IFRAME_PAGE = (
+    '<html><script id="__NEXT_DATA__" type="application/json">'
+    + json.dumps({"props": {"subevents": [
+        {"wtc_eventid": "ev-2023", "wtc_eventdate": "2023-06-11T00:00:00Z"},
+        {"wtc_eventid": "ev-2024", "wtc_eventdate": "2024-06-09T00:00:00Z"},
+    ]}})
+    + "</script></html>"
+)
+
+
+def feed_body(*records):
+    return json.dumps({"resultsJson": {"value": list(records)}}).encode("utf-8")
+
+
+FINISHER = {
+    "athlete": "Ann Example", "wtc_swimtimeformatted": "01:02:03", "wtc_transition1timeformatted": "05:00",
+    "wtc_biketimeformatted": "05:10:00", "wtc_transitiontime2formatted": "03:30",
+    "wtc_runtimeformatted": "03:40:00", "wtc_finishtimeformatted": "10:00:33",
+    "wtc_divisionrank": 3, "wtc_genderrank": 12, "wtc_overallrank": 40, "wtc_agegroupname": "F30-34",
+}
+DNF = {"athlete": "Bo Example", "wtc_dnf": True, "wtc_swimtimeformatted": "01:10:00"}
+DNS = {"athlete": "Cy Example", "wtc_dns": True}
+
+
+class DictTransport:
+    """
+    Serves fixed bodies by URL, like a fake server.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url):
+        self.requested.append(url)
+        return self.pages[url]
+
+
+def test_parse_results_feed_keeps_the_selenium_columns():
+    rows = parse_results_feed(feed_body(FINISHER, DNF, DNS), "IM Test", "2024 - June 09")
+
+    assert rows[0] == {
+        "Race Name": "IM Test", "Race Date": "2024 - June 09", "Athlete": "Ann Example",
+        "Div Rank": "3", "Gender Rank": "12", "Overall Rank": "40", "Designation": "Finisher",
+        "Division": "F30-34", "Swim Time": "01:02:03", "Transition 1": "05:00", "Bike Time": "05:10:00",
+        "Transition 2": "03:30", "Run Time": "03:40:00", "Finish Time": "10:00:33",
+    }
+    assert rows[1]["Designation"] == "DNF" and "Div Rank" not in rows[1]
+    assert rows[1]["Run Time"] == "N/A"
+    assert rows[2] == {"Race Name": "IM Test", "Race Date": "2024 - June 09", "Athlete": "Cy Example",
+                       "Designation": "DNS"}
+
+
+def test_fetch_race_results_replays_recorded_responses(tmp_path):
+    live = DictTransport({
+        RACE_URL: RACE_PAGE.encode("utf-8"),
+        IFRAME_URL: IFRAME_PAGE.encode("utf-8"),
+        RESULTS_FEED_URL.format(event_id="ev-2024"): feed_body(FINISHER, DNS),
+        RESULTS_FEED_URL.format(event_id="ev-2023"): feed_body(DNF),
+    })
+    recorded = fetch_race_results("IM Test", RACE_URL, RecordingTransport(live, tmp_path))
+
+    replayed = fetch_race_results("IM Test", RACE_URL, ReplayTransport(tmp_path))
+
+    assert replayed == recorded
+    assert [(row["Race Date"], row["Athlete"]) for row in replayed] == [
+        ("2024 - June 09", "Ann Example"), ("2024 - June 09", "Cy Example"), ("2023 - June 11", "Bo Example"),
+    ]
+    assert len(live.requested) == 4
+
+
+def test_replay_transport_refuses_unrecorded_urls(tmp_path):
+    with pytest.raises(KeyError):
+        ReplayTransport(tmp_path).get(RACE_URL)
+
+
+def test_feed_records_finds_the_athletes_wherever_they_are_nested():
+    nested = json.dumps({"data": {"page": [{"results": [FINISHER, DNS]}]}}).encode("utf-8")
+
+    assert [record["athlete"] for record in feed_records(nested)] == ["Ann Example", "Cy Example"]
+    assert feed_records(b'{"resultsJson": {"value": []}}') == []
@@ -0,0 +1,42 @@
+import datetime
+
+import pandas as pd
+
+from results_schema import apply_results_schema, legacy_text, race_date_keys, to_rank, to_seconds
+
+
+def test_to_seconds_reads_clocks_and_seconds_in_one_column():
+    seconds = to_seconds(pd.Series(["01:02:03.4", "3600", "05:00", "N/A", "2:03:04", None]))
+
+    assert seconds.dtype == "Int32"
+    assert seconds.tolist() == [3723, 3600, 300, pd.NA, 7384, pd.NA]
+
+
+def test_to_seconds_keeps_timedeltas_and_numbers():
+    assert to_seconds(pd.Series(pd.to_timedelta(["00:05:00", None]))).tolist() == [300, pd.NA]
+    assert to_seconds(pd.Series([59.6, None])).tolist() == [60, pd.NA]
+
+
+def test_to_rank_nulls_anything_that_is_not_a_number():
+    assert to_rank(pd.Series(["3", "DNF", "", "12.0"])).tolist() == [3, pd.NA, pd.NA, 12]
+
+
+def test_race_date_keys_compare_dropdown_and_iso_dates():
+    keys = race_date_keys(["2024 - June 9", "2024 - June 09", "2024-06-09", "TBA"])
+
+    assert keys == [datetime.date(2024, 6, 9)] * 3 + ["TBA"]
+
+
+def test_schema_round_trips_through_legacy_text():
+    scraped = pd.DataFrame({
+        "Race Name": ["IM Test"], "Race Date": ["2024 - June 09"], "Athlete": ["Ann Example"],
+        "Overall Rank": ["40"], "Transition 1": ["05:00"], "Finish Time": ["10:00:33"], "Bib": ["7"],
+    })
+
+    typed = apply_results_schema(scraped)
+    text = legacy_text(typed)
+
+    assert list(typed.columns)[-1] == "Bib"
+    assert typed["Finish Time"].tolist() == [36033]
+    assert text.loc[0, "Finish Time"] == "10:00:33" and text.loc[0, "Transition 1"] == "00:05:00"
+    assert text.loc[0, "Swim Time"] == "N/A" and text.loc[0, "Race Date"] == "2024 - June 09"
@@ -0,0 +1,61 @@
+import json
+
+from scrape_journal import ScrapeJournal
+
+RACE_URL = "https://www.ironman.com/im-test-results"
+OTHER_URL = "https://www.ironman.com/im-other-results"
+
+
+def journal_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_a_restarted_run_sees_committed_dates(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    ScrapeJournal(path).commit_date(RACE_URL, "2024 - June 09", [{"Athlete": "Ann"}])
+
+    journal = ScrapeJournal(path)
+
+    assert journal.is_date_done(RACE_URL, "2024 - June 09")
+    assert not journal.is_date_done(RACE_URL, "2023 - June 11")
+    assert journal.committed_rows(RACE_URL, ["2023 - June 11", "2024 - June 09"]) == [{"Athlete": "Ann"}]
+
+
+def test_commit_race_drops_its_dates_and_compacts(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = ScrapeJournal(path)
+    journal.commit_date(RACE_URL, "2024 - June 09", [{"Athlete": "Ann"}])
+    journal.commit_date(OTHER_URL, "2024 - May 01", [{"Athlete": "Bo"}])
+
+    journal.commit_race(RACE_URL)
+
+    assert journal.is_race_done(RACE_URL)
+    assert not journal.is_date_done(RACE_URL, "2024 - June 09")
+    assert [(e["type"], e["race_url"]) for e in journal_lines(path)] == [("race", RACE_URL), ("date", OTHER_URL)]
+    assert ScrapeJournal(path).is_date_done(OTHER_URL, "2024 - May 01")
+
+
+def test_load_compacts_dates_of_races_saved_before_a_crash(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "date", "race_url": RACE_URL, "race_date": "2024 - June 09", "rows": []}) + "\n")
+        f.write(json.dumps({"type": "race", "race_url": RACE_URL}) + "\n")
+
+    journal = ScrapeJournal(path)
+
+    assert journal.is_race_done(RACE_URL)
+    assert journal_lines(path) == [{"type": "race", "race_url": RACE_URL}]
+
+
+def test_a_torn_last_line_is_skipped_and_not_glued_to_the_next_commit(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    ScrapeJournal(path).commit_date(RACE_URL, "2024 - June 09", [{"Athlete": "Ann"}])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "date", "race_url": "https://www.ironman')
+
+    ScrapeJournal(path).commit_date(RACE_URL, "2023 - June 11", [{"Athlete": "Bo"}])
+
+    journal = ScrapeJournal(path)
+    assert journal.is_date_done(RACE_URL, "2024 - June 09")
+    assert journal.is_date_done(RACE_URL, "2023 - June 11")
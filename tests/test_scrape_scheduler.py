@@ -0,0 +1,66 @@
+from datetime import date, datetime
+
+import pytest
+
+from scrape_scheduler import (
+    RECENT_HALF_LIFE_DAYS, UPCOMING_SCORE, RaceScheduler, parse_race_date, saved_race_dates,
+)
+
+TODAY = date(2025, 6, 30)
+
+
+def test_parse_race_date_accepts_dropdown_iso_and_dates():
+    assert parse_race_date("2024 - June 09") == date(2024, 6, 9)
+    assert parse_race_date("2024-06-09") == date(2024, 6, 9)
+    assert parse_race_date(datetime(2024, 6, 9, 18, 30)) == date(2024, 6, 9)
+    assert parse_race_date("TBA") is None
+
+
+def test_recency_halves_per_half_life_and_scores_upcoming_editions():
+    scheduler = RaceScheduler(today=TODAY)
+
+    assert scheduler.recency(TODAY) == 1.0
+    assert scheduler.recency(date(2025, 6, 30 - RECENT_HALF_LIFE_DAYS)) == pytest.approx(0.5)
+    assert scheduler.recency(date(2025, 7, 10)) == UPCOMING_SCORE
+    assert scheduler.recency(date(2025, 9, 1)) == 0.0
+
+
+def test_anniversary_recency_expects_the_same_weekend_next_year():
+    scheduler = RaceScheduler(today=TODAY)
+
+    assert scheduler.anniversary_recency(["2024 - June 29", "2019 - June 30"]) == pytest.approx(
+        scheduler.recency(date(2025, 6, 29))
+    )
+    assert scheduler.anniversary_recency([]) == 1.0
+
+
+def test_staleness_counts_whole_days_from_today():
+    scheduler = RaceScheduler(today=TODAY)
+
+    assert scheduler.staleness(None) == 1.0
+    assert scheduler.staleness(datetime(2025, 6, 30, 23, 59)) == 0.0
+    assert scheduler.staleness(datetime(2025, 6, 15, 1, 0)) == 0.5
+
+
+def test_recent_wc_feeder_races_come_first():
+    scheduler = RaceScheduler(wc_urls={"https://www.ironman.com/im-wc-results"}, today=TODAY)
+    fresh = datetime(2025, 6, 30)
+
+    priorities = {
+        "recent IRONMAN": scheduler.race_priority("IRONMAN", "u1", ["2024 - June 29"], fresh),
+        "recent 5150": scheduler.race_priority("5150 Triathlon Series", "u2", ["2024 - June 29"], fresh),
+        "old IRONMAN": scheduler.race_priority("IRONMAN", "u3", ["2024 - January 10"], fresh),
+        "WC event": scheduler.race_priority("5150 Triathlon Series", "https://www.ironman.com/im-wc-results",
+                                            ["2024 - January 10"], fresh),
+    }
+
+    assert sorted(priorities, key=priorities.get, reverse=True)[:2] == ["recent IRONMAN", "recent 5150"]
+    assert priorities["WC event"] == priorities["old IRONMAN"]
+
+
+def test_saved_race_dates_reads_csv_and_missing_files(tmp_path):
+    path = tmp_path / "race.csv"
+    path.write_text("Race Date,Athlete\n2024 - June 09,Ann\n2024 - June 09,Bo\n2023 - June 11,Cy\n")
+
+    assert saved_race_dates(str(path)) == ["2024 - June 09", "2023 - June 11"]
+    assert saved_race_dates(str(tmp_path / "missing.csv")) == []
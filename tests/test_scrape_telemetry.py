@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+import scrape_telemetry
+from scrape_telemetry import add, configure, count_na_rows, note, phase, set_context, summarize, traced
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(scrape_telemetry, "_state", {"path": None, "run_id": None, "context": {}, "stack": []})
+
+
+def records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_phases_are_free_until_configured(tmp_path):
+    with phase("open_race") as metrics:
+        metrics["rows"] = 3
+        add(retries=1)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_each_phase_writes_one_record_with_context_and_counters(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    run_id = configure(str(path), run_id="run-1")
+    set_context(race="IM Test", race_date="2024 - June 09")
+
+    @traced("grid_read")
+    def read_grid():
+        add(rows=2)
+        add(rows=3, retries=1)
+        note(pages=1)
+
+    with phase("scrape_date"):
+        read_grid()
+    set_context(race_date=None)
+    with pytest.raises(RuntimeError):
+        with phase("next_page"):
+            raise RuntimeError("button gone")
+
+    grid, scrape, next_page = records(path)
+    assert run_id == "run-1"
+    assert (grid["phase"], grid["rows"], grid["retries"], grid["pages"]) == ("grid_read", 5, 1, 1)
+    assert grid["race"] == "IM Test" and grid["race_date"] == "2024 - June 09" and grid["ok"]
+    assert scrape["phase"] == "scrape_date" and "rows" not in scrape   # Counters go to the innermost phase
+    assert "race_date" not in next_page
+    assert (next_page["ok"], next_page["error"]) == (False, "button gone")
+
+
+def test_an_error_field_marks_the_phase_failed(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    configure(str(path))
+
+    with phase("feed_fetch", race="IM Test") as metrics:
+        metrics["error"] = "HTTP 503"
+
+    (record,) = records(path)
+    assert (record["ok"], record["error"], record["race"]) == (False, "HTTP 503", "IM Test")
+
+
+def test_count_na_rows():
+    assert count_na_rows([{"Swim Time": "N/A"}, {"Swim Time": "01:02:03"}, {"Run Time": "N/A"}]) == 2
+
+
+def test_summary_ranks_races_by_time(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    configure(str(path), run_id="run-1")
+    lines = [
+        {"phase": "open_race", "race": "IM Slow", "duration_s": 5.0},
+        {"phase": "scrape_date", "race": "IM Slow", "duration_s": 10.0, "rows": 100, "na_rows": 4},
+        {"phase": "grid_read", "race": "IM Slow", "duration_s": 9.0, "rows": 100},
+        {"phase": "scrape_date", "race": "IM Fast", "duration_s": 1.0, "rows": 50, "retries": 2},
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps({"run_id": "run-1", "ok": True, **line}) + "\n")
+
+    report = summarize(str(path))
+
+    assert "Rows captured: 150 | N/A rows: 4" in report
+    slowest = report.split("Slowest")[1].splitlines()
+    race_lines = [line for line in slowest if line.startswith("IM ")]
+    # grid_read is nested in scrape_date, so it is not counted again
+    assert [(line.split()[1], float(line.split()[2])) for line in race_lines] == [("Slow", 15.0), ("Fast", 1.0)]
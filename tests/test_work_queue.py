@@ -0,0 +1,68 @@
+from work_queue import WorkQueue
+
+RACE_URL = "https://www.ironman.com/im-test-results"
+RACE_DATES = ["2024 - June 09", "2023 - June 11"]
+
+
+def scrape_race(queue, worker_id="w1"):
+    """
+    Leases and completes the race item and all its date items.
+    """
+    race_item = queue.lease(worker_id)
+    queue.add_race_dates(race_item, RACE_DATES, [True] * len(RACE_DATES))
+    assert queue.complete(race_item, worker_id)
+    while (item := queue.lease(worker_id)) is not None:
+        assert queue.complete(item, worker_id, [{"Athlete": item["race_date"]}])
+
+
+def test_items_are_leased_once_and_settle_the_race(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    queue.enqueue_race("IM Test", RACE_URL)
+
+    race_item = queue.lease("w1")
+    assert queue.lease("w2") is None
+    queue.add_race_dates(race_item, RACE_DATES, [True, True])
+    assert not queue.complete(race_item, "w2")      # Not its lease
+    assert queue.complete(race_item, "w1")
+    assert not queue.race_status(RACE_URL)["settled"]
+
+    while (item := queue.lease("w2")) is not None:
+        queue.complete(item, "w2", [{"Athlete": item["race_date"]}])
+
+    assert queue.race_status(RACE_URL) == {"settled": True, "dead": 0, "race_dead": False}
+    assert queue.committed_rows(RACE_URL, RACE_DATES) == [{"Athlete": d} for d in RACE_DATES]
+
+
+def test_failed_items_are_dead_lettered_after_max_attempts(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"), max_attempts=2)
+    queue.enqueue_race("IM Test", RACE_URL)
+
+    assert queue.fail(queue.lease("w1"), "w1", "timeout") == "pending"
+    assert queue.fail(queue.lease("w1"), "w1", "timeout") == "dead"
+
+    assert queue.is_drained()
+    assert queue.race_status(RACE_URL) == {"settled": True, "dead": 1, "race_dead": True}
+
+
+def test_commit_race_drops_its_rows(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    queue.enqueue_race("IM Test", RACE_URL)
+    scrape_race(queue)
+
+    queue.commit_race(RACE_URL)
+
+    assert queue.is_race_done(RACE_URL)
+    assert queue.committed_rows(RACE_URL, RACE_DATES) == []
+    assert queue.db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+
+
+def test_a_rescraped_race_queues_dates_whose_rows_were_dropped(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    queue.enqueue_race("IM Test", RACE_URL)
+    scrape_race(queue)
+    queue.commit_race(RACE_URL)
+
+    queue.enqueue_race("IM Test", RACE_URL, reset=True)
+    scrape_race(queue)
+
+    assert queue.committed_rows(RACE_URL, RACE_DATES) == [{"Athlete": d} for d in RACE_DATES]
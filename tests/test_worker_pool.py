@@ -0,0 +1,49 @@
+import time
+
+import worker_pool
+from fake_pool_worker import worker_main
+from retry_quarantine import RetryQuarantine
+from scrape_journal import ScrapeJournal
+
+RACE_DATES = ["2024 - June 09", "2023 - June 11"]
+
+
+class SlowJournal(ScrapeJournal):
+    """
+    Keeps the parent busy after each commit, so a worker can send "start"
+    and die before the parent reads the message.
+    """
+
+    def commit_date(self, race_url, race_date, rows):
+        super().commit_date(race_url, race_date, rows)
+        time.sleep(0.5)
+
+
+class PlanAll:
+    def __init__(self, journal, race_url):
+        self.journal = journal
+        self.race_url = race_url
+
+    def should_scrape(self, race_date):
+        return True
+
+    def race_rows(self, race_dates):
+        return self.journal.committed_rows(self.race_url, race_dates)
+
+
+def test_pool_requeues_the_item_of_a_dead_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker_pool, "_worker_main", worker_main)
+    monkeypatch.setattr(worker_pool, "RESULT_POLL_SECONDS", 0.2)
+    journal = SlowJournal(tmp_path / "journal.jsonl")
+    saved = {}
+
+    failed = worker_pool.run_worker_pool(
+        [("IM Test", "u1")], journal, saved.__setitem__, lambda name, url: PlanAll(journal, url),
+        recycler_settings={}, num_workers=1,
+        options={"race_dates": RACE_DATES, "died_flag": str(tmp_path / "died")},
+        quarantine=RetryQuarantine(max_attempts=3, base_delay=0.01, max_delay=0.01),
+    )
+
+    assert failed == []
+    assert [row["Race Date"] for row in saved["IM Test"]] == RACE_DATES
+    assert journal.is_race_done("u1")